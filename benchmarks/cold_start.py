@@ -0,0 +1,68 @@
+"""Measures time from module import to the first database query of a handler.
+
+Each run starts a fresh interpreter so imports, the Secrets Manager fetch and the
+RDS Proxy connection are all paid again, just like a Lambda cold start.
+
+Usage (needs DB_HOST, DB_NAME, DB_SECRET_NAME, AWS_REGION for a reachable database):
+
+    python benchmarks/cold_start.py --module get_tasks --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lambda_functions")
+
+# Runs inside the child interpreter; prints one JSON line with the timings
+CHILD_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {lambda_dir!r})
+module = __import__({module!r})
+imported = time.perf_counter()
+response = module.lambda_handler({{"warmup": True}}, None)
+finished = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "first_query_ms": (finished - imported) * 1000,
+    "total_ms": (finished - started) * 1000,
+    "status": response["statusCode"]
+}}))
+"""
+
+
+def run_once(module, prewarm):
+    """Runs one cold start in a fresh interpreter and returns its timings."""
+    env = dict(os.environ, COLD_START_PREWARM="true" if prewarm else "false", LOG_LEVEL="WARNING")
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT.format(lambda_dir=LAMBDA_DIR, module=module)],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(runs):
+    """Returns the median of each timing across runs."""
+    return {key: round(statistics.median(run[key] for run in runs), 1)
+            for key in ("import_ms", "first_query_ms", "total_ms")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="get_tasks", choices=["get_tasks", "post_task", "router"])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for prewarm in (False, True):
+        runs = [run_once(args.module, prewarm) for _ in range(args.runs)]
+        results["parallel" if prewarm else "sequential"] = summarize(runs)
+
+    print(json.dumps({"module": args.module, "runs": args.runs, "median": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
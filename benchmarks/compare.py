@@ -0,0 +1,77 @@
+"""Compares a benchmark report against a stored baseline and fails on regressions.
+
+A scenario regresses when its p95 latency or traced allocation peak grows by more
+than --threshold (a fraction) over the baseline entry with the same scenario,
+size and mode. Missing baselines and skipped runs are reported and pass.
+
+Usage:
+
+    python benchmarks/compare.py benchmarks/baseline.json bench.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import sys
+
+# Metrics compared against the baseline; higher is worse for all of them
+COMPARED_METRICS = ["p95_ms", "alloc_peak_kb"]
+# Ignore differences below these absolute floors (timer noise on tiny scenarios)
+ABSOLUTE_FLOORS = {"p95_ms": 1.0, "alloc_peak_kb": 64.0}
+
+
+def load(path):
+    """Loads a report written by benchmarks/handlers.py."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def index_results(report):
+    """Returns {(scenario, size, mode): result} for a report."""
+    return {(r["scenario"], r["size"], r["mode"]): r for r in report.get("results", [])}
+
+
+def find_regressions(baseline, current, threshold):
+    """Returns one message per metric that grew past the threshold."""
+    regressions = []
+    baseline_results = index_results(baseline)
+    for key, result in sorted(index_results(current).items(), key=lambda item: str(item[0])):
+        base = baseline_results.get(key)
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            if new - old > ABSOLUTE_FLOORS[metric] and new > old * (1 + threshold):
+                regressions.append(f"{key[0]} size={key[1]} {key[2]}: {metric} {old} -> {new} "
+                                   f"(+{(new / old - 1) * 100 if old else float('inf'):.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️ No baseline at {args.baseline}; nothing to compare.")
+        return 0
+    current = load(args.current)
+    if "skipped" in current:
+        print(f"⚠️ Benchmark skipped: {current['skipped']}")
+        return 0
+
+    regressions = find_regressions(load(args.baseline), current, args.threshold)
+    if regressions:
+        print("❌ Performance regressions against baseline:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("✅ No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Benchmarks response compression: CPU time against payload bytes per result size.
+
+Synthetic GET /tasks pages are encoded with each response format, then compressed
+with gzip and (if installed) brotli at several levels through the handler's own
+compression code. No database is needed.
+
+Reported per (format, size, coding, level): raw and compressed bytes, the bytes
+actually sent through API Gateway (base64), the compression ratio, and the
+median/p95 compression time (ms).
+
+Usage:
+
+    python benchmarks/compression.py --sizes 100,1000,10000 --iterations 20 --output compression.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lambda_functions")
+
+DEFAULT_SIZES = "100,1000,10000,100000"
+GZIP_LEVELS = [1, 5, 9]
+BROTLI_QUALITIES = [1, 4, 11]
+FORMATS = ["application/json", "application/vnd.tasks.columnar+json"]
+
+
+def make_rows(size):
+    """Returns `size` (id, description, created_at) rows shaped like the seeded benchmark table."""
+    started = datetime(2024, 1, 1)
+    return [
+        (n, f"Benchmark task {n} {hashlib.md5(str(n).encode()).hexdigest()}", started + timedelta(seconds=n))
+        for n in range(size, 0, -1)
+    ]
+
+
+def codings():
+    """Returns (coding, levels) pairs for the installed compressors."""
+    from core import compression
+    pairs = [("gzip", GZIP_LEVELS)]
+    if compression.brotli is not None:
+        pairs.append(("br", BROTLI_QUALITIES))
+    return pairs
+
+
+def measure(data, coding, level, iterations):
+    """Compresses `data` `iterations` times and returns (compressed bytes, timings in ms)."""
+    from unittest.mock import patch
+    from core import compression
+    setting = "BROTLI_QUALITY" if coding == "br" else "GZIP_LEVEL"
+    timings = []
+    with patch.object(compression, setting, level):
+        for _ in range(iterations):
+            started = time.perf_counter()
+            compressed = compression.compress(data, coding)
+            timings.append((time.perf_counter() - started) * 1000)
+    return compressed, timings
+
+
+def run(sizes, iterations):
+    """Encodes and compresses each size and format at every level."""
+    from core.encoders import encode_rows
+    results = []
+    for size in sizes:
+        rows = make_rows(size)
+        for media_type in FORMATS:
+            body, _ = encode_rows(media_type, rows)
+            data = body.encode("utf-8")
+            for coding, levels in codings():
+                for level in levels:
+                    compressed, timings = measure(data, coding, level, iterations)
+                    results.append({
+                        "format": media_type,
+                        "size": size,
+                        "coding": coding,
+                        "level": level,
+                        "raw_bytes": len(data),
+                        "compressed_bytes": len(compressed),
+                        "sent_bytes": (len(compressed) + 2) // 3 * 4,  # ✅ base64 through API Gateway
+                        "ratio": round(len(compressed) / len(data), 4),
+                        "p50_ms": round(statistics.median(timings), 3),
+                        "p95_ms": round(sorted(timings)[max(int(len(timings) * 0.95) - 1, 0)], 3),
+                    })
+                    print(f"{media_type:>38} {size:>7} {coding:>4}-{level:<2} {len(data):>10}B -> "
+                          f"{len(compressed):>9}B  p50={results[-1]['p50_ms']:.2f}ms", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated result sizes (rows)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", help="Write the JSON report here as well as to stdout")
+    args = parser.parse_args()
+
+    sys.path.insert(0, LAMBDA_DIR)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": run([int(size) for size in args.sizes.split(",")], args.iterations),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
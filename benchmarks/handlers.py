@@ -0,0 +1,242 @@
+"""Benchmarks GET and POST /tasks in-process against a local PostgreSQL.
+
+moto stands in for Secrets Manager, so the handlers run their real credential,
+pool, query and serialization code. For every dataset size the tasks table is
+reseeded and each scenario is measured cold (pool, credential and result caches
+reset before every call) and warm (state kept between calls).
+
+Reported per scenario: p50/p95/p99/mean latency (ms), the process peak RSS
+after the scenario (MB, a high-water mark), and the tracemalloc peak (KB), live
+allocated blocks and response body size (bytes) of one extra traced invocation.
+
+Usage (needs a reachable PostgreSQL; exits 0 with "skipped" if there is none):
+
+    BENCH_DB_HOST=localhost BENCH_DB_USER=postgres BENCH_DB_PASSWORD=postgres \\
+        python benchmarks/handlers.py --sizes 1000,10000 --iterations 20 --output bench.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lambda_functions")
+
+# Local database used by the benchmark (never the deployed RDS Proxy)
+BENCH_DB = {
+    "host": os.getenv("BENCH_DB_HOST", "localhost"),
+    "port": os.getenv("BENCH_DB_PORT", "5432"),
+    "dbname": os.getenv("BENCH_DB_NAME", "tasks_bench"),
+    "user": os.getenv("BENCH_DB_USER", "postgres"),
+    "password": os.getenv("BENCH_DB_PASSWORD", "postgres"),
+}
+SECRET_NAME = "benchmark-db-secret"
+REGION = "us-east-1"
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+SEED_START = "2024-01-01"  # ✅ Seeded rows are one second apart from here (1M rows stay within January)
+SCENARIOS = ["get_all", "get_all_cached", "get_all_columnar", "get_all_ndjson", "get_page", "post_single", "post_batch"]
+
+
+def configure_environment():
+    """Points the handlers at the local database before they are imported."""
+    os.environ.update({
+        "DB_HOST": BENCH_DB["host"],
+        "DB_NAME": BENCH_DB["dbname"],
+        "DB_SECRET_NAME": SECRET_NAME,
+        "DB_SSLMODE": os.getenv("BENCH_DB_SSLMODE", "prefer"),
+        "PGPORT": BENCH_DB["port"],  # ✅ libpq default port for the pool's connections
+        "AWS_REGION": REGION,
+        "AWS_ACCESS_KEY_ID": "testing",
+        "AWS_SECRET_ACCESS_KEY": "testing",
+        "SENTRY_DSN": "",
+        "LOG_LEVEL": "WARNING",
+        "LOG_FORMAT": "text",
+        "METRICS_ENABLED": "false",  # ✅ Keep EMF lines out of the JSON report on stdout
+        "COLD_START_PREWARM": "false",
+    })
+    sys.path.insert(0, LAMBDA_DIR)
+
+
+def database_available():
+    """Returns None if the benchmark database accepts connections, else the reason it does not."""
+    import psycopg2
+    try:
+        psycopg2.connect(connect_timeout=3, **BENCH_DB).close()
+        return None
+    except psycopg2.OperationalError as e:
+        return str(e).strip()
+
+
+def connect():
+    """Opens a dedicated connection for schema setup and seeding."""
+    import psycopg2
+    return psycopg2.connect(**BENCH_DB)
+
+
+def seed(conn, size):
+    """Applies the migrations and replaces the tasks table contents with `size` synthetic rows."""
+    from core.migrations import run_migrations
+    run_migrations(conn)
+    with conn.cursor() as cur:
+        # ✅ TRUNCATE fires no triggers, so the per-day counts and claimed keys are reset with the rows
+        cur.execute("TRUNCATE tasks, task_daily_counts, task_idempotency_keys RESTART IDENTITY")
+        # ✅ There is no DEFAULT partition; create the months being seeded (a fresh database starts at the current month)
+        cur.execute("""
+            SELECT create_tasks_partition(month_of::date)
+            FROM generate_series(date_trunc('month', %s::timestamp), %s::timestamp + %s * INTERVAL '1 second',
+                                 INTERVAL '1 month') AS month_of
+        """, (SEED_START, SEED_START, size))
+        cur.execute("""
+            INSERT INTO tasks (description, created_at)
+            SELECT 'Benchmark task ' || n || ' ' || md5(n::text),
+                   %s::timestamp + n * INTERVAL '1 second'
+            FROM generate_series(1, %s) AS n
+        """, (SEED_START, size))
+        cur.execute("ANALYZE tasks")
+    conn.commit()
+
+
+def percentile(samples, pct):
+    """Returns the nearest-rank percentile of `samples`."""
+    ordered = sorted(samples)
+    index = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def build_events():
+    """Returns scenario name -> (handler name, event, cache enabled)."""
+    batch = json.dumps([{"description": f"Benchmark batch task {i}"} for i in range(100)])
+    return {
+        "get_all": ("get", {"queryStringParameters": None}, False),
+        "get_all_cached": ("get", {"queryStringParameters": None}, True),
+        "get_all_columnar": ("get", {"queryStringParameters": None,
+                                     "headers": {"Accept": "application/vnd.tasks.columnar+json"}}, False),
+        "get_all_ndjson": ("get", {"queryStringParameters": None, "headers": {"Accept": "application/x-ndjson"}}, False),
+        "get_page": ("get", {"queryStringParameters": {"limit": "100"}}, False),
+        "post_single": ("post", {"body": json.dumps({"description": "Benchmark task"})}, False),
+        "post_batch": ("post", {"body": batch}, False),
+    }
+
+
+def reset_state():
+    """Drops the warm-container state a cold start would not have."""
+    import core.db
+    from core.routes import get_tasks, post_task
+    core.db.reset_db_pool()
+    core.db.CREDENTIALS._credentials = None
+    core.db.CREDENTIALS._expires_at = 0
+    get_tasks.RESULT_CACHE.clear()
+    post_task.SCHEMA_CHECKED = False
+
+
+def run_scenario(handler, event, cold, iterations):
+    """Invokes `handler` `iterations` times and returns latency stats plus one traced invocation."""
+    if not cold:
+        handler(dict(event), None)  # ✅ Warm-up call outside the measurement
+
+    latencies = []
+    for _ in range(iterations):
+        if cold:
+            reset_state()
+        started = time.perf_counter()
+        response = handler(dict(event), None)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response["statusCode"] >= 400:
+            raise RuntimeError(f"❌ Handler returned {response['statusCode']}: {response['body'][:200]}")
+
+    if cold:
+        reset_state()
+    tracemalloc.start()
+    response = handler(dict(event), None)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    body_bytes = len(response["body"])
+    del response
+
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "alloc_peak_kb": round(peak / 1024, 1),
+        "alloc_blocks": sum(stat.count for stat in snapshot.statistics("filename")),
+        "body_bytes": body_bytes,
+    }
+
+
+def run(sizes, iterations, scenarios):
+    """Seeds each dataset size and benchmarks every scenario cold and warm."""
+    import boto3
+    from moto import mock_aws
+
+    with mock_aws():
+        boto3.client("secretsmanager", region_name=REGION).create_secret(
+            Name=SECRET_NAME,
+            SecretString=json.dumps({"username": BENCH_DB["user"], "password": BENCH_DB["password"]})
+        )
+
+        from core.routes import get_tasks, post_task
+        handlers = {"get": get_tasks.handle, "post": post_task.handle}
+        events = build_events()
+        default_ttl = get_tasks.CACHE_TTL_SECONDS or 30
+
+        results = []
+        for size in sizes:
+            conn = connect()
+            try:
+                seed(conn, size)
+            finally:
+                conn.close()
+
+            for scenario in scenarios:
+                handler_name, event, cache_enabled = events[scenario]
+                get_tasks.CACHE_TTL_SECONDS = default_ttl if cache_enabled else 0
+                for mode in ("cold", "warm"):
+                    stats = run_scenario(handlers[handler_name], event, mode == "cold", iterations)
+                    results.append({"scenario": scenario, "size": size, "mode": mode, **stats})
+                    print(f"{scenario:>15} {size:>8} {mode:>4}  p50={stats['p50_ms']:.1f}ms "
+                          f"p95={stats['p95_ms']:.1f}ms p99={stats['p99_ms']:.1f}ms", file=sys.stderr)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated dataset sizes")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--output", help="Write the JSON report here as well as to stdout")
+    args = parser.parse_args()
+
+    configure_environment()
+    meta = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+    reason = database_available()
+    if reason:
+        report = {"meta": meta, "skipped": f"PostgreSQL not reachable at {BENCH_DB['host']}:{BENCH_DB['port']}: {reason}"}
+    else:
+        sizes = [int(size) for size in args.sizes.split(",")]
+        report = {"meta": meta, "results": run(sizes, args.iterations, args.scenarios.split(","))}
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,8 @@ locals {
   aws_region = "us-west-2"
 
   # ✅ S3 Bucket Name
-  bucket_name = "${local.env}-frontend-bucket"
+  bucket_name         = "${local.env}-frontend-bucket"
+  archive_bucket_name = "${local.env}-task-archive" # ✅ Private; receives archived task partitions
 
   # ✅ RDS Database Configuration
   db_identifier = "${local.env}task-db"
@@ -25,6 +26,15 @@ locals {
   sentry_dsn = "https://f5a40bb59937b735731b7c78fc85a6a5@o4508747773837312.ingest.de.sentry.io/4508747779145808"
   log_level  = "INFO"
 
+  # ✅ POST /tasks ingestion: "sync" inserts in the request, "async" enqueues to SQS
+  ingestion_mode = "sync"
+
+  # ✅ GET /tasks read replica: when enabled, reads go to the replica unless it lags a client's consistency token
+  read_replica_enabled = false
+
+  # ✅ Monthly task partitions kept in Postgres before the current month; older ones are archived to S3 (0 keeps all)
+  tasks_retention_months = 0
+
   #   AWS CodeBUild
   codebuild_name = "TerraformCodeBuildRole"
 }
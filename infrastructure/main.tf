@@ -12,6 +12,7 @@ module "network" {
 module "s3" {
   source                      = "./modules/s3"
   bucket_name                 = local.bucket_name
+  archive_bucket_name         = local.archive_bucket_name
   cloudfront_distribution_arn = module.cloudfront.cloudfront_distribution_arn
   api_gateway_url             = module.api_gateway.api_endpoint # ✅ Pass API Gateway URL
 }
@@ -38,15 +39,14 @@ module "rds" {
   skip_final_snapshot     = local.skip_final_snapshot
   rds_proxy_role_arn      = module.iam.rds_proxy_role_arn # ✅ Pass IAM Role ARN
   proxy_security_group_id = module.network.rds_proxy_sg_id
+  read_replica_enabled    = local.read_replica_enabled
 }
 
 # ✅ API Gateway Module
 module "api_gateway" {
-  source                = "./modules/api_gateway"
-  post_task_lambda_arn  = module.lambda.post_task_arn
-  get_task_lambda_arn   = module.lambda.get_task_arn
-  post_task_lambda_name = module.lambda.post_task_name
-  get_task_lambda_name  = module.lambda.get_task_name
+  source             = "./modules/api_gateway"
+  router_lambda_arn  = module.lambda.router_arn # ✅ One Lambda (and one warm pool) serves GET, POST and OPTIONS /tasks
+  router_lambda_name = module.lambda.router_name
 }
 
 # ✅ Lambda Module
@@ -58,11 +58,31 @@ module "lambda" {
   subnet_ids                = module.network.rds_private_subnet_ids # ✅ Pass correct private subnets
   rds_proxy_endpoint        = module.rds.rds_proxy_endpoint         # ✅ Use RDS Proxy instead of RDS instance
   rds_host                  = module.rds.rds_proxy_endpoint         # ✅ Use RDS Proxy instead of RDS instance
+  rds_reader_endpoint       = module.rds.rds_replica_address        # ✅ Empty unless the read replica is enabled
   db_name                   = local.db_name
   db_username               = local.db_username
   rds_secret_name           = module.rds.db_secret_name
   sentry_dsn                = local.sentry_dsn
   log_level                 = local.log_level
+  ingestion_mode            = local.ingestion_mode
+  task_queue_url            = module.sqs.queue_url
+  task_queue_arn            = module.sqs.queue_arn
+  snapshot_bucket           = module.s3.s3_bucket_id
+  snapshot_queue_url        = module.snapshot_queue.queue_url
+  snapshot_queue_arn        = module.snapshot_queue.queue_arn
+  archive_bucket            = module.s3.archive_bucket_id
+  tasks_retention_months    = local.tasks_retention_months
+}
+
+# ✅ SQS Module (write-behind task ingestion)
+module "sqs" {
+  source = "./modules/sqs"
+}
+
+# ✅ SQS Module (debounced task snapshot render requests)
+module "snapshot_queue" {
+  source     = "./modules/sqs"
+  queue_name = "task-snapshot"
 }
 
 # ✅ IAM Module
@@ -75,7 +95,11 @@ module "iam" {
   rds_arn                   = module.rds.rds_arn
   rds_proxy_arn             = module.rds.rds_proxy_arn
   lambda_execution_role_arn = module.iam.lambda_execution_role_arn
-  lambda_arns               = [module.lambda.post_task_arn, module.lambda.get_task_arn]
+  task_queue_arn            = module.sqs.queue_arn
+  snapshot_queue_arn        = module.snapshot_queue.queue_arn
+  snapshot_bucket_arn       = module.s3.s3_bucket_arn
+  archive_bucket_arn        = module.s3.archive_bucket_arn
+  lambda_arns               = [module.lambda.post_task_arn, module.lambda.get_task_arn, module.lambda.router_arn]
 }
 
 # ✅ Cloudwatch Module
@@ -7,24 +7,17 @@ resource "aws_apigatewayv2_api" "tasks_api" {
   cors_configuration {
     allow_origins     = ["*"]
     allow_methods     = ["GET", "POST", "OPTIONS"]
-    allow_headers     = ["content-type"]
+    allow_headers     = ["content-type", "if-none-match", "idempotency-key", "x-consistency-token"]
+    expose_headers    = ["etag", "x-next-cursor", "retry-after"]
     allow_credentials = false
     max_age           = 30
   }
 }
 
-# ✅ Integration for POST /tasks
-resource "aws_apigatewayv2_integration" "post_task_integration" {
+# ✅ Single integration: the router Lambda serves every /tasks route from one warm pool
+resource "aws_apigatewayv2_integration" "router_integration" {
   api_id                 = aws_apigatewayv2_api.tasks_api.id
-  integration_uri        = var.post_task_lambda_arn
-  integration_type       = "AWS_PROXY"
-  payload_format_version = "2.0"
-}
-
-# ✅ Integration for GET /tasks
-resource "aws_apigatewayv2_integration" "get_task_integration" {
-  api_id                 = aws_apigatewayv2_api.tasks_api.id
-  integration_uri        = var.get_task_lambda_arn
+  integration_uri        = var.router_lambda_arn
   integration_type       = "AWS_PROXY"
   payload_format_version = "2.0"
 }
@@ -33,45 +26,36 @@ resource "aws_apigatewayv2_integration" "get_task_integration" {
 resource "aws_apigatewayv2_route" "post_task_route" {
   api_id    = aws_apigatewayv2_api.tasks_api.id
   route_key = "POST /tasks"
-  target    = "integrations/${aws_apigatewayv2_integration.post_task_integration.id}"
+  target    = "integrations/${aws_apigatewayv2_integration.router_integration.id}"
 }
 
 # ✅ Define API Gateway Route for GET /tasks
 resource "aws_apigatewayv2_route" "get_task_route" {
   api_id    = aws_apigatewayv2_api.tasks_api.id
   route_key = "GET /tasks"
-  target    = "integrations/${aws_apigatewayv2_integration.get_task_integration.id}"
-}
-
-# ✅ Allow API Gateway to invoke Lambda functions
-resource "aws_lambda_permission" "apigateway_post_permission" {
-  action        = "lambda:InvokeFunction"
-  function_name = var.post_task_lambda_name
-  principal     = "apigateway.amazonaws.com"
-  source_arn    = "${aws_apigatewayv2_api.tasks_api.execution_arn}/*/*"
+  target    = "integrations/${aws_apigatewayv2_integration.router_integration.id}"
 }
 
-resource "aws_lambda_permission" "apigateway_get_permission" {
-  action        = "lambda:InvokeFunction"
-  function_name = var.get_task_lambda_name
-  principal     = "apigateway.amazonaws.com"
-  source_arn    = "${aws_apigatewayv2_api.tasks_api.execution_arn}/*/*"
+# ✅ Define API Gateway Route for GET /tasks/stats (per-day counts from the summary table)
+resource "aws_apigatewayv2_route" "get_task_stats_route" {
+  api_id    = aws_apigatewayv2_api.tasks_api.id
+  route_key = "GET /tasks/stats"
+  target    = "integrations/${aws_apigatewayv2_integration.router_integration.id}"
 }
 
-# ✅ Define API Gateway Route for OPTIONS /tasks (CORS)
+# ✅ Define API Gateway Route for OPTIONS /tasks (CORS preflight answered by the router)
 resource "aws_apigatewayv2_route" "options_tasks" {
   api_id    = aws_apigatewayv2_api.tasks_api.id
   route_key = "OPTIONS /tasks"
-  target    = "integrations/${aws_apigatewayv2_integration.options_tasks.id}"
+  target    = "integrations/${aws_apigatewayv2_integration.router_integration.id}"
 }
 
-# ✅ Integration for OPTIONS /tasks using HTTP_PROXY
-resource "aws_apigatewayv2_integration" "options_tasks" {
-  api_id                 = aws_apigatewayv2_api.tasks_api.id
-  integration_type       = "HTTP_PROXY"
-  integration_method     = "OPTIONS"
-  integration_uri        = "https://httpbin.org/anything" # ✅ Responds with default headers
-  payload_format_version = "1.0"
+# ✅ Allow API Gateway to invoke the router Lambda
+resource "aws_lambda_permission" "apigateway_router_permission" {
+  action        = "lambda:InvokeFunction"
+  function_name = var.router_lambda_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.tasks_api.execution_arn}/*/*"
 }
 
 # ✅ Create CloudWatch Log Group for API Gateway Logs
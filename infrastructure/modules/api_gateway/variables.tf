@@ -1,19 +1,9 @@
-variable "post_task_lambda_arn" {
-  description = "ARN of the post-task Lambda function"
+variable "router_lambda_arn" {
+  description = "ARN of the routed tasks-api Lambda function serving every /tasks route"
   type        = string
 }
 
-variable "get_task_lambda_arn" {
-  description = "ARN of the get-tasks Lambda function"
-  type        = string
-}
-
-variable "post_task_lambda_name" {
-  description = "Name of the post-task Lambda function"
-  type        = string
-}
-
-variable "get_task_lambda_name" {
-  description = "Name of the get-tasks Lambda function"
+variable "router_lambda_name" {
+  description = "Name of the routed tasks-api Lambda function"
   type        = string
 }
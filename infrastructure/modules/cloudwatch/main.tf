@@ -91,6 +91,37 @@ resource "aws_cloudwatch_dashboard" "sre_dashboard" {
         }
       },
 
+      # ✅ Per-phase latency (EMF lines emitted by core/metrics.py)
+      {
+        "type" : "metric",
+        "properties" : {
+          "region" : "eu-central-1",
+          "title" : "GET /tasks Phase Latency (p95, ms)",
+          "metrics" : [for phase in var.latency_phases : [var.metrics_namespace, phase, "Route", "GET /tasks", { "stat" : "p95" }]]
+        }
+      },
+      {
+        "type" : "metric",
+        "properties" : {
+          "region" : "eu-central-1",
+          "title" : "POST /tasks Phase Latency (p95, ms)",
+          "metrics" : [for phase in var.latency_phases : [var.metrics_namespace, phase, "Route", "POST /tasks", { "stat" : "p95" }]]
+        }
+      },
+
+      # ✅ Admission control: adaptive limit (below 1 = share of requests admitted) and shed requests
+      {
+        "type" : "metric",
+        "properties" : {
+          "region" : "eu-central-1",
+          "title" : "Admission Control (limit, rejected requests)",
+          "metrics" : concat(
+            [for route in ["GET /tasks", "POST /tasks"] : [var.metrics_namespace, "admission_limit", "Route", route, { "stat" : "Minimum" }]],
+            [for route in ["GET /tasks", "POST /tasks"] : [var.metrics_namespace, "admission_rejected", "Route", route, { "stat" : "Sum", "yAxis" : "right" }]]
+          )
+        }
+      },
+
       # ✅ API Gateway Metrics
       {
         "type" : "metric",
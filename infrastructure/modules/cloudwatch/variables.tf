@@ -27,3 +27,15 @@ variable "dashboard_name" {
   description = "CloudWatch Dashboard Name"
   type        = string
 }
+
+variable "metrics_namespace" {
+  description = "CloudWatch namespace of the EMF phase timings (METRICS_NAMESPACE)"
+  type        = string
+  default     = "TasksAPI"
+}
+
+variable "latency_phases" {
+  description = "Request phases charted on the latency widgets"
+  type        = list(string)
+  default     = ["credential_fetch", "pool_checkout", "connection_probe", "query", "row_processing", "serialization", "compression", "total"]
+}
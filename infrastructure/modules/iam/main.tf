@@ -39,6 +39,34 @@ resource "aws_iam_policy" "lambda_policy" {
         Effect   = "Allow"
         Action   = ["rds-db:connect"]
         Resource = var.rds_arn
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["sqs:SendMessage", "sqs:ReceiveMessage", "sqs:DeleteMessage", "sqs:GetQueueAttributes"]
+        Resource = var.task_queue_arn # ✅ Write-behind ingestion queue
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["sqs:SendMessage", "sqs:ReceiveMessage", "sqs:DeleteMessage", "sqs:GetQueueAttributes"]
+        Resource = var.snapshot_queue_arn # ✅ Snapshot render requests
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["s3:GetObject", "s3:PutObject", "s3:DeleteObject"]
+        Resource = "${var.snapshot_bucket_arn}/snapshots/*" # ✅ Pre-rendered task snapshots only
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["s3:ListBucket"]
+        Resource = var.snapshot_bucket_arn
+        Condition = {
+          StringLike = { "s3:prefix" = ["snapshots/*"] }
+        }
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["s3:PutObject", "s3:AbortMultipartUpload"]
+        Resource = "${var.archive_bucket_arn}/archive/tasks/*" # ✅ Archived task partitions (write-only)
       }
     ]
   })
@@ -37,3 +37,23 @@ variable "lambda_arns" {
   description = "List of Lambda function ARNs"
   type        = list(string)
 }
+
+variable "task_queue_arn" {
+  description = "ARN of the write-behind task ingestion queue"
+  type        = string
+}
+
+variable "snapshot_queue_arn" {
+  description = "ARN of the task snapshot render queue"
+  type        = string
+}
+
+variable "snapshot_bucket_arn" {
+  description = "ARN of the frontend bucket that holds the task snapshots"
+  type        = string
+}
+
+variable "archive_bucket_arn" {
+  description = "ARN of the private bucket that receives archived task partitions"
+  type        = string
+}
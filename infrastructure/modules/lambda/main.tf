@@ -8,7 +8,7 @@ resource "null_resource" "build_psycopg2_layer" {
     command = <<EOT
       rm -rf ${path.root}/../lambda_functions/psycopg2_layer
       mkdir -p ${path.root}/../lambda_functions/psycopg2_layer/python  # ✅ Correct Layer Structure
-      pip install --platform manylinux2014_x86_64 --target=${path.root}/../lambda_functions/psycopg2_layer/python --implementation cp --python-version 3.9 --only-binary=:all: psycopg2-binary sentry-sdk
+      pip install --platform manylinux2014_x86_64 --target=${path.root}/../lambda_functions/psycopg2_layer/python --implementation cp --python-version 3.9 --only-binary=:all: psycopg2-binary sentry-sdk orjson msgpack brotli
     #   pip install --platform manylinux2014_x86_64 --target=${path.root}/../lambda_functions/psycopg2_layer/python --implementation cp --python-version 3.9 --only-binary=:all: -r ${path.root}/../lambda_functions/requirements.txt
       cd ${path.root}/../lambda_functions/psycopg2_layer/
       zip -r psycopg2_layer.zip python
@@ -31,14 +31,16 @@ resource "aws_lambda_layer_version" "psycopg2_layer" {
 # ✅ Ensure post_task.zip is always updated
 resource "null_resource" "build_post_task_zip" {
   triggers = {
-    file_hash = filemd5("${path.root}/../lambda_functions/post_task.py") # ✅ Track changes based on file hash
+    file_hash       = filemd5("${path.root}/../lambda_functions/post_task.py") # ✅ Track changes based on file hash
+    core_hash       = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/core", "**/*.py") : filemd5("${path.root}/../lambda_functions/core/${f}")])) # ✅ Shared core package
+    migrations_hash = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/migrations", "*.sql") : filemd5("${path.root}/../lambda_functions/migrations/${f}")])) # ✅ Expected schema version
   }
 
   provisioner "local-exec" {
     command = <<EOT
       cd ${path.root}/../lambda_functions
       rm -f post_task.zip
-      zip -r post_task.zip post_task.py
+      zip -r post_task.zip post_task.py core migrations -x "*/__pycache__/*"
     EOT
   }
 }
@@ -47,13 +49,112 @@ resource "null_resource" "build_post_task_zip" {
 resource "null_resource" "build_get_tasks_zip" {
   triggers = {
     file_hash = filemd5("${path.root}/../lambda_functions/get_tasks.py") # ✅ Track changes based on file hash
+    core_hash = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/core", "**/*.py") : filemd5("${path.root}/../lambda_functions/core/${f}")])) # ✅ Shared core package
   }
 
   provisioner "local-exec" {
     command = <<EOT
       cd ${path.root}/../lambda_functions
       rm -f get_tasks.zip
-      zip -r get_tasks.zip get_tasks.py
+      zip -r get_tasks.zip get_tasks.py core -x "*/__pycache__/*"
+    EOT
+  }
+}
+
+# ✅ Ensure router.zip is always updated
+resource "null_resource" "build_router_zip" {
+  triggers = {
+    file_hash       = filemd5("${path.root}/../lambda_functions/router.py") # ✅ Track changes based on file hash
+    core_hash       = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/core", "**/*.py") : filemd5("${path.root}/../lambda_functions/core/${f}")]))
+    migrations_hash = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/migrations", "*.sql") : filemd5("${path.root}/../lambda_functions/migrations/${f}")]))
+  }
+
+  provisioner "local-exec" {
+    command = <<EOT
+      cd ${path.root}/../lambda_functions
+      rm -f router.zip
+      zip -r router.zip router.py core migrations -x "*/__pycache__/*"
+    EOT
+  }
+}
+
+# ✅ Ensure consume_tasks.zip is always updated
+resource "null_resource" "build_consume_tasks_zip" {
+  triggers = {
+    file_hash = filemd5("${path.root}/../lambda_functions/consume_tasks.py") # ✅ Track changes based on file hash
+    core_hash = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/core", "**/*.py") : filemd5("${path.root}/../lambda_functions/core/${f}")]))
+  }
+
+  provisioner "local-exec" {
+    command = <<EOT
+      cd ${path.root}/../lambda_functions
+      rm -f consume_tasks.zip
+      zip -r consume_tasks.zip consume_tasks.py core -x "*/__pycache__/*"
+    EOT
+  }
+}
+
+# ✅ Ensure publish_snapshot.zip is always updated
+resource "null_resource" "build_publish_snapshot_zip" {
+  triggers = {
+    file_hash = filemd5("${path.root}/../lambda_functions/publish_snapshot.py") # ✅ Track changes based on file hash
+    core_hash = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/core", "**/*.py") : filemd5("${path.root}/../lambda_functions/core/${f}")]))
+  }
+
+  provisioner "local-exec" {
+    command = <<EOT
+      cd ${path.root}/../lambda_functions
+      rm -f publish_snapshot.zip
+      zip -r publish_snapshot.zip publish_snapshot.py core -x "*/__pycache__/*"
+    EOT
+  }
+}
+
+# ✅ Ensure migrate.zip is always updated
+resource "null_resource" "build_migrate_zip" {
+  triggers = {
+    file_hash       = filemd5("${path.root}/../lambda_functions/migrate.py") # ✅ Track changes based on file hash
+    core_hash       = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/core", "**/*.py") : filemd5("${path.root}/../lambda_functions/core/${f}")]))
+    migrations_hash = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/migrations", "*.sql") : filemd5("${path.root}/../lambda_functions/migrations/${f}")])) # ✅ New migrations redeploy the runner
+  }
+
+  provisioner "local-exec" {
+    command = <<EOT
+      cd ${path.root}/../lambda_functions
+      rm -f migrate.zip
+      zip -r migrate.zip migrate.py core migrations -x "*/__pycache__/*"
+    EOT
+  }
+}
+
+# ✅ Ensure maintain_partitions.zip is always updated
+resource "null_resource" "build_maintain_partitions_zip" {
+  triggers = {
+    file_hash = filemd5("${path.root}/../lambda_functions/maintain_partitions.py") # ✅ Track changes based on file hash
+    core_hash = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/core", "**/*.py") : filemd5("${path.root}/../lambda_functions/core/${f}")]))
+  }
+
+  provisioner "local-exec" {
+    command = <<EOT
+      cd ${path.root}/../lambda_functions
+      rm -f maintain_partitions.zip
+      zip -r maintain_partitions.zip maintain_partitions.py migrate.py core -x "*/__pycache__/*"
+    EOT
+  }
+}
+
+# ✅ Ensure rebuild_stats.zip is always updated
+resource "null_resource" "build_rebuild_stats_zip" {
+  triggers = {
+    file_hash = filemd5("${path.root}/../lambda_functions/rebuild_stats.py") # ✅ Track changes based on file hash
+    core_hash = sha1(join("", [for f in fileset("${path.root}/../lambda_functions/core", "**/*.py") : filemd5("${path.root}/../lambda_functions/core/${f}")]))
+  }
+
+  provisioner "local-exec" {
+    command = <<EOT
+      cd ${path.root}/../lambda_functions
+      rm -f rebuild_stats.zip
+      zip -r rebuild_stats.zip rebuild_stats.py migrate.py core -x "*/__pycache__/*"
     EOT
   }
 }
@@ -83,11 +184,15 @@ resource "aws_lambda_function" "post_task" {
 
   environment {
     variables = {
-      DB_HOST        = var.rds_proxy_endpoint # ✅ Use RDS Proxy instead of RDS
-      DB_NAME        = var.db_name
-      DB_SECRET_NAME = var.rds_secret_name
-      SENTRY_DSN     = var.sentry_dsn # ✅ Sentry DSN for error monitoring
-      LOG_LEVEL      = var.log_level  # ✅ Allows changing logging levels dynamically
+      DB_HOST                  = var.rds_proxy_endpoint # ✅ Use RDS Proxy instead of RDS
+      DB_NAME                  = var.db_name
+      DB_SECRET_NAME           = var.rds_secret_name
+      SENTRY_DSN               = var.sentry_dsn     # ✅ Sentry DSN for error monitoring
+      LOG_LEVEL                = var.log_level      # ✅ Allows changing logging levels dynamically
+      TASKS_INGESTION_MODE     = var.ingestion_mode # ✅ "async" enqueues to SQS (write-behind)
+      TASKS_QUEUE_URL          = var.task_queue_url
+      TASKS_SNAPSHOT_QUEUE_URL = var.snapshot_queue_url  # ✅ Writes queue a debounced snapshot render
+      DB_READER_HOST           = var.rds_reader_endpoint # ✅ Set: GET reads the replica, POST returns consistency tokens
       #   REGION     = var.region
     }
   }
@@ -118,7 +223,8 @@ resource "aws_lambda_function" "get_tasks" {
 
   environment {
     variables = {
-      DB_HOST        = var.rds_proxy_endpoint # ✅ Use RDS Proxy instead of RDS
+      DB_HOST        = var.rds_proxy_endpoint  # ✅ Use RDS Proxy instead of RDS
+      DB_READER_HOST = var.rds_reader_endpoint # ✅ Replica for reads; empty reads from DB_HOST
       DB_NAME        = var.db_name
       DB_SECRET_NAME = var.rds_secret_name
       SENTRY_DSN     = var.sentry_dsn # ✅ Sentry DSN for error monitoring
@@ -127,3 +233,264 @@ resource "aws_lambda_function" "get_tasks" {
     }
   }
 }
+
+# ✅ AWS Lambda Function serving GET, POST and OPTIONS /tasks over one shared connection pool
+resource "aws_lambda_function" "router" {
+  function_name = "tasks-api"
+  runtime       = "python3.9"
+  handler       = "router.lambda_handler"
+  memory_size   = 512
+  timeout       = 45
+  role          = var.lambda_execution_role_arn                 # ✅ Use IAM role from IAM module
+  filename      = "${path.root}/../lambda_functions/router.zip" # ✅ Use dynamically created ZIP
+
+  layers = [aws_lambda_layer_version.psycopg2_layer.arn]
+
+  vpc_config {
+    security_group_ids = [var.lambda_sg_id]
+    subnet_ids         = var.subnet_ids # ✅ Attach correct private subnets
+  }
+
+  depends_on = [var.rds_secret_name] # ✅ Ensure RDS is deployed first
+
+  lifecycle {
+    replace_triggered_by = [null_resource.build_router_zip]
+  }
+
+  environment {
+    variables = {
+      DB_HOST                  = var.rds_proxy_endpoint # ✅ Use RDS Proxy instead of RDS
+      DB_NAME                  = var.db_name
+      DB_SECRET_NAME           = var.rds_secret_name
+      SENTRY_DSN               = var.sentry_dsn     # ✅ Sentry DSN for error monitoring
+      LOG_LEVEL                = var.log_level      # ✅ Allows changing logging levels dynamically
+      TASKS_INGESTION_MODE     = var.ingestion_mode # ✅ "async" enqueues to SQS (write-behind)
+      TASKS_QUEUE_URL          = var.task_queue_url
+      TASKS_SNAPSHOT_QUEUE_URL = var.snapshot_queue_url  # ✅ Writes queue a debounced snapshot render
+      DB_READER_HOST           = var.rds_reader_endpoint # ✅ Set: GET reads the replica, POST returns consistency tokens
+    }
+  }
+}
+
+# ✅ AWS Lambda Function for schema migrations (invoked by the deploy pipeline)
+resource "aws_lambda_function" "migrate" {
+  function_name = "task-migrations"
+  runtime       = "python3.9"
+  handler       = "migrate.lambda_handler"
+  memory_size   = 256
+  timeout       = 300
+  role          = var.lambda_execution_role_arn
+  filename      = "${path.root}/../lambda_functions/migrate.zip"
+
+  layers = [aws_lambda_layer_version.psycopg2_layer.arn]
+
+  vpc_config {
+    security_group_ids = [var.lambda_sg_id]
+    subnet_ids         = var.subnet_ids
+  }
+
+  depends_on = [var.rds_secret_name] # ✅ Ensure RDS is deployed first
+
+  lifecycle {
+    replace_triggered_by = [null_resource.build_migrate_zip]
+  }
+
+  environment {
+    variables = {
+      DB_HOST        = var.rds_proxy_endpoint
+      DB_NAME        = var.db_name
+      DB_SECRET_NAME = var.rds_secret_name
+      SENTRY_DSN     = var.sentry_dsn
+      LOG_LEVEL      = var.log_level
+    }
+  }
+}
+
+# ✅ AWS Lambda Function draining the write-behind queue into Postgres
+resource "aws_lambda_function" "consume_tasks" {
+  function_name = "consume-tasks"
+  runtime       = "python3.9"
+  handler       = "consume_tasks.lambda_handler"
+  memory_size   = 256
+  timeout       = 45
+  role          = var.lambda_execution_role_arn
+  filename      = "${path.root}/../lambda_functions/consume_tasks.zip"
+
+  layers = [aws_lambda_layer_version.psycopg2_layer.arn]
+
+  vpc_config {
+    security_group_ids = [var.lambda_sg_id]
+    subnet_ids         = var.subnet_ids
+  }
+
+  depends_on = [var.rds_secret_name] # ✅ Ensure RDS is deployed first
+
+  lifecycle {
+    replace_triggered_by = [null_resource.build_consume_tasks_zip]
+  }
+
+  environment {
+    variables = {
+      DB_HOST                  = var.rds_proxy_endpoint
+      DB_NAME                  = var.db_name
+      DB_SECRET_NAME           = var.rds_secret_name
+      SENTRY_DSN               = var.sentry_dsn
+      LOG_LEVEL                = var.log_level
+      TASKS_SNAPSHOT_QUEUE_URL = var.snapshot_queue_url # ✅ Ingested batches queue a debounced snapshot render
+    }
+  }
+}
+
+# ✅ Batched delivery: up to 100 messages or 5 s per invoke, capped concurrency bounds DB connections
+resource "aws_lambda_event_source_mapping" "consume_tasks" {
+  event_source_arn                   = var.task_queue_arn
+  function_name                      = aws_lambda_function.consume_tasks.arn
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 5
+  function_response_types            = ["ReportBatchItemFailures"] # ✅ Retry only the failed messages
+
+  scaling_config {
+    maximum_concurrency = 5
+  }
+}
+
+# ✅ AWS Lambda Function rendering the first pages of GET /tasks to S3 for CloudFront
+resource "aws_lambda_function" "publish_snapshot" {
+  function_name = "publish-task-snapshot"
+  runtime       = "python3.9"
+  handler       = "publish_snapshot.lambda_handler"
+  memory_size   = 256
+  timeout       = 45
+  role          = var.lambda_execution_role_arn
+  filename      = "${path.root}/../lambda_functions/publish_snapshot.zip"
+
+  layers = [aws_lambda_layer_version.psycopg2_layer.arn]
+
+  vpc_config {
+    security_group_ids = [var.lambda_sg_id]
+    subnet_ids         = var.subnet_ids
+  }
+
+  depends_on = [var.rds_secret_name] # ✅ Ensure RDS is deployed first
+
+  lifecycle {
+    replace_triggered_by = [null_resource.build_publish_snapshot_zip]
+  }
+
+  environment {
+    variables = {
+      DB_HOST               = var.rds_proxy_endpoint
+      DB_NAME               = var.db_name
+      DB_SECRET_NAME        = var.rds_secret_name
+      SENTRY_DSN            = var.sentry_dsn
+      LOG_LEVEL             = var.log_level
+      TASKS_SNAPSHOT_BUCKET = var.snapshot_bucket
+    }
+  }
+}
+
+# ✅ Coalescing: every render request within 10 s lands in one invoke, which renders once
+resource "aws_lambda_event_source_mapping" "publish_snapshot" {
+  event_source_arn                   = var.snapshot_queue_arn
+  function_name                      = aws_lambda_function.publish_snapshot.arn
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 10
+
+  scaling_config {
+    maximum_concurrency = 2 # ✅ SQS minimum; overlapping renders never move the pointer backwards
+  }
+}
+
+# ✅ AWS Lambda Function creating upcoming task partitions and archiving expired ones to S3
+resource "aws_lambda_function" "maintain_partitions" {
+  function_name = "task-partition-maintenance"
+  runtime       = "python3.9"
+  handler       = "maintain_partitions.lambda_handler"
+  memory_size   = 512
+  timeout       = 900 # ✅ Exporting a month of tasks can take minutes
+  role          = var.lambda_execution_role_arn
+  filename      = "${path.root}/../lambda_functions/maintain_partitions.zip"
+
+  layers = [aws_lambda_layer_version.psycopg2_layer.arn]
+
+  ephemeral_storage {
+    size = 4096 # ✅ Each archive is written to /tmp before the upload
+  }
+
+  vpc_config {
+    security_group_ids = [var.lambda_sg_id]
+    subnet_ids         = var.subnet_ids
+  }
+
+  depends_on = [var.rds_secret_name] # ✅ Ensure RDS is deployed first
+
+  lifecycle {
+    replace_triggered_by = [null_resource.build_maintain_partitions_zip]
+  }
+
+  environment {
+    variables = {
+      DB_HOST                = var.rds_proxy_endpoint
+      DB_NAME                = var.db_name
+      DB_SECRET_NAME         = var.rds_secret_name
+      SENTRY_DSN             = var.sentry_dsn
+      LOG_LEVEL              = var.log_level
+      TASKS_ARCHIVE_BUCKET   = var.archive_bucket
+      TASKS_RETENTION_MONTHS = var.tasks_retention_months
+    }
+  }
+}
+
+# ✅ Daily run; partitions exist months ahead, so a missed run is harmless
+resource "aws_cloudwatch_event_rule" "maintain_partitions" {
+  name                = "task-partition-maintenance"
+  description         = "Creates upcoming task partitions and archives expired ones"
+  schedule_expression = "cron(15 3 * * ? *)"
+}
+
+resource "aws_cloudwatch_event_target" "maintain_partitions" {
+  rule = aws_cloudwatch_event_rule.maintain_partitions.name
+  arn  = aws_lambda_function.maintain_partitions.arn
+}
+
+resource "aws_lambda_permission" "maintain_partitions_schedule" {
+  statement_id  = "AllowEventBridgeInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.maintain_partitions.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.maintain_partitions.arn
+}
+
+# ✅ AWS Lambda Function recounting the per-day task stats (invoked by hand for backfills)
+resource "aws_lambda_function" "rebuild_stats" {
+  function_name = "task-stats-rebuild"
+  runtime       = "python3.9"
+  handler       = "rebuild_stats.lambda_handler"
+  memory_size   = 256
+  timeout       = 900
+  role          = var.lambda_execution_role_arn
+  filename      = "${path.root}/../lambda_functions/rebuild_stats.zip"
+
+  layers = [aws_lambda_layer_version.psycopg2_layer.arn]
+
+  vpc_config {
+    security_group_ids = [var.lambda_sg_id]
+    subnet_ids         = var.subnet_ids
+  }
+
+  depends_on = [var.rds_secret_name] # ✅ Ensure RDS is deployed first
+
+  lifecycle {
+    replace_triggered_by = [null_resource.build_rebuild_stats_zip]
+  }
+
+  environment {
+    variables = {
+      DB_HOST        = var.rds_proxy_endpoint
+      DB_NAME        = var.db_name
+      DB_SECRET_NAME = var.rds_secret_name
+      SENTRY_DSN     = var.sentry_dsn
+      LOG_LEVEL      = var.log_level
+    }
+  }
+}
@@ -17,3 +17,38 @@ output "get_task_name" {
   value       = aws_lambda_function.get_tasks.function_name
   description = "Name of the get-tasks Lambda function"
 }
+
+output "migrate_name" {
+  value       = aws_lambda_function.migrate.function_name
+  description = "Name of the schema migration Lambda function"
+}
+
+output "router_arn" {
+  value       = aws_lambda_function.router.arn
+  description = "ARN of the routed tasks-api Lambda function"
+}
+
+output "router_name" {
+  value       = aws_lambda_function.router.function_name
+  description = "Name of the routed tasks-api Lambda function"
+}
+
+output "consume_tasks_name" {
+  value       = aws_lambda_function.consume_tasks.function_name
+  description = "Name of the write-behind queue consumer Lambda function"
+}
+
+output "publish_snapshot_name" {
+  value       = aws_lambda_function.publish_snapshot.function_name
+  description = "Name of the task snapshot publisher Lambda function"
+}
+
+output "maintain_partitions_name" {
+  value       = aws_lambda_function.maintain_partitions.function_name
+  description = "Name of the task partition maintenance Lambda function"
+}
+
+output "rebuild_stats_name" {
+  value       = aws_lambda_function.rebuild_stats.function_name
+  description = "Name of the task stats rebuild Lambda function"
+}
@@ -38,6 +38,12 @@ variable "rds_proxy_endpoint" {
   type        = string
 }
 
+variable "rds_reader_endpoint" {
+  description = "Read replica hostname for GET /tasks (empty reads from the primary)"
+  type        = string
+  default     = ""
+}
+
 variable "sentry_dsn" {
   description = "Sentry DSN for error monitoring"
   type        = string
@@ -49,6 +55,49 @@ variable "log_level" {
   default     = "logging.INFO"
 }
 
+variable "ingestion_mode" {
+  description = "POST /tasks ingestion mode: sync (insert in request) or async (enqueue to SQS)"
+  type        = string
+  default     = "sync"
+}
+
+variable "task_queue_url" {
+  description = "URL of the write-behind task ingestion queue"
+  type        = string
+}
+
+variable "task_queue_arn" {
+  description = "ARN of the write-behind task ingestion queue"
+  type        = string
+}
+
+variable "snapshot_bucket" {
+  description = "Bucket (served by CloudFront) that receives the pre-rendered task snapshots"
+  type        = string
+}
+
+variable "snapshot_queue_url" {
+  description = "URL of the task snapshot render queue (empty disables snapshot publishing)"
+  type        = string
+  default     = ""
+}
+
+variable "snapshot_queue_arn" {
+  description = "ARN of the task snapshot render queue"
+  type        = string
+}
+
+variable "archive_bucket" {
+  description = "Private bucket that receives archived task partitions"
+  type        = string
+}
+
+variable "tasks_retention_months" {
+  description = "Monthly task partitions kept before the current month; older ones are archived (0 keeps all)"
+  type        = number
+  default     = 0
+}
+
 # variable "region" {
 #   type = string
 # }
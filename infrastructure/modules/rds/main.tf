@@ -32,6 +32,21 @@ module "rds" {
   enabled_cloudwatch_logs_exports = ["postgresql"]
 }
 
+# ✅ Optional Read Replica (RDS Proxy cannot target non-Aurora replicas, so Lambdas connect to it directly)
+resource "aws_db_instance" "read_replica" {
+  count = var.read_replica_enabled ? 1 : 0
+
+  identifier             = "${var.db_identifier}-replica"
+  replicate_source_db    = module.rds.db_instance_identifier
+  instance_class         = var.instance_class
+  publicly_accessible    = false
+  vpc_security_group_ids = [var.security_group_id]
+
+  backup_retention_period      = 0
+  skip_final_snapshot          = true
+  performance_insights_enabled = true
+}
+
 # ✅ Fetch RDS Instance Information for Outputs
 data "aws_db_instance" "rds" {
   db_instance_identifier = module.rds.db_instance_identifier
@@ -51,6 +51,11 @@ output "rds_instance_endpoint" {
   description = "RDS instance endpoint (if needed as a fallback)"
 }
 
+output "rds_replica_address" {
+  value       = var.read_replica_enabled ? aws_db_instance.read_replica[0].address : ""
+  description = "Read replica hostname (empty when the replica is disabled)"
+}
+
 output "rds_proxy_arn" {
   value       = aws_db_proxy.rds_proxy.arn
   description = "ARN of the RDS Proxy"
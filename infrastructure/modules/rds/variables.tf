@@ -62,3 +62,9 @@ variable "proxy_security_group_id" {
   description = "Security Group ID for RDS Proxy"
   type        = string
 }
+
+variable "read_replica_enabled" {
+  description = "Create a read replica to serve GET /tasks"
+  type        = bool
+  default     = false
+}
@@ -18,9 +18,64 @@ module "s3_bucket" {
     enabled = true
   }
 
+  # ✅ Superseded task snapshot pages are deleted by the publisher; expire their noncurrent copies
+  lifecycle_rule = [
+    {
+      id      = "expire-replaced-task-snapshots"
+      enabled = true
+      filter = {
+        prefix = "snapshots/"
+      }
+      noncurrent_version_expiration = {
+        days = 1
+      }
+      expiration = {
+        expired_object_delete_marker = true
+      }
+    }
+  ]
+
   force_destroy = true
 }
 
+# ✅ Private S3 Bucket for archived task partitions (never served by CloudFront)
+module "archive_bucket" {
+  source  = "terraform-aws-modules/s3-bucket/aws"
+  version = "3.3.0"
+
+  bucket = "${var.archive_bucket_name}-${random_string.suffix.result}"
+
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+
+  server_side_encryption_configuration = {
+    rule = {
+      apply_server_side_encryption_by_default = {
+        sse_algorithm = "AES256"
+      }
+    }
+  }
+
+  # ✅ Archived months are rarely read; move them to cheaper storage
+  lifecycle_rule = [
+    {
+      id      = "archive-task-partitions"
+      enabled = true
+      filter = {
+        prefix = "archive/"
+      }
+      transition = [
+        {
+          days          = 30
+          storage_class = "GLACIER_IR"
+        }
+      ]
+    }
+  ]
+}
+
 # ✅ Secure S3 Bucket with Ownership Controls
 resource "aws_s3_bucket_ownership_controls" "frontend_bucket_ownership" {
   bucket = module.s3_bucket.s3_bucket_id
@@ -15,3 +15,13 @@ output "s3_bucket_domain" {
 output "s3_bucket_regional_domain" {
   value = module.s3_bucket.s3_bucket_bucket_regional_domain_name
 }
+
+output "archive_bucket_id" {
+  value       = module.archive_bucket.s3_bucket_id
+  description = "The ID of the task archive bucket"
+}
+
+output "archive_bucket_arn" {
+  value       = module.archive_bucket.s3_bucket_arn
+  description = "Task archive bucket ARN"
+}
@@ -3,6 +3,11 @@ variable "bucket_name" {
   type        = string
 }
 
+variable "archive_bucket_name" {
+  description = "Name prefix for the private bucket that receives archived task partitions"
+  type        = string
+}
+
 variable "cloudfront_distribution_arn" {
   description = "ARN of the CloudFront distribution for bucket policy"
   type        = string
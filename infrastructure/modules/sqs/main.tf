@@ -0,0 +1,17 @@
+# ✅ Dead-letter queue for task messages the consumer keeps failing on
+resource "aws_sqs_queue" "task_ingest_dlq" {
+  name                      = "${var.queue_name}-dlq"
+  message_retention_seconds = 1209600 # ✅ 14 days to inspect and redrive
+}
+
+# ✅ Write-behind queue: POST /tasks enqueues, the consumer Lambda inserts in batches
+resource "aws_sqs_queue" "task_ingest" {
+  name                       = var.queue_name
+  visibility_timeout_seconds = var.visibility_timeout_seconds # ✅ Must exceed the consumer Lambda timeout
+  message_retention_seconds  = 345600                         # ✅ 4 days
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.task_ingest_dlq.arn
+    maxReceiveCount     = var.max_receive_count
+  })
+}
@@ -0,0 +1,14 @@
+output "queue_url" {
+  value       = aws_sqs_queue.task_ingest.url
+  description = "URL of the task ingestion queue"
+}
+
+output "queue_arn" {
+  value       = aws_sqs_queue.task_ingest.arn
+  description = "ARN of the task ingestion queue"
+}
+
+output "dlq_arn" {
+  value       = aws_sqs_queue.task_ingest_dlq.arn
+  description = "ARN of the task ingestion dead-letter queue"
+}
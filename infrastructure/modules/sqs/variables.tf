@@ -0,0 +1,17 @@
+variable "queue_name" {
+  description = "Name of the task ingestion queue"
+  type        = string
+  default     = "task-ingest"
+}
+
+variable "visibility_timeout_seconds" {
+  description = "Visibility timeout; must be at least six times the consumer Lambda timeout"
+  type        = number
+  default     = 300
+}
+
+variable "max_receive_count" {
+  description = "Deliveries before a message is moved to the dead-letter queue"
+  type        = number
+  default     = 5
+}
@@ -19,6 +19,11 @@ output "cloudfront_url" {
   description = "CloudFront Distribution URL"
 }
 
+output "task_snapshot_url" {
+  value       = "https://${module.cloudfront.cloudfront_distribution_domain_name}/snapshots/tasks/latest.json"
+  description = "Pointer to the current pre-rendered task snapshot"
+}
+
 output "cloudwatch_dashboard_url" {
   value       = module.cloudwatch.cloudwatch_dashboard_url
   description = "URL of the CloudWatch dashboard"
@@ -0,0 +1,9 @@
+"""SQS consumer entry point for write-behind task ingestion.
+
+The handler lives in core.routes.consume_tasks; it drains messages enqueued by
+POST /tasks when TASKS_INGESTION_MODE=async.
+"""
+from core.monitoring import bootstrap
+from core.routes.consume_tasks import handle as lambda_handler  # noqa: F401
+
+bootstrap()
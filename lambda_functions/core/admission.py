@@ -0,0 +1,156 @@
+import json
+import math
+import os
+import random
+import threading
+import time
+import logging
+from collections import deque
+from core.metrics import count, gauge
+from core.responses import build_response
+
+logger = logging.getLogger(__name__)
+
+# Adaptive limit on concurrent database work in this container, checked before every pool checkout
+ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+MAX_LIMIT = float(os.getenv("ADMISSION_MAX_LIMIT", "10"))  # ✅ The pool's maxconn; more would raise PoolError
+MIN_LIMIT = float(os.getenv("ADMISSION_MIN_LIMIT", "0.05"))  # ✅ Keeps admitting a trickle to notice recovery
+LIMIT_INCREASE = float(os.getenv("ADMISSION_LIMIT_INCREASE", "0.1"))
+LIMIT_BACKOFF = float(os.getenv("ADMISSION_LIMIT_BACKOFF", "0.5"))
+# A call slower than this multiple of the healthy average (and the floor below) counts as congestion
+LATENCY_TOLERANCE = float(os.getenv("ADMISSION_LATENCY_TOLERANCE", "2"))
+MIN_LATENCY_TARGET_MS = float(os.getenv("ADMISSION_MIN_LATENCY_TARGET_MS", "250"))
+MAX_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_MAX_RETRY_AFTER_SECONDS", "30"))
+
+BASELINE_ALPHA = 0.05  # Weight of each sample in the healthy-latency average
+WINDOW = 100  # Recent outcomes kept for the error rate
+
+
+class Overloaded(Exception):
+    """Raised when admission control rejects a request before it touches the database."""
+
+    def __init__(self, status_code, retry_after):
+        super().__init__(f"❌ Database is saturated; retry after {retry_after} s")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit for database work, driven by call latency and errors.
+
+    A call that succeeds within the latency target raises the limit by `increase`;
+    an error or a slower call multiplies it by `backoff`. The target follows the
+    average latency of healthy calls, so a permanently slower database becomes the
+    new normal instead of shedding forever.
+
+    Below 1 the limit is an admission probability: a container that runs one
+    request at a time (Lambda) admits that fraction of its requests, so the whole
+    fleet sheds the same share of load.
+    """
+
+    def __init__(self, max_limit=MAX_LIMIT, min_limit=MIN_LIMIT, increase=LIMIT_INCREASE,
+                 backoff=LIMIT_BACKOFF, tolerance=LATENCY_TOLERANCE, min_target_ms=MIN_LATENCY_TARGET_MS):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.min_target_ms = min_target_ms
+        self.limit = max_limit
+        self.inflight = 0
+        self.baseline_ms = None  # Average latency of healthy calls
+        self._outcomes = deque(maxlen=WINDOW)  # True for errors
+        self._lock = threading.Lock()
+        self.stats = {"admitted": 0, "rejected": 0, "errors": 0, "slow": 0}
+
+    def target_ms(self):
+        """Returns the latency above which a call counts as congestion."""
+        if self.baseline_ms is None:
+            return None
+        return max(self.baseline_ms * self.tolerance, self.min_target_ms)
+
+    def error_rate(self):
+        """Returns the share of errors among the recent outcomes."""
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def retry_after(self):
+        """Returns the Retry-After seconds for a rejection: longer the harder the limit has backed off."""
+        return min(MAX_RETRY_AFTER_SECONDS, max(1, math.ceil(1 / self.limit)))
+
+    def acquire(self):
+        """Admits one unit of database work or raises Overloaded.
+
+        Returns the monotonic start time to pass back to release().
+        """
+        with self._lock:
+            capacity = self.limit - self.inflight
+            admitted = capacity >= 1 or random.random() < capacity
+            if admitted:
+                self.inflight += 1
+                self.stats["admitted"] += 1
+            else:
+                self.stats["rejected"] += 1
+            limit = self.limit
+
+        gauge("admission_limit", round(limit, 3))
+        count("admission_rejected", 0 if admitted else 1)
+        if not admitted:
+            # ✅ 503 while the database is struggling, 429 when only this container's slots are full
+            status_code = 503 if limit < 1 else 429
+            raise Overloaded(status_code, self.retry_after())
+        return time.monotonic()
+
+    def release(self, started, ok=True, sample_latency=True):
+        """Ends a unit of work started at `started` and adapts the limit to its outcome.
+
+        `sample_latency=False` (long-polls, exports) records errors but not the duration.
+        """
+        latency_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            self.inflight = max(self.inflight - 1, 0)
+            target = self.target_ms()
+            slow = ok and sample_latency and target is not None and latency_ms > target
+            self._outcomes.append(not ok)
+
+            if not ok or slow:
+                self.stats["errors" if not ok else "slow"] += 1
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            elif sample_latency:
+                self.limit = min(self.max_limit, self.limit + self.increase)
+
+            if ok and sample_latency:
+                if self.baseline_ms is None:
+                    self.baseline_ms = latency_ms
+                else:
+                    self.baseline_ms += BASELINE_ALPHA * (latency_ms - self.baseline_ms)
+            limit, error_rate = self.limit, self.error_rate()
+
+        gauge("admission_limit", round(limit, 3))
+        gauge("admission_error_rate", round(error_rate * 100, 1), "Percent")
+        if slow or not ok:
+            logger.warning("⚠️ Database call %s after %.0f ms; admission limit now %.2f.",
+                           "failed" if not ok else "was slow", latency_ms, limit)
+
+    def snapshot(self):
+        """Returns the limiter state for logs and tests."""
+        with self._lock:
+            return {
+                "limit": round(self.limit, 3),
+                "inflight": self.inflight,
+                "baseline_ms": round(self.baseline_ms, 1) if self.baseline_ms is not None else None,
+                "error_rate": round(self.error_rate(), 3),
+                **self.stats,
+            }
+
+
+LIMITER = AdaptiveLimiter()
+
+
+def overloaded_response(error):
+    """Builds the fast 429/503 rejection with Retry-After."""
+    logger.warning("⚠️ Request shed by admission control (%d, retry after %d s).", error.status_code, error.retry_after)
+    return build_response(
+        error.status_code,
+        json.dumps({"error": "Too many requests." if error.status_code == 429 else "Service overloaded."}),
+        {"Retry-After": str(error.retry_after)}
+    )
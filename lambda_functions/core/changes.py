@@ -0,0 +1,157 @@
+import base64
+import json
+import os
+import select
+import time
+import logging
+from core.deadline import with_statement_timeout
+from core.metrics import timer
+
+logger = logging.getLogger(__name__)
+
+# Channel notified (on commit) by the tasks_inserted_notify trigger from migration 0005
+CHANGES_CHANNEL = "tasks_inserted"
+
+# Longest GET /tasks?wait= long-poll; API Gateway HTTP APIs time out at 30 s. 0 disables waiting.
+LONG_POLL_MAX_SECONDS = float(os.getenv("TASKS_LONG_POLL_MAX_SECONDS", "20"))
+
+# SERIAL ids are taken before commit, so a skipped id may still be committing. Skipped ids are
+# re-checked for this long (well past the 45 s Lambda timeout), then treated as rolled back.
+GAP_TTL_SECONDS = int(os.getenv("TASKS_CHANGES_GAP_TTL_SECONDS", "120"))
+MAX_GAPS = int(os.getenv("TASKS_CHANGES_MAX_GAPS", "200"))
+
+
+def encode_watermark(last_id, gaps):
+    """Encodes the delta-sync position (last delivered id, {skipped id: first seen}) as an opaque token."""
+    payload = json.dumps([last_id, sorted(gaps.items())], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_watermark(token):
+    """Decodes a watermark token back into (last id, {skipped id: first seen})."""
+    try:
+        last_id, gaps = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return int(last_id), {int(gap_id): int(seen_at) for gap_id, seen_at in gaps}
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("❌ Invalid watermark")
+
+
+def parse_since(params):
+    """Returns the (last id, gaps) position from ?watermark= or ?since_id=, or None outside delta mode."""
+    if params.get("watermark"):
+        return decode_watermark(params["watermark"])
+    if params.get("since_id") is None:
+        return None
+    try:
+        since_id = int(params["since_id"])
+    except ValueError:
+        raise ValueError("❌ since_id must be an integer")
+    if since_id < 0:
+        raise ValueError("❌ since_id must not be negative")
+    return since_id, {}
+
+
+def parse_wait(value):
+    """Parses the long-poll `wait` seconds, capped at LONG_POLL_MAX_SECONDS."""
+    if value is None:
+        return 0.0
+    try:
+        wait = float(value)
+    except ValueError:
+        raise ValueError("❌ wait must be a number of seconds")
+    if wait < 0:
+        raise ValueError("❌ wait must not be negative")
+    return min(wait, LONG_POLL_MAX_SECONDS)
+
+
+def build_changes_query(last_id, gaps, limit):
+    """Builds the primary-key range query for rows after `last_id` plus still-missing gap ids.
+
+    Rows come in id order; one extra row is fetched to detect more pending changes.
+    """
+    query = ("SELECT id, description, created_at FROM tasks "
+             "WHERE id > %s OR id = ANY(%s::int[]) ORDER BY id LIMIT %s")
+    return query, [last_id, sorted(gaps), limit + 1]
+
+
+def advance_watermark(last_id, gaps, rows, now=None):
+    """Returns the (last id, gaps) position after delivering `rows` (in id order).
+
+    Ids skipped between delivered rows become gaps and are re-checked on later
+    polls until GAP_TTL_SECONDS; only the MAX_GAPS newest are kept.
+    """
+    now = int(now if now is not None else time.time())
+    delivered = {row[0] for row in rows}
+    gaps = {gap_id: seen_at for gap_id, seen_at in gaps.items()
+            if gap_id not in delivered and now - seen_at < GAP_TTL_SECONDS}
+
+    new_ids = sorted(task_id for task_id in delivered if task_id > last_id)
+    previous = last_id
+    for task_id in new_ids:
+        for missing in range(max(previous + 1, task_id - MAX_GAPS), task_id):
+            gaps.setdefault(missing, now)
+        previous = task_id
+    if len(gaps) > MAX_GAPS:
+        gaps = dict(sorted(gaps.items())[-MAX_GAPS:])
+    return (new_ids[-1] if new_ids else last_id), gaps
+
+
+def fetch_changes(conn, last_id, gaps, limit, deadline=None):
+    """Runs the changes query in its own short transaction and returns the rows."""
+    query, params = build_changes_query(last_id, gaps, limit)
+    with timer("query"), conn.cursor() as cur:
+        cur.execute(with_statement_timeout(query, deadline), params)
+        rows = cur.fetchall()
+    conn.commit()  # ✅ Ends the transaction so notifications can be delivered while waiting
+    return rows
+
+
+def listen(conn):
+    """Subscribes the connection to insert notifications."""
+    with conn.cursor() as cur:
+        cur.execute(f"LISTEN {CHANGES_CHANNEL}")
+    conn.commit()
+
+
+def unlisten(conn):
+    """Unsubscribes the connection and drops pending notifications before it goes back to the pool."""
+    with conn.cursor() as cur:
+        cur.execute("UNLISTEN *")
+    conn.commit()
+    del conn.notifies[:]
+
+
+def wait_for_insert(conn, timeout):
+    """Blocks until an insert notification arrives or `timeout` seconds pass; returns True if notified."""
+    if not conn.notifies and timeout > 0:
+        if select.select([conn], [], [], timeout) != ([], [], []):
+            conn.poll()
+    notified = bool(conn.notifies)
+    del conn.notifies[:]
+    return notified
+
+
+def poll_changes(conn, last_id, gaps, limit, wait, deadline):
+    """Returns new rows, waiting up to `wait` seconds for an insert when there are none yet.
+
+    LISTEN is issued before the first query, so an insert committed between the
+    query and the wait still wakes the poll.
+    """
+    if wait <= 0:
+        return fetch_changes(conn, last_id, gaps, limit, deadline)
+
+    wait_until = time.monotonic() + min(wait, deadline.remaining_ms() / 1000)
+    listen(conn)
+    try:
+        rows = fetch_changes(conn, last_id, gaps, limit, deadline)
+        while not rows:
+            remaining = wait_until - time.monotonic()
+            if remaining <= 0:
+                break
+            with timer("long_poll"):
+                notified = wait_for_insert(conn, remaining)
+            if notified:
+                rows = fetch_changes(conn, last_id, gaps, limit, deadline)
+        return rows
+    finally:
+        unlisten(conn)
@@ -0,0 +1,109 @@
+import base64
+import gzip
+import os
+from functools import wraps
+from core.metrics import timer
+
+try:
+    import brotli  # ✅ Optional; "br" is only negotiated when installed
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as-is (compression would cost more than it saves)
+COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+# Lower levels trade payload bytes for CPU; gzip 1 is within ~7% of level 5's size at half the CPU
+# (see benchmarks/compression.py)
+GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "1"))
+BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+
+
+def supported_encodings():
+    """Returns the content codings this container can produce, in server preference order."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding):
+    """Returns the content coding to use for an Accept-Encoding header, or None for identity.
+
+    The highest q-value wins; at equal q the server prefers br over gzip.
+    """
+    if not accept_encoding:
+        return None
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in supported_encodings():
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(data, coding):
+    """Compresses bytes with `coding` at the configured level."""
+    if coding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)  # ✅ mtime=0 keeps output deterministic
+
+
+def add_vary(headers, value):
+    """Appends `value` to the Vary header."""
+    current = headers.get("Vary")
+    headers["Vary"] = f"{current}, {value}" if current else value
+
+
+def compress_response(response, accept_encoding):
+    """Compresses a response body in place when the client accepts it and it is large enough.
+
+    The body becomes base64 with isBase64Encoded and Content-Encoding set, and a
+    strong ETag is made weak since the bytes now differ per coding (If-None-Match
+    still matches, as it uses weak comparison).
+    """
+    headers = response.setdefault("headers", {})
+    body = response.get("body")
+    if not body or "Content-Encoding" in headers:
+        return response
+    add_vary(headers, "Accept-Encoding")  # ✅ Caches must key on it even when sent uncompressed
+
+    coding = negotiate_encoding(accept_encoding)
+    if coding is None:
+        return response
+    if response.get("isBase64Encoded"):
+        data = base64.b64decode(body)
+    else:
+        data = body.encode("utf-8")
+    if len(data) < COMPRESSION_MIN_BYTES:
+        return response
+
+    with timer("compression"):
+        compressed = compress(data, coding)
+    response["body"] = base64.b64encode(compressed).decode("ascii")
+    response["isBase64Encoded"] = True
+    headers["Content-Encoding"] = coding
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+    return response
+
+
+def compress_responses(handler):
+    """Decorates a Lambda handler so its responses honour the request's Accept-Encoding."""
+    @wraps(handler)
+    def wrapper(event, context):
+        response = handler(event, context)
+        if not isinstance(response, dict) or not isinstance(event, dict):
+            return response
+        headers = {name.lower(): value for name, value in (event.get("headers") or {}).items()}
+        return compress_response(response, headers.get("accept-encoding"))
+    return wrapper
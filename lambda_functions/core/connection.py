@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+import psycopg2
+import psycopg2.extensions
+from core.metrics import timer
+
+logger = logging.getLogger(__name__)
+
+
+def is_broken(conn):
+    """Returns True if the connection is closed or its transaction state is unknown."""
+    if conn.closed:
+        return True
+    return conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+
+
+class ConnectionHealth:
+    """Tracks pooled connections and decides when they need a liveness probe.
+
+    Each connection records when it was created and last returned to the pool.
+    On checkout it is:
+      * discarded if it is closed or its transaction status is unknown,
+      * recycled if it is older than `max_age_seconds`,
+      * probed with SELECT 1 only if it sat idle longer than `idle_probe_seconds`.
+    A recently used connection is handed out without any extra round trip.
+    """
+
+    def __init__(self, idle_probe_seconds=30, max_age_seconds=900):
+        self.idle_probe_seconds = idle_probe_seconds
+        self.max_age_seconds = max_age_seconds
+        self._meta = {}  # id(conn) -> [created_at, last_used_at]
+        self._lock = threading.Lock()
+        self.stats = {
+            "checkouts": 0,
+            "probes": 0,
+            "recycles": 0,
+            "discards": 0,
+            "checkout_wait_ms": 0.0
+        }
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.stats[name] += value
+
+    def _discard(self, pool, conn, counter):
+        """Closes a connection and removes it from the pool."""
+        with self._lock:
+            self._meta.pop(id(conn), None)
+            self.stats[counter] += 1
+        try:
+            pool.putconn(conn, close=True)
+        except psycopg2.Error as e:
+            logger.error("❌ Error discarding connection: %s", e)
+
+    def _probe(self, conn):
+        """Runs SELECT 1; returns False if the connection is dead."""
+        self._count("probes")
+        try:
+            with timer("connection_probe"):
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()  # ✅ Leave the connection idle, not inside the probe's transaction
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            logger.warning("⚠️ Idle connection failed liveness probe: %s", e)
+            return False
+
+    def checkout(self, pool, max_attempts=None):
+        """Returns a healthy connection from `pool`, replacing stale or broken ones."""
+        started = time.monotonic()
+        attempts = max_attempts or getattr(pool, "maxconn", 10) + 1
+
+        try:
+            for _ in range(attempts):
+                conn = pool.getconn()
+                now = time.monotonic()
+                with self._lock:
+                    created_at, last_used_at = self._meta.setdefault(id(conn), [now, now])
+
+                if is_broken(conn):
+                    self._discard(pool, conn, "discards")
+                    continue
+                if now - created_at > self.max_age_seconds:
+                    self._discard(pool, conn, "recycles")
+                    continue
+                if now - last_used_at > self.idle_probe_seconds and not self._probe(conn):
+                    self._discard(pool, conn, "discards")
+                    continue
+
+                self._count("checkouts")
+                return conn
+
+            raise psycopg2.OperationalError("❌ No healthy connection available in pool")
+        finally:
+            self._count("checkout_wait_ms", (time.monotonic() - started) * 1000)
+
+    def checkin(self, pool, conn):
+        """Returns a connection to the pool, closing it instead if it is broken."""
+        if is_broken(conn):
+            self._discard(pool, conn, "discards")
+            return
+
+        with self._lock:
+            meta = self._meta.get(id(conn))
+            if meta:
+                meta[1] = time.monotonic()
+        pool.putconn(conn)
+
+        # ✅ The pool closes surplus idle connections itself; drop their metadata too
+        if conn.closed:
+            with self._lock:
+                self._meta.pop(id(conn), None)
+
+    def discard(self, pool, conn):
+        """Closes a checked-out connection that failed in use instead of returning it to the pool."""
+        self._discard(pool, conn, "discards")
+
+    def reset(self):
+        """Forgets all tracked connections (used when the pool is rebuilt)."""
+        with self._lock:
+            self._meta.clear()
+
+    def snapshot(self):
+        """Returns a copy of the counters."""
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,106 @@
+import json
+import logging
+import threading
+import time
+import sentry_sdk
+from botocore.exceptions import ClientError
+from core.metrics import timer
+
+logger = logging.getLogger(__name__)
+
+# Postgres error fragments that mean the credentials themselves were rejected
+AUTH_ERROR_MARKERS = ["password authentication failed", "authentication failed", "invalid_password"]
+
+
+def is_auth_error(error):
+    """Returns True if a psycopg2 error means Postgres rejected the username/password."""
+    if getattr(error, "pgcode", None) in ("28P01", "28000"):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in AUTH_ERROR_MARKERS)
+
+
+class CredentialProvider:
+    """Caches database credentials from AWS Secrets Manager behind a TTL.
+
+    The boto3 client is created lazily on first use and reused for every later
+    fetch. A forced refresh (after Postgres rejects a rotated password) is
+    rate-limited so a burst of auth failures results in one Secrets Manager call.
+    """
+
+    def __init__(self, secret_name, region, ttl_seconds=900, min_refresh_interval=30):
+        self.secret_name = secret_name
+        self.region = region
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self._client = None
+        self._credentials = None
+        self._expires_at = 0
+        self._fetched_at = 0
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        """Creates the Secrets Manager client once per container."""
+        if self._client is None:
+            import boto3  # ✅ Deferred so module import stays off the cold-start critical path
+            self._client = boto3.client("secretsmanager", region_name=self.region)
+        return self._client
+
+    def _fetch(self):
+        """Fetches and validates the secret from Secrets Manager."""
+        logger.info("🔍 Fetching DB credentials from Secrets Manager: %s", self.secret_name)
+        with timer("credential_fetch"):
+            response = self._get_client().get_secret_value(SecretId=self.secret_name)
+
+        secret = json.loads(response["SecretString"])
+        username = secret.get("username")
+        password = secret.get("password")
+
+        if not username or not password:
+            raise ValueError("❌ Retrieved secret is missing username or password")
+
+        logger.info("✅ Successfully retrieved credentials. Username = %s", username)
+        return username, password
+
+    def get_credentials(self):
+        """Returns (username, password), fetching only when the cache is empty or expired."""
+        if not self.secret_name:
+            raise ValueError("❌ Missing DB_SECRET_NAME environment variable")
+
+        with self._lock:
+            if self._credentials and time.monotonic() < self._expires_at:
+                return self._credentials
+            return self._load(allow_stale=True)
+
+    def refresh(self, rejected):
+        """Re-fetches credentials after Postgres rejected `rejected` (e.g. after a secret rotation).
+
+        Callers that fail with credentials another caller already replaced get the
+        new ones without a fetch, and a value fetched less than
+        `min_refresh_interval` ago is not fetched again.
+        """
+        if not self.secret_name:
+            raise ValueError("❌ Missing DB_SECRET_NAME environment variable")
+
+        with self._lock:
+            if self._credentials and self._credentials != rejected:
+                return self._credentials  # ✅ Already rotated by a concurrent caller
+            if self._credentials and time.monotonic() - self._fetched_at < self.min_refresh_interval:
+                return self._credentials
+            return self._load(allow_stale=False)
+
+    def _load(self, allow_stale):
+        """Fetches credentials into the cache; must be called with the lock held."""
+        try:
+            self._credentials = self._fetch()
+        except ClientError as e:
+            sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+            logger.error("❌ Failed to retrieve database credentials: %s", e)
+            if self._credentials and allow_stale:
+                logger.warning("⚠️ Serving cached credentials after failed refresh.")
+                return self._credentials
+            raise
+
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + self.ttl_seconds
+        return self._credentials
@@ -0,0 +1,266 @@
+import os
+import logging
+import threading
+import psycopg2
+import psycopg2.pool
+import sentry_sdk
+from core.admission import ADMISSION_CONTROL_ENABLED, LIMITER
+from core.connection import ConnectionHealth
+from core.credentials import CredentialProvider, is_auth_error
+from core.deadline import Deadline
+from core.metrics import timer
+from core.replica import wait_for_replay
+from core.startup import resolve_host, start_step, wait_step
+
+logger = logging.getLogger(__name__)
+
+# Database credentials from environment variables
+DB_HOST = os.getenv("DB_HOST")
+DB_NAME = os.getenv("DB_NAME")
+DB_SECRET_NAME = os.getenv("DB_SECRET_NAME")  # ✅ Fetch secret name from environment variables
+REGION = os.getenv("AWS_REGION")
+DB_SSLMODE = os.getenv("DB_SSLMODE", "require")  # ✅ Only relaxed for local databases (benchmarks)
+DB_READER_HOST = os.getenv("DB_READER_HOST") or None  # ✅ Read replica for GET traffic; unset sends reads to DB_HOST
+
+# Cached, rotation-aware Secrets Manager credentials (shared across warm invocations)
+CREDENTIALS = CredentialProvider(
+    DB_SECRET_NAME,
+    REGION,
+    ttl_seconds=int(os.getenv("DB_CREDENTIALS_TTL_SECONDS", "900"))
+)
+
+# One connection pool per container, shared by every route
+DB_POOL = None
+POOL_CREDENTIALS = None  # Credentials the current pool was built with
+POOL_LOCK = threading.Lock()
+
+# Idle-aware liveness checks: probe only long-idle connections, recycle old ones
+CONNECTION_HEALTH = ConnectionHealth(
+    idle_probe_seconds=float(os.getenv("DB_IDLE_PROBE_SECONDS", "30")),
+    max_age_seconds=float(os.getenv("DB_MAX_CONNECTION_AGE_SECONDS", "900"))
+)
+
+# Reader pool for replica-routed reads, with its own health tracking
+READER_POOL = None
+READER_HEALTH = ConnectionHealth(
+    idle_probe_seconds=float(os.getenv("DB_IDLE_PROBE_SECONDS", "30")),
+    max_age_seconds=float(os.getenv("DB_MAX_CONNECTION_AGE_SECONDS", "900"))
+)
+READER_CONNECTIONS = set()  # ids of checked-out reader connections, so they go back to READER_POOL
+
+# Checked-out connections admitted by the adaptive limiter: id(conn) -> [started, sample_latency, ok]
+ADMITTED = {}
+
+# Thread-local storage for connections
+CONNECTION_LOCAL = threading.local()
+
+def get_db_credentials(rejected=None):
+    """Returns database credentials (username, password) from the cached Secrets Manager provider.
+
+    Passing the credentials Postgres just `rejected` refreshes them from Secrets Manager.
+    """
+    if rejected:
+        return CREDENTIALS.refresh(rejected)
+    return CREDENTIALS.get_credentials()
+
+def create_db_pool(db_user, db_password, host=None):
+    """Creates the connection pool for the given credentials (the writer unless `host` is given)."""
+    return psycopg2.pool.SimpleConnectionPool(
+        minconn=1,
+        maxconn=10,
+        host=host or DB_HOST,
+        dbname=DB_NAME,
+        user=db_user,
+        password=db_password,
+        connect_timeout=10,
+        sslmode=DB_SSLMODE
+    )
+
+def initialize_db_pool(rejected=None):
+    """Initializes the connection pool (thread-safe)."""
+    global DB_POOL, POOL_CREDENTIALS
+    with POOL_LOCK:
+        if DB_POOL is None:
+            try:
+                credentials = get_db_credentials(rejected)  # ✅ Served from cache when warm
+                logger.info("✅ Credentials retrieved. Attempting to create DB pool.")
+
+                try:
+                    DB_POOL = create_db_pool(*credentials)
+                except psycopg2.OperationalError as e:
+                    if rejected or not is_auth_error(e):
+                        raise
+                    # ✅ Secret was likely rotated; refresh once and retry with the new password
+                    logger.warning("⚠️ DB authentication failed. Refreshing credentials once.")
+                    credentials = get_db_credentials(rejected=credentials)
+                    DB_POOL = create_db_pool(*credentials)
+                POOL_CREDENTIALS = credentials
+
+                logger.info("✅ Database connection pool initialized.")
+            except psycopg2.Error as e:
+                sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+                logger.error("❌ Failed to initialize connection pool: %s", e)
+                raise
+
+def reset_db_pool():
+    """Closes and discards the connection pool so it is rebuilt with fresh credentials."""
+    global DB_POOL
+    with POOL_LOCK:
+        if DB_POOL is not None:
+            try:
+                DB_POOL.closeall()
+            except psycopg2.Error as e:
+                logger.error("❌ Error closing connection pool: %s", e)
+            DB_POOL = None
+            CONNECTION_HEALTH.reset()
+
+def initialize_reader_pool():
+    """Initializes the reader pool with the writer's current credentials (thread-safe)."""
+    global READER_POOL
+    with POOL_LOCK:
+        if READER_POOL is None:
+            credentials = POOL_CREDENTIALS or get_db_credentials()
+            READER_POOL = create_db_pool(*credentials, host=DB_READER_HOST)
+            logger.info("✅ Reader connection pool initialized.")
+
+def reset_reader_pool():
+    """Closes and discards the reader pool so it is rebuilt on next use."""
+    global READER_POOL
+    with POOL_LOCK:
+        if READER_POOL is not None:
+            try:
+                READER_POOL.closeall()
+            except psycopg2.Error as e:
+                logger.error("❌ Error closing reader pool: %s", e)
+            READER_POOL = None
+            READER_HEALTH.reset()
+            READER_CONNECTIONS.clear()
+
+def acquire_reader_connection(deadline, min_lsn=None):
+    """Checks out a replica connection that has replayed `min_lsn`, or returns None to use the primary."""
+    try:
+        if READER_POOL is None:
+            initialize_reader_pool()
+        conn = READER_HEALTH.checkout(READER_POOL)
+    except psycopg2.Error as e:
+        logger.warning("⚠️ Reader unavailable, reading from primary: %s", e)
+        if is_auth_error(e):
+            reset_reader_pool()  # ✅ Rebuilt with the writer's refreshed credentials next time
+        return None
+    READER_CONNECTIONS.add(id(conn))
+
+    try:
+        replayed = not min_lsn or wait_for_replay(conn, min_lsn, deadline)
+    except psycopg2.Error as e:
+        # ✅ The replica dropped mid-check: close the connection so it cannot leak from READER_POOL
+        READER_CONNECTIONS.discard(id(conn))
+        READER_HEALTH.discard(READER_POOL, conn)
+        logger.warning("⚠️ Replica check failed, reading from primary: %s", e)
+        return None
+    if not replayed:
+        return_db_connection(conn)
+        logger.info("⚠️ Replica has not replayed %s yet; reading from primary.", min_lsn)
+        return None
+    return conn
+
+def prewarm_db():
+    """Starts the DNS lookup and pool creation in the background (once per container)."""
+    start_step("dns", resolve_host, DB_HOST)
+    start_step("db_pool", initialize_db_pool)
+
+def get_db_connection(retries=3, delay=2, deadline=None, replica=False, min_lsn=None):
+    """Retrieves a connection from the pool with retries (thread-safe).
+
+    Retries back off exponentially with jitter and never sleep past `deadline`.
+    With `replica=True` (and DB_READER_HOST set) the connection comes from the
+    reader pool, provided the replica has replayed `min_lsn` within
+    DB_REPLICA_WAIT_MS; otherwise it falls back to the primary.
+    Admission control runs first and raises Overloaded instead of queueing on a
+    saturated database; the checkout is released by return_db_connection.
+    """
+    started = LIMITER.acquire() if ADMISSION_CONTROL_ENABLED else None
+    if started is not None and LIMITER.limit < 1:
+        retries = 1  # ✅ While shedding load, retries would only add to it
+    try:
+        with timer("pool_checkout"):  # ✅ Includes waiting on the prewarm and any liveness probe
+            conn = None
+            if replica and DB_READER_HOST:
+                conn = acquire_reader_connection(deadline or Deadline.from_context(None), min_lsn)
+            if conn is None:
+                conn = acquire_db_connection(retries, delay, deadline)
+    except Exception:
+        if started is not None:
+            LIMITER.release(started, ok=False)  # ✅ Failed checkouts are the main overload signal
+        raise
+    if started is not None:
+        ADMITTED[id(conn)] = [started, True, True]
+    return conn
+
+def skip_latency_sample(conn):
+    """Keeps a deliberately long hold (long-poll, export) out of the limiter's latency signal."""
+    if id(conn) in ADMITTED:
+        ADMITTED[id(conn)][1] = False
+
+def record_db_error(conn):
+    """Marks the work on a checked-out connection as failed, so returning it backs the limiter off."""
+    if conn is not None and id(conn) in ADMITTED:
+        ADMITTED[id(conn)][2] = False
+
+def acquire_db_connection(retries, delay, deadline):
+    """Waits for DB_POOL and checks out a connection, retrying transient failures."""
+    deadline = deadline or Deadline.from_context(None)
+    deadline.check()
+    if DB_POOL is None:
+        wait_step("db_pool")  # ✅ Reuse the import-time prewarm if one is in flight
+    if DB_POOL is None:
+        initialize_db_pool()
+
+    refreshed = False
+    for attempt in range(1, retries + 1):
+        try:
+            logger.debug("🔍 Attempting to get DB connection (Attempt %d)...", attempt)
+            conn = CONNECTION_HEALTH.checkout(DB_POOL)  # ✅ Probes only connections idle past the threshold
+            logger.debug("✅ Successfully acquired DB connection.")
+            return conn
+        except psycopg2.OperationalError as e:
+            logger.error("❌ Database connection attempt %s failed: %s", attempt, e)
+            if is_auth_error(e) and not refreshed:
+                # ✅ Rotated secret: rebuild the pool with refreshed credentials, no sleep
+                refreshed = True
+                rejected = POOL_CREDENTIALS
+                reset_db_pool()
+                initialize_db_pool(rejected=rejected)
+                continue
+            if attempt < retries:
+                deadline.backoff(attempt, delay)  # ✅ Jittered backoff bounded by the remaining budget
+        except Exception as e:
+            sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+            logger.error("❌ Unexpected connection error: %s", e)
+
+    raise Exception("❌ Unable to establish a database connection after retries.")
+
+def return_db_connection(conn):
+    """Returns a connection to the pool it came from (thread-safe)."""
+    permit = ADMITTED.pop(id(conn), None) if conn is not None else None
+    if permit:
+        LIMITER.release(permit[0], ok=permit[2], sample_latency=permit[1])
+    if conn is not None and id(conn) in READER_CONNECTIONS:
+        READER_CONNECTIONS.discard(id(conn))
+        try:
+            if READER_POOL is None:
+                conn.close()  # ✅ Reader pool was reset while this connection was out
+                return
+            READER_HEALTH.checkin(READER_POOL, conn)
+        except psycopg2.Error as e:
+            logger.error("❌ Error returning reader connection: %s", e)
+        return
+    if DB_POOL and conn:
+        try:
+            CONNECTION_HEALTH.checkin(DB_POOL, conn)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔍 Connection stats: %s", CONNECTION_HEALTH.snapshot())  # ✅ Snapshot only when logged
+            if hasattr(CONNECTION_LOCAL, "conn") and CONNECTION_LOCAL.conn is conn:
+                delattr(CONNECTION_LOCAL, "conn")  # ✅ Remove from thread-local
+        except psycopg2.Error as e:
+            sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+            logger.error("❌ Error returning connection: %s", e)
@@ -0,0 +1,64 @@
+import os
+import random
+import time
+
+# Budget used when no Lambda context is available (matches the 45 s function timeout)
+DEFAULT_BUDGET_MS = int(os.getenv("REQUEST_DEFAULT_BUDGET_MS", "45000"))
+# Time held back to build and return a response before the runtime kills the invocation
+RESERVE_MS = int(os.getenv("REQUEST_DEADLINE_RESERVE_MS", "500"))
+# Smallest statement_timeout worth sending; below this the request fails fast instead
+MIN_STATEMENT_TIMEOUT_MS = int(os.getenv("MIN_STATEMENT_TIMEOUT_MS", "100"))
+# Upper bound for any single backoff sleep
+MAX_BACKOFF_SECONDS = float(os.getenv("MAX_BACKOFF_SECONDS", "5"))
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request has no time budget left."""
+
+
+class Deadline:
+    """Request-scoped time budget derived from the Lambda context.
+
+    Connection acquisition, retry sleeps and statement timeouts all draw from the
+    same budget, so the handler can answer 503 before the runtime times it out.
+    """
+
+    def __init__(self, budget_ms, reserve_ms=RESERVE_MS):
+        self.expires_at = time.monotonic() + max(budget_ms - reserve_ms, 0) / 1000
+
+    @classmethod
+    def from_context(cls, context):
+        """Builds a deadline from context.get_remaining_time_in_millis(), if available."""
+        get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+        budget_ms = get_remaining() if callable(get_remaining) else DEFAULT_BUDGET_MS
+        return cls(budget_ms)
+
+    def remaining_ms(self):
+        """Milliseconds left in the budget (never negative)."""
+        return max((self.expires_at - time.monotonic()) * 1000, 0)
+
+    def check(self):
+        """Raises DeadlineExceeded if the budget is spent."""
+        if self.remaining_ms() <= 0:
+            raise DeadlineExceeded("❌ Request deadline exceeded")
+
+    def statement_timeout_ms(self):
+        """Returns a statement_timeout that fits in the remaining budget."""
+        remaining = int(self.remaining_ms())
+        if remaining < MIN_STATEMENT_TIMEOUT_MS:
+            raise DeadlineExceeded("❌ Not enough time left to run a query")
+        return remaining
+
+    def backoff(self, attempt, base_delay):
+        """Sleeps with exponential backoff and full jitter, capped by the remaining budget."""
+        ceiling = min(base_delay * (2 ** (attempt - 1)), MAX_BACKOFF_SECONDS)
+        delay = min(random.uniform(0, ceiling), self.remaining_ms() / 1000)
+        time.sleep(delay)
+        self.check()
+
+
+def with_statement_timeout(query, deadline):
+    """Prefixes `query` with SET LOCAL statement_timeout so both go in one round trip."""
+    if deadline is None:
+        return query
+    return f"SET LOCAL statement_timeout = {deadline.statement_timeout_ms()}; {query}"
@@ -0,0 +1,143 @@
+import json
+from datetime import date
+
+try:
+    import orjson  # ✅ Optional fast encoder (bundled in the Lambda layer)
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # ✅ Optional; application/msgpack is only offered when installed
+except ImportError:
+    msgpack = None
+
+# Media types GET /tasks can produce; JSON (today's array of objects) is the default
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.tasks.columnar+json"
+NDJSON = "application/x-ndjson"
+MSGPACK = "application/msgpack"
+MEDIA_TYPE_ALIASES = {"application/x-msgpack": MSGPACK}
+
+# Row fields in cursor order (id, description, created_at)
+FIELDS = ("id", "description", "created_at")
+
+
+class NotAcceptable(ValueError):
+    """Raised when the Accept header allows none of the supported media types."""
+
+
+def default(value):
+    """Serializes values the encoders do not handle natively (datetimes) as ISO 8601."""
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def dumps(obj):
+    """Serializes `obj` to compact JSON text, with orjson when it is available."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default).decode("utf-8")
+    return json.dumps(obj, default=default, separators=(",", ":"))
+
+
+def task_dicts(rows):
+    """Converts cursor rows into today's JSON task objects."""
+    return [
+        {"id": task[0], "description": task[1], "created_at": task[2].isoformat() if task[2] else None}
+        for task in rows
+    ]
+
+
+def encode_json(rows, paginated, next_cursor):
+    """Encodes rows as today's JSON: an array of objects, or the paginated envelope.
+
+    Kept on the standard library so the default body stays byte-for-byte unchanged.
+    """
+    task_list = task_dicts(rows)
+    if paginated:
+        return json.dumps({"tasks": task_list, "next_cursor": next_cursor}), {}
+    return json.dumps(task_list), {}
+
+
+def encode_columnar(rows, paginated, next_cursor):
+    """Encodes rows as one array per field ({"id": [...], "description": [...], ...})."""
+    columns = list(zip(*(task[:3] for task in rows))) or [(), (), ()]
+    document = dict(zip(FIELDS, columns))
+    if paginated:
+        document["next_cursor"] = next_cursor
+    return dumps(document), {}
+
+
+def encode_ndjson(rows, paginated, next_cursor):
+    """Encodes rows as one JSON object per line; the page cursor travels in X-Next-Cursor."""
+    if orjson is not None:
+        lines = b"".join(orjson.dumps(dict(zip(FIELDS, task[:3])), default=default) + b"\n" for task in rows)
+        body = lines.decode("utf-8")
+    else:
+        body = "".join(dumps(dict(zip(FIELDS, task[:3]))) + "\n" for task in rows)
+    return body, {"X-Next-Cursor": next_cursor} if paginated and next_cursor else {}
+
+
+def encode_msgpack(rows, paginated, next_cursor):
+    """Encodes rows as MessagePack with the same shape as the JSON default (bytes body)."""
+    task_list = [dict(zip(FIELDS, task[:3])) for task in rows]
+    document = {"tasks": task_list, "next_cursor": next_cursor} if paginated else task_list
+    return msgpack.packb(document, default=default, use_bin_type=True), {}
+
+
+ENCODERS = {
+    JSON: encode_json,
+    COLUMNAR_JSON: encode_columnar,
+    NDJSON: encode_ndjson,
+}
+if msgpack is not None:
+    ENCODERS[MSGPACK] = encode_msgpack
+
+
+def parse_accept(header):
+    """Parses an Accept header into (media type, quality) pairs, in header order."""
+    ranges = []
+    for part in header.split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((MEDIA_TYPE_ALIASES.get(media_type, media_type), quality))
+    return ranges
+
+
+def negotiate(accept):
+    """Returns the media type to respond with for an Accept header (JSON when absent or a wildcard).
+
+    The highest-quality supported type wins; at equal quality an explicit type
+    beats a wildcard, then the earlier entry wins.
+    Raises NotAcceptable if no supported type is acceptable.
+    """
+    if not accept:
+        return JSON
+    best, best_rank = None, (0.0, 0)
+    for media_type, quality in parse_accept(accept):
+        if media_type in ("*/*", "application/*"):
+            candidate, rank = JSON, (quality, 0)
+        elif media_type in ENCODERS:
+            candidate, rank = media_type, (quality, 1)
+        else:
+            continue
+        if quality > 0 and rank > best_rank:
+            best, best_rank = candidate, rank
+    if best is None:
+        raise NotAcceptable(f"❌ Supported media types: {', '.join(ENCODERS)}")
+    return best
+
+
+def encode_rows(media_type, rows, paginated=False, next_cursor=None):
+    """Encodes cursor rows for `media_type`; returns (body, extra headers)."""
+    return ENCODERS[media_type](rows, paginated, next_cursor)
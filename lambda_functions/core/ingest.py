@@ -0,0 +1,135 @@
+import json
+import os
+import re
+import uuid
+import logging
+from datetime import datetime
+from psycopg2.extras import execute_values
+from core.deadline import with_statement_timeout
+from core.metrics import timer
+
+logger = logging.getLogger(__name__)
+
+# "sync" inserts in the request; "async" enqueues to SQS and returns 202 (write-behind)
+INGESTION_MODE = os.getenv("TASKS_INGESTION_MODE", "sync").lower()
+QUEUE_URL = os.getenv("TASKS_QUEUE_URL")
+REGION = os.getenv("AWS_REGION")
+
+# SQS SendMessageBatch accepts at most 10 entries per call
+SQS_BATCH_LIMIT = 10
+
+# Client-supplied Idempotency-Key header: short, printable, no whitespace
+IDEMPOTENCY_KEY_RE = re.compile(r"^[A-Za-z0-9_.:-]{1,100}$")
+
+SQS_CLIENT = None
+
+
+def is_async_enabled():
+    """Returns True if POST /tasks should enqueue instead of inserting."""
+    return INGESTION_MODE == "async"
+
+
+def get_sqs_client():
+    """Creates the SQS client once per container."""
+    global SQS_CLIENT
+    if SQS_CLIENT is None:
+        import boto3  # ✅ Deferred so sync-mode containers never pay for it
+        SQS_CLIENT = boto3.client("sqs", region_name=REGION)
+    return SQS_CLIENT
+
+
+def get_idempotency_key(event):
+    """Returns the request's Idempotency-Key header, or None. Raises ValueError if malformed."""
+    headers = {name.lower(): value for name, value in (event.get("headers") or {}).items()}
+    key = headers.get("idempotency-key")
+    if key is None:
+        return None
+    if not IDEMPOTENCY_KEY_RE.match(key):
+        raise ValueError("Idempotency-Key must be 1-100 characters of [A-Za-z0-9_.:-].")
+    return key
+
+
+def assign_keys(count, request_key=None):
+    """Returns one idempotency key per task; a client key is suffixed with the item index for batches."""
+    if request_key is None:
+        return [str(uuid.uuid4()) for _ in range(count)]
+    if count == 1:
+        return [request_key]
+    return [f"{request_key}:{index}" for index in range(count)]
+
+
+def enqueue_tasks(tasks):
+    """Sends [(key, description)] to the ingestion queue.
+
+    Returns the set of keys SQS rejected (empty when everything was queued).
+    """
+    if not QUEUE_URL:
+        raise RuntimeError("❌ TASKS_QUEUE_URL is not set for async ingestion")
+
+    accepted_at = datetime.utcnow().isoformat()
+    failed = set()
+    client = get_sqs_client()
+    for start in range(0, len(tasks), SQS_BATCH_LIMIT):
+        chunk = tasks[start:start + SQS_BATCH_LIMIT]
+        entries = [
+            {
+                "Id": str(position),
+                "MessageBody": json.dumps({"key": key, "description": description, "accepted_at": accepted_at})
+            }
+            for position, (key, description) in enumerate(chunk)
+        ]
+        response = client.send_message_batch(QueueUrl=QUEUE_URL, Entries=entries)
+        for failure in response.get("Failed", []):
+            key = chunk[int(failure["Id"])][0]
+            logger.error("❌ Failed to enqueue task %s: %s", key, failure.get("Message"))
+            failed.add(key)
+
+    logger.info("✅ Enqueued %d task(s) for write-behind ingestion.", len(tasks) - len(failed))
+    return failed
+
+
+def parse_message(record):
+    """Returns (key, description, accepted_at) from an SQS record or raises ValueError."""
+    try:
+        message = json.loads(record["body"])
+        key = message["key"]
+        description = message["description"]
+        accepted_at = message.get("accepted_at")
+    except (KeyError, TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Malformed task message: {e}")
+    if not key or not isinstance(description, str) or not description.strip():
+        raise ValueError("Task message is missing its key or description.")
+    return key, description.strip(), accepted_at
+
+
+def insert_ingested_tasks(conn, rows, deadline=None):
+    """Inserts [(key, description, accepted_at)] with one statement, skipping keys already stored.
+
+    Each key is claimed in task_idempotency_keys first (migration 0008) and only
+    claimed keys are inserted: the partitioned tasks table can only enforce
+    uniqueness per (key, created_at), and a retried POST has a new accepted_at.
+    Returns the number of rows actually inserted (redelivered messages insert nothing).
+    """
+    with timer("query"), conn.cursor() as cur:
+        inserted = execute_values(
+            cur,
+            with_statement_timeout(
+                "WITH input AS ("
+                "SELECT DISTINCT ON (idempotency_key) * "
+                "FROM (VALUES %s) AS v (idempotency_key, description, created_at)), "
+                "claimed AS ("
+                "INSERT INTO task_idempotency_keys (idempotency_key, created_at) "
+                "SELECT idempotency_key, created_at FROM input "
+                "ON CONFLICT (idempotency_key) DO NOTHING RETURNING idempotency_key) "
+                "INSERT INTO tasks (idempotency_key, description, created_at) "
+                "SELECT idempotency_key, description, created_at FROM input JOIN claimed USING (idempotency_key) "
+                "RETURNING id",
+                deadline
+            ),
+            rows,
+            template="(%s, %s, COALESCE(%s::timestamp, LOCALTIMESTAMP))",
+            page_size=len(rows),  # ✅ One statement, one commit per queue batch
+            fetch=True
+        )
+    conn.commit()
+    return len(inserted)
@@ -0,0 +1,157 @@
+import json
+import os
+import random
+import sys
+import threading
+import logging
+from functools import wraps
+
+# "json" buffers records and writes one JSON line per record at the end of each invocation
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "text").lower()
+
+# Share of invocations whose success-path records are kept, per level (WARNING and above are always kept)
+LOG_SAMPLE_RATES = {
+    logging.DEBUG: float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01")),
+    logging.INFO: float(os.getenv("LOG_INFO_SAMPLE_RATE", "0.1")),
+}
+# Upper bound on buffered records per invocation; the oldest sub-WARNING records are dropped first
+LOG_BUFFER_MAX_RECORDS = int(os.getenv("LOG_BUFFER_MAX_RECORDS", "200"))
+
+# LogRecord attributes that are not user-supplied `extra` fields
+RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one compact JSON object (message arguments are only merged here)."""
+
+    def format(self, record):
+        document = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            document["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS and not key.startswith("_"):
+                document[key] = value  # ✅ Structured `extra={...}` fields
+        if record.exc_info:
+            document["exc"] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str, separators=(",", ":"))
+
+
+class BufferedJsonHandler(logging.Handler):
+    """Holds one invocation's records and writes them in a single stdout write.
+
+    Records are formatted only at flush time, and only if they are kept: sub-WARNING
+    records survive when their level was sampled for this invocation, or when the
+    invocation logged a WARNING or worse (so errors keep their full context).
+    Outside an invocation records are written immediately.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.setFormatter(JsonFormatter())
+        self.records = []
+        self.request_id = None
+        self.sampled_levels = set()
+        self.escalated = False
+        self.depth = 0
+        self.lock_buffer = threading.Lock()
+
+    def begin(self, request_id=None):
+        """Starts buffering for an invocation; nested calls (router -> route) share the outer one."""
+        with self.lock_buffer:
+            self.depth += 1
+            if self.depth > 1:
+                return
+            self.request_id = request_id
+            self.records = []
+            self.escalated = False
+            self.sampled_levels = {level for level, rate in LOG_SAMPLE_RATES.items() if random.random() < rate}
+
+    def end(self):
+        """Ends the invocation and flushes its kept records."""
+        with self.lock_buffer:
+            self.depth = max(self.depth - 1, 0)
+            if self.depth:
+                return
+        self.flush()
+        self.request_id = None
+
+    def emit(self, record):
+        """Buffers the record (tagged with the request id) or writes it if no invocation is active."""
+        record.request_id = self.request_id
+        with self.lock_buffer:
+            if not self.depth:
+                self._write([record])
+                return
+            if record.levelno >= logging.WARNING:
+                self.escalated = True
+            self.records.append(record)
+            if len(self.records) > LOG_BUFFER_MAX_RECORDS:
+                self._drop_oldest()
+
+    def _drop_oldest(self):
+        """Drops the oldest sub-WARNING record to keep the buffer bounded."""
+        for index, record in enumerate(self.records):
+            if record.levelno < logging.WARNING:
+                del self.records[index]
+                return
+        self._write(self.records)  # ✅ Only warnings/errors left: write them now
+        self.records = []
+
+    def _kept(self, record):
+        """Returns True if the record should be written at flush time."""
+        return self.escalated or record.levelno >= logging.WARNING or record.levelno in self.sampled_levels
+
+    def _write(self, records):
+        """Formats and writes `records` with one write call."""
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+
+    def flush(self):
+        """Writes the kept buffered records and clears the buffer."""
+        with self.lock_buffer:
+            records, self.records = self.records, []
+            self._write([record for record in records if self._kept(record)])
+
+
+HANDLER = None
+
+
+def configure_logging(level):
+    """Replaces the root handlers with the buffered JSON handler when LOG_FORMAT=json."""
+    global HANDLER
+    root = logging.getLogger()
+    root.setLevel(level)
+    if LOG_FORMAT != "json" or HANDLER is not None:
+        return
+    HANDLER = BufferedJsonHandler()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)  # ✅ Drop the Lambda runtime's plain-text handler
+    root.addHandler(HANDLER)
+
+
+def log_invocation(handler):
+    """Decorates a Lambda handler so its records are correlated by request id and flushed once."""
+    @wraps(handler)
+    def wrapper(event, context):
+        if HANDLER is None:
+            return handler(event, context)
+        HANDLER.begin(getattr(context, "aws_request_id", None))
+        try:
+            return handler(event, context)
+        finally:
+            HANDLER.end()
+    return wrapper
@@ -0,0 +1,156 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Per-phase timings are written as CloudWatch Embedded Metric Format (EMF) log lines
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "TasksAPI")
+
+# Phases charted on the dashboard; anything else recorded is still emitted
+PHASES = [
+    "credential_fetch",
+    "pool_checkout",
+    "connection_probe",
+    "query",
+    "row_processing",
+    "serialization",
+    "compression",
+]
+
+
+class PhaseTimer:
+    """Accumulates per-phase wall time (ms) for the current invocation.
+
+    Timings recorded by cold-start background threads (e.g. the credential fetch
+    during prewarm) are kept until the next flush, so they are attributed to the
+    invocation that paid for them.
+    """
+
+    def __init__(self):
+        self._timings = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase, elapsed_ms):
+        """Adds `elapsed_ms` to `phase`."""
+        with self._lock:
+            self._timings[phase] = self._timings.get(phase, 0.0) + elapsed_ms
+
+    def flush(self):
+        """Returns and clears the accumulated timings."""
+        with self._lock:
+            timings, self._timings = self._timings, {}
+        return timings
+
+
+TIMER = PhaseTimer()
+
+
+class InvocationValues:
+    """Accumulates per-invocation counters and gauges, emitted next to the phase timings."""
+
+    def __init__(self):
+        self._values = {}  # name -> (value, unit)
+        self._lock = threading.Lock()
+
+    def count(self, name, value=1):
+        """Adds `value` to the counter `name`."""
+        with self._lock:
+            current = self._values.get(name, (0, "Count"))[0]
+            self._values[name] = (current + value, "Count")
+
+    def gauge(self, name, value, unit="None"):
+        """Sets `name` to its latest `value`."""
+        with self._lock:
+            self._values[name] = (value, unit)
+
+    def flush(self):
+        """Returns and clears the recorded values."""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+
+VALUES = InvocationValues()
+
+
+def count(name, value=1):
+    """Adds to a per-invocation counter (e.g. rejected requests)."""
+    if METRICS_ENABLED:
+        VALUES.count(name, value)
+
+
+def gauge(name, value, unit="None"):
+    """Records the latest value of a per-invocation gauge (e.g. the current concurrency limit)."""
+    if METRICS_ENABLED:
+        VALUES.gauge(name, value, unit)
+
+
+@contextmanager
+def timer(phase):
+    """Times the enclosed block into `phase` (two perf_counter calls when enabled)."""
+    if not METRICS_ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        TIMER.add(phase, (time.perf_counter() - started) * 1000)
+
+
+def build_emf(route, timings, properties=None, values=None):
+    """Builds an EMF document with one Milliseconds metric per phase, dimensioned by Route.
+
+    `values` ({name: (value, unit)}) adds counters and gauges with their own units.
+    """
+    values = values or {}
+    document = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["Route"]],
+                "Metrics": [{"Name": phase, "Unit": "Milliseconds"} for phase in timings] +
+                           [{"Name": name, "Unit": unit} for name, (_, unit) in values.items()]
+            }]
+        },
+        "Route": route
+    }
+    document.update({phase: round(elapsed_ms, 3) for phase, elapsed_ms in timings.items()})
+    document.update({name: value for name, (value, _) in values.items()})
+    if properties:
+        document.update(properties)  # ✅ Searchable in Logs Insights, not published as metrics
+    return document
+
+
+def emit(route, properties=None):
+    """Writes the invocation's timings, counters and gauges as one EMF line on stdout and resets them."""
+    timings = TIMER.flush()
+    values = VALUES.flush()
+    if not METRICS_ENABLED:
+        return
+    sys.stdout.write(json.dumps(build_emf(route, timings, properties, values), separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def instrument(route):
+    """Decorates a Lambda handler so each invocation emits its phase timings under `route`."""
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(event, context):
+            started = time.perf_counter()
+            response = None
+            try:
+                response = handler(event, context)
+                return response
+            finally:
+                if METRICS_ENABLED:
+                    TIMER.add("total", (time.perf_counter() - started) * 1000)
+                    status = response.get("statusCode") if isinstance(response, dict) else None
+                    emit(route, {"status": status} if status is not None else None)
+        return wrapper
+    return decorator
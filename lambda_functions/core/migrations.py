@@ -0,0 +1,99 @@
+import logging
+import os
+import re
+import psycopg2
+import psycopg2.errors
+
+logger = logging.getLogger(__name__)
+
+# Bundled SQL migrations: <version>_<name>.sql, applied in version order
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+MIGRATION_FILE_RE = re.compile(r"^(\d+)_([\w-]+)\.sql$")
+
+# Session-level advisory lock key shared by every migration runner
+ADVISORY_LOCK_KEY = 7317001
+
+
+def list_migrations(migrations_dir=MIGRATIONS_DIR):
+    """Returns [(version, name, path)] for the bundled migrations, sorted by version."""
+    migrations = []
+    for filename in os.listdir(migrations_dir):
+        match = MIGRATION_FILE_RE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(migrations_dir, filename)))
+    migrations.sort()
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("❌ Duplicate migration version numbers")
+    return migrations
+
+
+def latest_version(migrations_dir=MIGRATIONS_DIR):
+    """Returns the highest bundled migration version (0 if there are none)."""
+    migrations = list_migrations(migrations_dir)
+    return migrations[-1][0] if migrations else 0
+
+
+def get_schema_version(conn):
+    """Returns the highest applied migration version (0 if none have run)."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+            version = cur.fetchone()[0]
+        conn.rollback()
+        return version
+    except psycopg2.errors.UndefinedTable:
+        conn.rollback()
+        return 0
+
+
+def run_migrations(conn, migrations_dir=MIGRATIONS_DIR):
+    """Applies all pending migrations, each in its own transaction.
+
+    A session-level advisory lock serializes concurrent runners; a runner that
+    waited for the lock re-reads the applied versions and skips what is done.
+    Returns the list of versions applied by this call.
+    """
+    applied_now = []
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_lock(%s)", (ADVISORY_LOCK_KEY,))
+        try:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
+            conn.commit()
+
+            cur.execute("SELECT version FROM schema_migrations")
+            applied = {row[0] for row in cur.fetchall()}
+
+            for version, name, path in list_migrations(migrations_dir):
+                if version in applied:
+                    continue
+                with open(path) as f:
+                    sql = f.read()
+
+                logger.info("Applying migration %04d_%s", version, name)
+                try:
+                    cur.execute(sql)
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                        (version, name)
+                    )
+                    conn.commit()
+                except psycopg2.Error:
+                    conn.rollback()
+                    logger.error("❌ Migration %04d_%s failed; rolled back.", version, name)
+                    raise
+                applied_now.append(version)
+        finally:
+            conn.rollback()
+            cur.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_KEY,))
+            conn.commit()
+
+    logger.info("Schema up to date. Applied %d migration(s): %s", len(applied_now), applied_now)
+    return applied_now
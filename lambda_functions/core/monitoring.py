@@ -0,0 +1,76 @@
+import json
+import os
+import logging
+import sentry_sdk
+from core.db import prewarm_db
+from core.logs import configure_logging
+from core.routes import get_route_key
+from core.startup import PREWARM_ON_IMPORT, is_warmup_event
+
+SENTRY_DSN = os.getenv("SENTRY_DSN")  # Fetch from environment variable
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+VALID_LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+if LOG_LEVEL.upper() not in VALID_LOG_LEVELS:
+    LOG_LEVEL = "INFO"  # ✅ Fallback to INFO if invalid log level is found
+
+# Configure logging (buffered JSON lines inside Lambda, see core/logs.py)
+configure_logging(LOG_LEVEL.upper())
+
+# Sentry sampling (0.0-1.0); profiles are a fraction of sampled traces
+SENTRY_TRACES_SAMPLE_RATE = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.05"))
+SENTRY_PROFILES_SAMPLE_RATE = float(os.getenv("SENTRY_PROFILES_SAMPLE_RATE", "0.0"))
+SENTRY_DEBUG = os.getenv("SENTRY_DEBUG", "false").lower() == "true"
+# Lowest log level recorded as a Sentry breadcrumb (each one formats the record eagerly)
+SENTRY_BREADCRUMB_LEVEL = os.getenv("SENTRY_BREADCRUMB_LEVEL", "WARNING").upper()
+# Per-route trace rates, e.g. {"POST /tasks": 0.2, "GET /tasks": 0.01}; other routes use the default
+SENTRY_ROUTE_SAMPLE_RATES = json.loads(os.getenv("SENTRY_ROUTE_SAMPLE_RATES") or "{}")
+
+BOOTSTRAPPED = False
+
+def traces_sampler(sampling_context):
+    """Returns the trace sample rate for an invocation, honouring the parent's decision."""
+    parent_sampled = sampling_context.get("parent_sampled")
+    if parent_sampled is not None:
+        return float(parent_sampled)
+
+    event = sampling_context.get("aws_event")
+    if isinstance(event, dict):
+        if is_warmup_event(event):
+            return 0.0  # ✅ Never trace warm-up pings
+        return SENTRY_ROUTE_SAMPLE_RATES.get(get_route_key(event), SENTRY_TRACES_SAMPLE_RATE)
+    return SENTRY_TRACES_SAMPLE_RATE
+
+def init_sentry():
+    """Initializes Sentry (runs on the main thread while the DB prewarm runs in the background)."""
+    from sentry_sdk.integrations.aws_lambda import AwsLambdaIntegration
+    from sentry_sdk.integrations.logging import LoggingIntegration
+
+    sentry_sdk.init(
+        dsn=SENTRY_DSN,
+        max_breadcrumbs=50,
+        debug=SENTRY_DEBUG,
+        # Add data like request headers and IP for users, if applicable;
+        # see https://docs.sentry.io/platforms/python/data-management/data-collected/ for more info
+        send_default_pii=True,
+        # ✅ Sampled per route from the environment instead of tracing every invocation
+        traces_sampler=traces_sampler,
+        profiles_sample_rate=SENTRY_PROFILES_SAMPLE_RATE,
+        integrations=[
+            AwsLambdaIntegration(timeout_warning=True),
+            LoggingIntegration(level=getattr(logging, SENTRY_BREADCRUMB_LEVEL, logging.WARNING),
+                               event_level=logging.ERROR),
+        ],
+    )
+
+def bootstrap():
+    """Cold-start setup shared by every entry point (runs once per container)."""
+    global BOOTSTRAPPED
+    if BOOTSTRAPPED:
+        return
+    BOOTSTRAPPED = True
+
+    # ✅ Fetch the secret, resolve RDS Proxy and open DB_POOL concurrently with Sentry init
+    if PREWARM_ON_IMPORT:
+        prewarm_db()
+    init_sentry()
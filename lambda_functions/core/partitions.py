@@ -0,0 +1,162 @@
+import gzip
+import os
+import re
+import tempfile
+import logging
+from datetime import date
+from core.encoders import NDJSON, encode_rows
+from core.snapshot import get_s3_client
+
+logger = logging.getLogger(__name__)
+
+# Monthly range partitions of tasks created by migration 0006 and create_tasks_partition()
+PARTITION_NAME_RE = re.compile(r"^tasks_p(\d{4})_(\d{2})$")
+
+# Months created ahead of the current one; tasks has no DEFAULT partition, so inserts need them to exist
+PREMAKE_MONTHS = int(os.getenv("TASKS_PARTITION_PREMAKE_MONTHS", "3"))
+# Months kept in Postgres before the current one; older partitions are archived to S3 and dropped (0 keeps all)
+RETENTION_MONTHS = int(os.getenv("TASKS_RETENTION_MONTHS", "0"))
+ARCHIVE_BUCKET = os.getenv("TASKS_ARCHIVE_BUCKET")
+ARCHIVE_PREFIX = os.getenv("TASKS_ARCHIVE_PREFIX", "archive/tasks")
+ARCHIVE_BATCH_SIZE = int(os.getenv("TASKS_ARCHIVE_BATCH_SIZE", "5000"))
+# Partition DDL gives up after this instead of queueing API traffic behind its lock on tasks
+LOCK_TIMEOUT = os.getenv("TASKS_PARTITION_LOCK_TIMEOUT", "5s")
+
+
+def add_months(month, count):
+    """Returns the first day of the month `count` months after `month`."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    """Returns the partition name for a month (tasks_pYYYY_MM)."""
+    return f"tasks_p{month:%Y_%m}"
+
+
+def partition_month(name):
+    """Returns the first day of the month a tasks_pYYYY_MM partition holds."""
+    match = PARTITION_NAME_RE.match(name)
+    if not match:
+        raise ValueError(f"❌ {name} is not a monthly tasks partition")
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def list_partitions(conn):
+    """Returns {first day of month: partition name} for the partitions attached to tasks."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = 'tasks'::regclass")
+        names = [row[0] for row in cur.fetchall()]
+    conn.rollback()
+
+    return {partition_month(name): name for name in names if PARTITION_NAME_RE.match(name)}
+
+
+def create_partitions(conn, partitions, current_month, dry_run=False):
+    """Creates the missing partitions from the current month through PREMAKE_MONTHS ahead; returns their names."""
+    created = []
+    for offset in range(PREMAKE_MONTHS + 1):
+        month = add_months(current_month, offset)
+        if month in partitions:
+            continue
+        if not dry_run:
+            with conn.cursor() as cur:
+                cur.execute("SELECT set_config('lock_timeout', %s, true)", (LOCK_TIMEOUT,))
+                cur.execute("SELECT create_tasks_partition(%s)", (month,))
+            conn.commit()
+        logger.info("Created partition %s", partition_name(month))
+        created.append(partition_name(month))
+    return created
+
+
+def expired_partitions(partitions, current_month):
+    """Returns [(month, name)] of the partitions older than the retention window, oldest first."""
+    if RETENTION_MONTHS <= 0:
+        return []
+    cutoff = add_months(current_month, -RETENTION_MONTHS)
+    return sorted((month, name) for month, name in partitions.items() if month < cutoff)
+
+
+def export_partition(conn, name, path):
+    """Writes a partition's rows to `path` as gzip-compressed NDJSON (the export=ndjson format).
+
+    Rows are read through a server-side cursor in ARCHIVE_BATCH_SIZE batches.
+    Returns the number of rows written.
+    """
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as output, conn.cursor(name=f"archive_{name}") as cur:
+        cur.itersize = ARCHIVE_BATCH_SIZE
+        cur.execute(f'SELECT id, description, created_at FROM "{name}" ORDER BY created_at, id')
+        while True:
+            rows = cur.fetchmany(ARCHIVE_BATCH_SIZE)
+            if not rows:
+                break
+            output.write(encode_rows(NDJSON, rows)[0])
+            count += len(rows)
+    return count
+
+
+def archive_partition(conn, name):
+    """Exports a partition to S3, then detaches and drops it with its per-day counts and keys; returns the object key.
+
+    The partition stays locked against writes from the export until the drop, so
+    the archive holds exactly the rows removed. If anything fails the transaction
+    rolls back, the partition stays attached, and the next run exports it again.
+    """
+    key = f"{ARCHIVE_PREFIX}/{name}.ndjson.gz"
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT set_config('lock_timeout', %s, true)", (LOCK_TIMEOUT,))
+            cur.execute(f'LOCK TABLE "{name}" IN SHARE MODE')
+        with tempfile.NamedTemporaryFile(suffix=".ndjson.gz") as archive:
+            rows = export_partition(conn, name, archive.name)
+            get_s3_client().upload_file(
+                archive.name, ARCHIVE_BUCKET, key,
+                ExtraArgs={"ContentType": "application/gzip", "Metadata": {"rows": str(rows)}}
+            )
+        month = partition_month(name)
+        with conn.cursor() as cur:
+            cur.execute(f'ALTER TABLE tasks DETACH PARTITION "{name}"')
+            cur.execute(f'DROP TABLE "{name}"')
+            # ✅ DROP fires no triggers: the month's per-day counts and keys leave with its rows, and the version moves
+            cur.execute("DELETE FROM task_daily_counts WHERE day >= %s AND day < %s", (month, add_months(month, 1)))
+            cur.execute("DELETE FROM task_idempotency_keys WHERE created_at >= %s AND created_at < %s",
+                        (month, add_months(month, 1)))
+            cur.execute("INSERT INTO task_change_counter (slot, changes) VALUES (0, 1) "
+                        "ON CONFLICT (slot) DO UPDATE SET changes = task_change_counter.changes + 1")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        logger.error("❌ Archiving partition %s failed; it stays attached.", name)
+        raise
+
+    logger.info("Archived %d task(s) from %s to s3://%s/%s", rows, name, ARCHIVE_BUCKET, key)
+    return key
+
+
+def maintain(conn, today=None, dry_run=False):
+    """Pre-creates upcoming partitions and archives expired ones; returns a summary.
+
+    With dry_run nothing is changed and the summary lists what would be done.
+    """
+    current_month = (today or date.today()).replace(day=1)
+    partitions = list_partitions(conn)
+    if not partitions:
+        raise RuntimeError("❌ tasks has no monthly partitions; apply migration 0006 first.")
+
+    created = create_partitions(conn, partitions, current_month, dry_run)
+    expired = expired_partitions(partitions, current_month)
+    if expired and not ARCHIVE_BUCKET:
+        raise RuntimeError("❌ TASKS_ARCHIVE_BUCKET must be set to archive expired partitions.")
+    if dry_run:
+        archived = [f"{ARCHIVE_PREFIX}/{name}.ndjson.gz" for _, name in expired]
+    else:
+        archived = [archive_partition(conn, name) for _, name in expired]
+
+    return {
+        "created": created,
+        "archived": archived,
+        "partitions": len(partitions) + len(created) - len(archived),
+        "dry_run": dry_run,
+    }
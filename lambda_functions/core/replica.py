@@ -0,0 +1,55 @@
+import os
+import re
+import time
+
+# How long a GET may wait for the replica to replay a client's consistency token before using the primary
+REPLICA_WAIT_MS = int(os.getenv("DB_REPLICA_WAIT_MS", "200"))
+REPLICA_POLL_MS = int(os.getenv("DB_REPLICA_POLL_MS", "20"))
+
+# A Postgres LSN as printed by pg_current_wal_lsn(), e.g. "0/16B3748"
+LSN_RE = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
+
+def parse_consistency_token(value):
+    """Validates a client-supplied consistency token (a commit LSN); None when absent."""
+    if not value:
+        return None
+    value = value.strip()
+    if not LSN_RE.match(value):
+        raise ValueError("❌ Invalid consistency token")
+    return value.upper()
+
+
+def get_current_lsn(conn):
+    """Returns the primary's current WAL position, taken after a commit, as a consistency token."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_current_wal_lsn()::text")
+        lsn = cur.fetchone()[0]
+    conn.rollback()
+    return lsn
+
+
+def has_replayed(conn, lsn):
+    """Returns True once `conn`'s server has replayed `lsn` (always True on a primary)."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT COALESCE(pg_last_wal_replay_lsn() >= %s::pg_lsn, true)", (lsn,))
+        replayed = cur.fetchone()[0]
+    conn.rollback()
+    return replayed
+
+
+def wait_for_replay(conn, lsn, deadline=None, max_wait_ms=None):
+    """Polls until the replica has replayed `lsn`, for at most `max_wait_ms` and never past `deadline`.
+
+    Returns False if the replica is still behind when the wait runs out.
+    """
+    max_wait_ms = REPLICA_WAIT_MS if max_wait_ms is None else max_wait_ms
+    if deadline is not None:
+        max_wait_ms = min(max_wait_ms, deadline.remaining_ms())
+    wait_until = time.monotonic() + max_wait_ms / 1000
+    while True:
+        if has_replayed(conn, lsn):
+            return True
+        if time.monotonic() >= wait_until:
+            return False
+        time.sleep(REPLICA_POLL_MS / 1000)
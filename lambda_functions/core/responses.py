@@ -0,0 +1,35 @@
+import base64
+import json
+from core.metrics import timer
+
+
+def build_response(status_code, body_text, headers=None, content_type="application/json"):
+    """Builds an API Gateway response with CORS around an already-serialized body.
+
+    A bytes body (e.g. MessagePack) is base64-encoded and flagged with isBase64Encoded.
+    """
+    response_headers = {
+        "Access-Control-Allow-Origin": "*",  # Customize for production
+        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+        "Access-Control-Allow-Headers": "Content-Type, If-None-Match, Idempotency-Key, X-Consistency-Token",
+        "Access-Control-Expose-Headers": "ETag, X-Next-Cursor, Retry-After",
+        "Content-Type": content_type
+    }
+    if headers:
+        response_headers.update(headers)
+    response = {
+        "statusCode": status_code,
+        "headers": response_headers,
+        "body": body_text
+    }
+    if isinstance(body_text, bytes):
+        response["body"] = base64.b64encode(body_text).decode("ascii")
+        response["isBase64Encoded"] = True
+    return response
+
+
+def generate_response(status_code, body):
+    """Generates API Gateway response with CORS."""
+    with timer("serialization"):
+        body_text = json.dumps(body)
+    return build_response(status_code, body_text)
@@ -0,0 +1,13 @@
+def get_route_key(event):
+    """Returns "<METHOD> <path>" for an API Gateway v2 (HTTP API) event."""
+    route_key = event.get("routeKey")
+    if route_key and route_key != "$default":
+        return route_key
+
+    # ✅ $default / proxy routes: rebuild the key from the request, dropping the stage prefix
+    http = event.get("requestContext", {}).get("http", {})
+    path = event.get("rawPath") or http.get("path", "")
+    stage = event.get("requestContext", {}).get("stage")
+    if stage and stage != "$default" and path.startswith(f"/{stage}/"):
+        path = path[len(stage) + 1:]
+    return f"{http.get('method', '')} {path.rstrip('/') or '/'}"
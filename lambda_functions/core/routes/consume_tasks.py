@@ -0,0 +1,63 @@
+import logging
+import sentry_sdk
+from core.admission import Overloaded
+from core.db import get_db_connection, record_db_error, return_db_connection
+from core.deadline import Deadline
+from core.ingest import insert_ingested_tasks, parse_message
+from core.logs import log_invocation
+from core.metrics import instrument
+from core.snapshot import request_snapshot
+
+logger = logging.getLogger(__name__)
+
+@log_invocation
+@instrument("consume-tasks")
+def handle(event, context):
+    """Drains a batch of queued tasks into Postgres with a single multi-row INSERT.
+
+    Returns SQS partial-batch failures so only the affected messages are retried.
+    """
+    deadline = Deadline.from_context(context)
+    records = event.get("Records", [])
+
+    failures = []
+    rows = {}  # idempotency key -> (key, description, accepted_at); duplicates in a batch collapse
+    message_ids = []
+    for record in records:
+        try:
+            key, description, accepted_at = parse_message(record)
+        except ValueError as e:
+            # ✅ Poison messages are retried until the redrive policy moves them to the DLQ
+            logger.error("❌ Skipping message %s: %s", record.get("messageId"), e)
+            failures.append({"itemIdentifier": record.get("messageId")})
+            continue
+        rows.setdefault(key, (key, description, accepted_at))
+        message_ids.append(record.get("messageId"))
+
+    if not rows:
+        return {"batchItemFailures": failures}
+
+    conn = None
+    try:
+        conn = get_db_connection(deadline=deadline)
+        inserted = insert_ingested_tasks(conn, list(rows.values()), deadline)
+        logger.info("✅ Ingested %d task(s) from %d message(s) (%d already stored).",
+                    inserted, len(records), len(rows) - inserted)
+        if inserted:
+            request_snapshot()  # ✅ Debounced re-render of the CDN task snapshot
+    except Overloaded as e:
+        # ✅ Shed: the whole batch becomes visible again after the queue's visibility timeout
+        logger.warning("⚠️ Deferring batch of %d message(s): %s", len(message_ids), e)
+        failures.extend({"itemIdentifier": message_id} for message_id in message_ids)
+    except Exception as e:
+        if conn:
+            record_db_error(conn)  # ✅ Failed inserts feed the admission limiter's backoff
+            conn.rollback()  # ✅ Nothing from the batch is committed on failure
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.error("❌ Failed to ingest batch: %s", e)
+        failures.extend({"itemIdentifier": message_id} for message_id in message_ids)
+    finally:
+        if conn:
+            return_db_connection(conn)
+
+    return {"batchItemFailures": failures}
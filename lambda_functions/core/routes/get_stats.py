@@ -0,0 +1,63 @@
+import os
+import psycopg2.errors
+import logging
+import sentry_sdk
+from core.admission import Overloaded, overloaded_response
+from core.compression import compress_responses
+from core.db import get_db_connection, record_db_error, return_db_connection
+from core.deadline import Deadline, DeadlineExceeded
+from core.logs import log_invocation
+from core.metrics import instrument
+from core.responses import generate_response
+from core.stats import build_days, fetch_stats, parse_range
+
+logger = logging.getLogger(__name__)
+
+@log_invocation
+@instrument("GET /tasks/stats")
+@compress_responses
+def handle(event, context):
+    """Handles GET /tasks/stats: the total task count and per-day counts for a date range."""
+    deadline = Deadline.from_context(context)  # ✅ Request-scoped time budget
+    conn = None
+
+    try:
+        required_vars = ["DB_HOST", "DB_NAME", "DB_SECRET_NAME"]
+        if not all(os.getenv(var) for var in required_vars):
+            raise ValueError(f"❌ Missing environment variables: {required_vars}")
+
+        first, last = parse_range(event.get("queryStringParameters") or {})
+
+        conn = get_db_connection(deadline=deadline, replica=True)
+        total, counts = fetch_stats(conn, first, last, deadline)
+
+        logger.info("✅ Served task stats for %s..%s.", first, last)
+        return generate_response(200, {
+            "total": total,
+            "from": first.isoformat(),
+            "to": last.isoformat(),
+            "days": build_days(first, last, counts)
+        })
+
+    except Overloaded as e:
+        return overloaded_response(e)  # ✅ Shed before touching the database
+
+    except (DeadlineExceeded, psycopg2.errors.QueryCanceled) as e:
+        record_db_error(conn)
+        logger.error("❌ Request deadline exceeded: %s", e)
+        return generate_response(503, {"error": "Request timed out."})
+
+    except ValueError as e:
+        logger.error("❌ Value Error: %s", e)
+        return generate_response(400, {"error": str(e)})
+
+    except Exception as e:
+        if isinstance(e, psycopg2.Error):
+            record_db_error(conn)  # ✅ Query failures feed the admission limiter's backoff
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.exception("❌ Unexpected error:")
+        return generate_response(500, {"error": "Internal Server Error."})
+
+    finally:
+        if conn:
+            return_db_connection(conn)  # ✅ Always return connection to the pool
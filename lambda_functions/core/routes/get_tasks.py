@@ -0,0 +1,496 @@
+import json
+import os
+import psycopg2
+import psycopg2.errors
+import logging
+import threading
+import sentry_sdk
+from core.admission import Overloaded, overloaded_response
+from core.changes import advance_watermark, encode_watermark, parse_since, parse_wait, poll_changes
+from core.compression import compress_responses
+from core.db import get_db_connection, record_db_error, return_db_connection, skip_latency_sample
+from core.deadline import Deadline, DeadlineExceeded, with_statement_timeout
+from core.encoders import JSON, NotAcceptable, encode_rows, negotiate, task_dicts
+from core.logs import log_invocation
+from core.metrics import instrument, timer
+from core.replica import parse_consistency_token
+from core.responses import build_response, generate_response
+from core.routes.warmup import handle_warmup
+from core.startup import is_warmup_event
+import time
+import base64
+import hashlib
+import io
+from collections import OrderedDict
+from datetime import datetime
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+# Keyset pagination settings
+DEFAULT_PAGE_SIZE = int(os.getenv("TASKS_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("TASKS_MAX_PAGE_SIZE", "1000"))
+PAGINATION_PARAMS = ["limit", "cursor", "created_after", "created_before", "q"]
+
+# Full-text search settings (GET /tasks?q=...)
+SEARCH_MAX_LENGTH = int(os.getenv("TASKS_SEARCH_MAX_LENGTH", "200"))
+
+# Streaming export settings
+EXPORT_BATCH_SIZE = int(os.getenv("TASKS_EXPORT_BATCH_SIZE", "2000"))
+# Body bytes per export response; Lambda responses are capped at 6 MB including JSON escaping of the body
+EXPORT_MAX_BYTES = int(os.getenv("TASKS_EXPORT_MAX_BYTES", str(4 * 1024 * 1024)))
+EXPORT_CONTENT_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson"
+}
+
+# Warm-container result cache, keyed on query parameters and validated by a version probe
+CACHE_MAX_ENTRIES = int(os.getenv("TASKS_CACHE_MAX_ENTRIES", "32"))
+CACHE_TTL_SECONDS = float(os.getenv("TASKS_CACHE_TTL_SECONDS", "30"))  # ✅ 0 disables the cache
+RESULT_CACHE = OrderedDict()
+CACHE_LOCK = threading.Lock()
+
+def encode_cursor(created_at, task_id):
+    """Encodes the (created_at, id) keyset position of the last row into an opaque cursor."""
+    payload = json.dumps([created_at.isoformat(), task_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor):
+    """Decodes an opaque cursor back into its (created_at, id) keyset position."""
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("❌ Invalid cursor")
+
+def encode_search_cursor(rank, task_id):
+    """Encodes the (rank, id) keyset position of the last search result into an opaque cursor."""
+    payload = json.dumps([rank, task_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def decode_search_cursor(cursor):
+    """Decodes an opaque search cursor back into its (rank, id) keyset position."""
+    try:
+        rank, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if isinstance(rank, str):
+            raise ValueError(rank)
+        return float(rank), int(task_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("❌ Invalid cursor")
+
+def parse_search(value):
+    """Parses the `q` search parameter; blank values disable search."""
+    if value is None or not value.strip():
+        return None
+    value = value.strip()
+    if len(value) > SEARCH_MAX_LENGTH:
+        raise ValueError(f"❌ q must be at most {SEARCH_MAX_LENGTH} characters")
+    return value
+
+def parse_limit(value):
+    """Parses the `limit` query parameter, falling back to the default page size."""
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError("❌ limit must be an integer")
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"❌ limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+def parse_timestamp(name, value):
+    """Parses an ISO 8601 timestamp query parameter."""
+    if value is None:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"  # ✅ fromisoformat on Python 3.9 does not accept "Z"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"❌ {name} must be an ISO 8601 timestamp")
+
+def build_tasks_query(limit, cursor=None, created_after=None, created_before=None):
+    """Builds the keyset-paginated tasks query served by idx_tasks_created_at_id.
+
+    One extra row is fetched so the caller can tell whether another page exists.
+    A limit of None leaves the query unbounded (used by the streaming export).
+    """
+    conditions = []
+    params = []
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        conditions.append("(created_at, id) < (%s, %s)")
+        params.extend([cursor_created_at, cursor_id])
+    if created_after:
+        conditions.append("created_at > %s")
+        params.append(created_after)
+    if created_before:
+        conditions.append("created_at < %s")
+        params.append(created_before)
+
+    query = "SELECT id, description, created_at FROM tasks"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY created_at DESC, id DESC"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit + 1)
+    return query, params
+
+def build_search_query(search, limit, cursor=None, created_after=None, created_before=None):
+    """Builds the ranked full-text search query served by idx_tasks_search_vector.
+
+    Matches are ordered by ts_rank, then id, and paginated on that (rank, id)
+    keyset; one extra row is fetched to detect another page.
+    """
+    conditions = ["search_vector @@ query"]
+    params = [search]
+    if created_after:
+        conditions.append("created_at > %s")
+        params.append(created_after)
+    if created_before:
+        conditions.append("created_at < %s")
+        params.append(created_before)
+
+    query = ("SELECT id, description, created_at, rank FROM ("
+             "SELECT id, description, created_at, ts_rank(search_vector, query) AS rank "
+             "FROM tasks, websearch_to_tsquery('english', %s) AS query "
+             "WHERE " + " AND ".join(conditions) + ") AS matches")
+    if cursor:
+        cursor_rank, cursor_id = decode_search_cursor(cursor)
+        query += " WHERE (rank, id) < (%s::real, %s)"
+        params.extend([cursor_rank, cursor_id])
+    query += " ORDER BY rank DESC, id DESC LIMIT %s"
+    params.append(limit + 1)
+    return query, params
+
+def encode_task(task):
+    """Encodes a single (id, description, created_at) row as a compact JSON object."""
+    return json.dumps({
+        "id": task[0],
+        "description": task[1],
+        "created_at": task[2].isoformat() if task[2] else None
+    }, separators=(",", ":"))
+
+def stream_tasks(cur, output, export_format, batch_size=None, max_bytes=None):
+    """Streams rows from a server-side cursor into `output` one fetchmany batch at a time.
+
+    Only a single batch of rows is held in memory; each batch is encoded and
+    written to the output buffer before the next one is fetched. Writing stops
+    before the row that would take the output past `max_bytes`.
+    Returns (rows written, cursor to resume after the last row or None when complete).
+    """
+    batch_size = batch_size or EXPORT_BATCH_SIZE
+    max_bytes = max_bytes or EXPORT_MAX_BYTES
+    row_count = 0
+    size = 2  # ✅ JSON brackets
+    last_task = None
+    next_cursor = None
+
+    if export_format == "json":
+        output.write("[")
+
+    while next_cursor is None:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+
+        lines = []
+        for task in rows:
+            line = encode_task(task)  # ✅ ASCII-only JSON, so characters are bytes
+            if last_task is not None and size + len(line) + 1 > max_bytes:
+                next_cursor = encode_cursor(last_task[2], last_task[0])
+                break
+            lines.append(line)
+            size += len(line) + 1
+            last_task = task
+
+        if export_format == "json":
+            chunk = ",".join(lines)
+            output.write(chunk if row_count == 0 else "," + chunk)
+        else:
+            output.write("".join(line + "\n" for line in lines))
+        row_count += len(lines)
+
+    if export_format == "json":
+        output.write("]")
+    return row_count, next_cursor
+
+def export_tasks(conn, export_format, created_after=None, created_before=None, deadline=None, cursor=None):
+    """Exports matching tasks through a named (server-side) cursor into a text buffer.
+
+    Returns (buffer, next cursor); the cursor is set when EXPORT_MAX_BYTES cut the export short.
+    """
+    query, query_params = build_tasks_query(
+        None, cursor=cursor, created_after=created_after, created_before=created_before)
+    output = io.StringIO()
+
+    # ✅ DECLARE cannot share a statement with SET, so the timeout goes first on its own
+    if deadline:
+        with conn.cursor() as cur:
+            cur.execute(with_statement_timeout("SELECT 1", deadline))
+
+    # ✅ A named cursor keeps the result set on the server; rows arrive in fetchmany batches
+    with conn.cursor(name="tasks_export") as cur:
+        cur.itersize = EXPORT_BATCH_SIZE
+        with timer("query"):
+            cur.execute(query, query_params)
+        with timer("row_processing"):
+            row_count, next_cursor = stream_tasks(cur, output, export_format)
+
+    logger.info("✅ Exported %d tasks as %s%s.", row_count, export_format,
+                " (truncated at TASKS_EXPORT_MAX_BYTES)" if next_cursor else "")
+    return output, next_cursor
+
+def get_tasks_version(conn, deadline=None):
+    """Returns a cheap (max id, change counter) watermark that changes whenever tasks are written.
+
+    The counter is bumped by a statement trigger (migration 0009) and only grows, so
+    the probe reads a handful of rows and never scans or counts tasks.
+    """
+    with timer("query"), conn.cursor() as cur:
+        cur.execute(with_statement_timeout(
+            "SELECT COALESCE(MAX(id), 0), (SELECT COALESCE(SUM(changes), 0)::bigint FROM task_change_counter) FROM tasks",
+            deadline))
+        return tuple(cur.fetchone())
+
+def make_cache_key(params, media_type=JSON):
+    """Builds a stable cache key from the query string parameters and negotiated media type.
+
+    The consistency token is not part of it; the default JSON keeps its original key (and ETag).
+    """
+    params = {name: value for name, value in params.items() if name != "consistency_token"}
+    if media_type != JSON:
+        params = {**params, "accept": media_type}
+    return json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+def get_consistency_token(event, params):
+    """Returns the read-your-writes token from ?consistency_token= or the X-Consistency-Token header."""
+    headers = {name.lower(): value for name, value in (event.get("headers") or {}).items()}
+    return parse_consistency_token(params.get("consistency_token") or headers.get("x-consistency-token"))
+
+def make_etag(cache_key, version):
+    """Builds a strong ETag for the representation of `cache_key` at `version`."""
+    digest = hashlib.sha256(f"{cache_key}|{version}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+def etag_matches(event, etag):
+    """Checks the request If-None-Match header against the current ETag."""
+    headers = {name.lower(): value for name, value in (event.get("headers") or {}).items()}
+    if_none_match = headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.replace("W/", "", 1) == etag for tag in candidates)
+
+def get_cached_body(cache_key, version):
+    """Returns the cached (serialized body, headers) if still fresh and built at `version`."""
+    if CACHE_TTL_SECONDS <= 0:
+        return None
+    with CACHE_LOCK:
+        entry = RESULT_CACHE.get(cache_key)
+        if entry is None:
+            return None
+        cached_version, body_text, headers, expires_at = entry
+        if cached_version != version or expires_at < time.monotonic():
+            del RESULT_CACHE[cache_key]
+            return None
+        RESULT_CACHE.move_to_end(cache_key)  # ✅ LRU ordering
+        return body_text, headers
+
+def store_cached_body(cache_key, version, body_text, headers=None):
+    """Stores a serialized body, evicting the least recently used entries beyond CACHE_MAX_ENTRIES."""
+    if CACHE_TTL_SECONDS <= 0:
+        return
+    with CACHE_LOCK:
+        RESULT_CACHE[cache_key] = (version, body_text, headers or {}, time.monotonic() + CACHE_TTL_SECONDS)
+        RESULT_CACHE.move_to_end(cache_key)
+        while len(RESULT_CACHE) > CACHE_MAX_ENTRIES:
+            RESULT_CACHE.popitem(last=False)
+
+@log_invocation
+@instrument("GET /tasks")
+@compress_responses
+def handle(event, context):
+    """Handles GET /tasks request."""
+    logger.debug("🔍 GET /tasks started.")
+
+    deadline = Deadline.from_context(context)  # ✅ Request-scoped time budget
+    conn = None
+    cur = None  # ✅ Ensure cur is always initialized
+
+    try:
+        # ✅ Ensure environment variables are set
+        required_vars = ["DB_HOST", "DB_NAME", "DB_SECRET_NAME"]
+        if not all(os.getenv(var) for var in required_vars):
+            raise ValueError(f"❌ Missing environment variables: {required_vars}")
+
+        # ✅ Provisioned-concurrency / scheduled pings only warm the container
+        if is_warmup_event(event):
+            return handle_warmup(deadline)
+
+        params = event.get("queryStringParameters") or {}
+        consistency_token = get_consistency_token(event, params)  # ✅ Commit LSN from an earlier POST
+
+        # ✅ Delta sync: only rows after the caller's watermark, optionally long-polling for new ones
+        since = parse_since(params)
+        if since is not None:
+            if any(params.get(name) for name in ("cursor", "q", "export")):
+                raise ValueError("❌ since_id/watermark cannot be combined with cursor, q or export")
+            return handle_changes(params, since, consistency_token, deadline)
+
+        # ✅ Streaming export bypasses the row list and json.dumps entirely
+        export_format = params.get("export")
+        if export_format:
+            if export_format not in EXPORT_CONTENT_TYPES:
+                raise ValueError(f"❌ export must be one of: {', '.join(EXPORT_CONTENT_TYPES)}")
+            if params.get("q"):
+                raise ValueError("❌ q cannot be combined with export")
+            created_after = parse_timestamp("created_after", params.get("created_after"))
+            created_before = parse_timestamp("created_before", params.get("created_before"))
+
+            conn = get_db_connection(deadline=deadline, replica=True, min_lsn=consistency_token)
+            if conn is None:
+                raise Exception("❌ Database connection failed.")
+            skip_latency_sample(conn)  # ✅ Export time grows with the table, not with load
+
+            output, next_cursor = export_tasks(
+                conn, export_format, created_after, created_before, deadline, params.get("cursor"))
+            return generate_export_response(output, EXPORT_CONTENT_TYPES[export_format], next_cursor)
+
+        # ✅ Accept picks the encoder: JSON (default), columnar JSON, NDJSON or MessagePack
+        headers = {name.lower(): value for name, value in (event.get("headers") or {}).items()}
+        media_type = negotiate(headers.get("accept"))
+        vary = {"Vary": "Accept"}
+
+        # ✅ Any pagination parameter opts the caller into a page envelope with next_cursor
+        paginated = any(params.get(name) for name in PAGINATION_PARAMS)
+        search = parse_search(params.get("q"))
+        if paginated:
+            limit = parse_limit(params.get("limit"))
+            # ✅ q switches to ranked, index-backed full-text search with its own (rank, id) cursor
+            build_query = partial(build_search_query, search) if search else build_tasks_query
+            query, query_params = build_query(
+                limit,
+                cursor=params.get("cursor"),
+                created_after=parse_timestamp("created_after", params.get("created_after")),
+                created_before=parse_timestamp("created_before", params.get("created_before")),
+            )
+
+        # ✅ Reads go to the replica once it has replayed the caller's token (else the primary)
+        conn = get_db_connection(deadline=deadline, replica=True, min_lsn=consistency_token)
+        if conn is None:
+            raise Exception("❌ Database connection failed.")
+
+        # ✅ Unchanged data skips the full query (304) or the serialization (cache hit)
+        cache_key = make_cache_key(params, media_type)
+        version = get_tasks_version(conn, deadline)
+        etag = make_etag(cache_key, version)
+
+        if etag_matches(event, etag):
+            logger.info("✅ ETag matched. Returning 304 Not Modified.")
+            return build_response(304, "", {"ETag": etag, **vary})
+
+        cached = get_cached_body(cache_key, version)
+        if cached is not None:
+            logger.info("✅ Serving tasks from warm-container cache.")
+            body_text, extra_headers = cached
+            return build_response(200, body_text, {"ETag": etag, **vary, **extra_headers}, content_type=media_type)
+
+        logger.debug("✅ DB Connection acquired. Executing query...")
+
+        with timer("query"), conn.cursor() as cur:
+            if paginated:
+                cur.execute(with_statement_timeout(query, deadline), query_params)
+            else:
+                cur.execute(with_statement_timeout(
+                    "SELECT id, description, created_at FROM tasks ORDER BY created_at DESC, id DESC", deadline))
+            tasks = cur.fetchall()
+
+        with timer("row_processing"):
+            next_cursor = None
+            if paginated and len(tasks) > limit:
+                tasks = tasks[:limit]
+                last_task = tasks[-1]
+                if search:
+                    next_cursor = encode_search_cursor(last_task[3], last_task[0])
+                else:
+                    next_cursor = encode_cursor(last_task[2], last_task[0])
+
+        logger.info("✅ Retrieved %d tasks.", len(tasks))
+        with timer("serialization"):
+            # ✅ Encoded straight from the cursor tuples
+            body_text, extra_headers = encode_rows(media_type, tasks, paginated, next_cursor)
+        store_cached_body(cache_key, version, body_text, extra_headers)
+        return build_response(200, body_text, {"ETag": etag, **vary, **extra_headers}, content_type=media_type)
+
+    except Overloaded as e:
+        return overloaded_response(e)  # ✅ Shed before touching the database
+
+    except (DeadlineExceeded, psycopg2.errors.QueryCanceled) as e:
+        # ✅ Fail fast with 503 instead of being killed by the Lambda runtime
+        record_db_error(conn)
+        logger.error("❌ Request deadline exceeded: %s", e)
+        return generate_response(503, {"error": "Request timed out."})
+
+    except NotAcceptable as e:
+        logger.warning("⚠️ Not acceptable: %s", e)
+        return generate_response(406, {"error": str(e)})
+
+    except ValueError as e:
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.error("❌ Value Error: %s", e)
+        return generate_response(400, {"error": str(e)})
+
+    except Exception as e:
+        if isinstance(e, psycopg2.Error):
+            record_db_error(conn)  # ✅ Query failures feed the admission limiter's backoff
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.exception("❌ Unexpected error:")
+        return generate_response(500, {"error": "Internal Server Error."})
+
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            return_db_connection(conn)  # ✅ Ensure connection is returned
+
+def handle_changes(params, since, consistency_token=None, deadline=None):
+    """Serves delta sync: rows after the watermark (oldest first), the next watermark and has_more."""
+    last_id, gaps = since
+    limit = parse_limit(params.get("limit"))
+    wait = parse_wait(params.get("wait"))
+
+    # ✅ LISTEN is refused on a hot standby, so long-polls read from the primary
+    conn = get_db_connection(deadline=deadline, replica=wait <= 0, min_lsn=consistency_token)
+    if conn is None:
+        raise Exception("❌ Database connection failed.")
+    if wait > 0:
+        skip_latency_sample(conn)  # ✅ A long-poll's wait is not database latency
+    try:
+        rows = poll_changes(conn, last_id, gaps, limit, wait, deadline)
+    except psycopg2.Error:
+        record_db_error(conn)
+        raise
+    finally:
+        return_db_connection(conn)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    last_id, gaps = advance_watermark(last_id, gaps, rows)
+    logger.info("✅ Delta sync returned %d task(s) after id %d.", len(rows), since[0])
+    return generate_response(200, {
+        "tasks": task_dicts(rows),
+        "watermark": encode_watermark(last_id, gaps),
+        "has_more": has_more
+    })
+
+def generate_export_response(output, content_type, next_cursor=None):
+    """Generates API Gateway response for a pre-encoded export buffer.
+
+    A truncated export carries the cursor for the next part in X-Next-Cursor.
+    """
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return build_response(200, output.getvalue(), headers, content_type=content_type)
@@ -0,0 +1,301 @@
+import json
+import os
+import psycopg2
+import psycopg2.errors
+from psycopg2.extras import execute_values
+import logging
+import sentry_sdk
+from core.admission import Overloaded, overloaded_response
+from core.compression import compress_responses
+from core.db import DB_READER_HOST, get_db_connection, record_db_error, return_db_connection
+from core.deadline import Deadline, DeadlineExceeded, with_statement_timeout
+from core.ingest import assign_keys, enqueue_tasks, get_idempotency_key, is_async_enabled
+from core.logs import log_invocation
+from core.metrics import instrument, timer
+from core.migrations import get_schema_version, latest_version
+from core.replica import get_current_lsn
+from core.responses import generate_response
+from core.routes.warmup import handle_warmup
+from core.snapshot import request_snapshot
+from core.startup import is_warmup_event
+from sentry_sdk import set_level
+
+set_level("warning")
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CHECKED = False  # Tracks if the schema version was checked
+EXPECTED_SCHEMA_VERSION = latest_version()  # Highest bundled migration
+
+# Maximum number of tasks accepted in a single batch request
+MAX_BATCH_SIZE = int(os.getenv("TASKS_MAX_BATCH_SIZE", "1000"))
+
+def check_schema_version(deadline=None):
+    """Checks once per container that migrations are applied; never runs DDL.
+
+    Schema changes are applied by the migration runner (migrate.py) during deploy.
+    """
+    global SCHEMA_CHECKED
+    if SCHEMA_CHECKED:
+        return
+
+    conn = None
+    try:
+        conn = get_db_connection(deadline=deadline)
+        version = get_schema_version(conn)
+        if version < EXPECTED_SCHEMA_VERSION:
+            logger.error("❌ Database schema version %s is behind expected %s. Run the migration runner.",
+                         version, EXPECTED_SCHEMA_VERSION)
+            sentry_sdk.capture_message(f"Database schema version {version} < {EXPECTED_SCHEMA_VERSION}")
+        SCHEMA_CHECKED = True
+    except psycopg2.Error as e:
+        record_db_error(conn)
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.error("❌ Failed to check database schema version: %s", e)
+    finally:
+        if conn:
+            return_db_connection(conn)  # ✅ Ensure connection is returned to pool
+
+def issue_consistency_token(conn):
+    """Returns the post-commit LSN for read-your-writes GETs, or None when reads are not replica-routed."""
+    if not DB_READER_HOST:
+        return None
+    try:
+        return get_current_lsn(conn)
+    except psycopg2.Error as e:
+        logger.warning("⚠️ Could not read commit LSN: %s", e)  # ✅ The write succeeded; only the token is missing
+        return None
+
+def validate_task(item):
+    """Validates a single task payload and returns its description or raises ValueError."""
+    if not isinstance(item, dict):
+        raise ValueError("Task must be a JSON object.")
+    description = item.get("description")
+    if not isinstance(description, str) or not description.strip():
+        raise ValueError("Description is required.")
+    return description.strip()
+
+def insert_tasks_batch(conn, descriptions, deadline=None):
+    """Inserts all descriptions with one multi-row INSERT in a single transaction.
+
+    Each row carries its input position (ord) next to the id drawn for it, so ids
+    map back to input order without relying on the order Postgres inserts in.
+    Returns the generated ids in input order.
+    """
+    with timer("query"), conn.cursor() as cur:
+        rows = execute_values(
+            cur,
+            with_statement_timeout(
+                "WITH input AS ("
+                "SELECT nextval('tasks_id_seq') AS id, description, ord "
+                "FROM (VALUES %s) AS v (description, ord)), "
+                "inserted AS (INSERT INTO tasks (id, description) SELECT id, description FROM input RETURNING id) "
+                "SELECT inserted.id, input.ord FROM inserted JOIN input USING (id) ORDER BY input.ord",
+                deadline
+            ),
+            [(description, position) for position, description in enumerate(descriptions)],
+            page_size=len(descriptions),  # ✅ One statement, one round trip
+            fetch=True
+        )
+    conn.commit()
+    return [task_id for task_id, _ in sorted(rows, key=lambda row: row[1])]
+
+def handle_batch(tasks, deadline=None):
+    """Validates and inserts a JSON array of tasks, reporting results per item."""
+    if not tasks:
+        return generate_response(400, {"error": "Task list is empty."})
+    if len(tasks) > MAX_BATCH_SIZE:
+        return generate_response(400, {"error": f"Batch exceeds maximum size of {MAX_BATCH_SIZE} tasks."})
+
+    results = []
+    descriptions = []
+    for index, item in enumerate(tasks):
+        try:
+            descriptions.append(validate_task(item))
+            results.append({"index": index})
+        except ValueError as e:
+            results.append({"index": index, "error": str(e)})
+
+    if not descriptions:
+        return generate_response(400, {"error": "No valid tasks in batch.", "results": results})
+
+    conn = None
+    try:
+        conn = get_db_connection(deadline=deadline)
+        task_ids = iter(insert_tasks_batch(conn, descriptions, deadline))
+        consistency_token = issue_consistency_token(conn)
+    except psycopg2.Error:
+        if conn:
+            record_db_error(conn)  # ✅ Query failures feed the admission limiter's backoff
+            conn.rollback()  # ✅ Nothing from the batch is committed on failure
+        raise
+    finally:
+        if conn:
+            return_db_connection(conn)
+
+    for result in results:
+        if "error" not in result:
+            result["task_id"] = next(task_ids)
+
+    request_snapshot()  # ✅ Debounced re-render of the CDN task snapshot
+
+    created = len(descriptions)
+    logger.info("✅ Batch created %d tasks (%d rejected).", created, len(tasks) - created)
+    body = {
+        "message": f"{created} tasks created.",
+        "task_ids": [result.get("task_id") for result in results],
+        "results": results
+    }
+    if consistency_token:
+        body["consistency_token"] = consistency_token
+    return generate_response(201, body)
+
+def handle_async(event, body):
+    """Validates and enqueues the task(s) for the queue consumer; never touches the database."""
+    request_key = get_idempotency_key(event)
+
+    if not isinstance(body, list):
+        try:
+            description = validate_task(body)
+        except ValueError as e:
+            return generate_response(400, {"error": str(e)})  # ✅ A client error, as in sync mode
+        key = assign_keys(1, request_key)[0]
+        if enqueue_tasks([(key, description)]):
+            return generate_response(503, {"error": "Failed to enqueue task."})
+        return generate_response(202, {"message": "Task accepted.", "task_key": key})
+
+    if not body:
+        return generate_response(400, {"error": "Task list is empty."})
+    if len(body) > MAX_BATCH_SIZE:
+        return generate_response(400, {"error": f"Batch exceeds maximum size of {MAX_BATCH_SIZE} tasks."})
+
+    results = []
+    tasks = []
+    keys = iter(assign_keys(len(body), request_key))
+    for index, item in enumerate(body):
+        key = next(keys)
+        try:
+            tasks.append((key, validate_task(item)))
+            results.append({"index": index, "task_key": key})
+        except ValueError as e:
+            results.append({"index": index, "error": str(e)})
+
+    if not tasks:
+        return generate_response(400, {"error": "No valid tasks in batch.", "results": results})
+
+    failed = enqueue_tasks(tasks)
+    for result in results:
+        if result.get("task_key") in failed:
+            result["error"] = "Failed to enqueue task."
+            del result["task_key"]
+
+    accepted = len(tasks) - len(failed)
+    if not accepted:
+        return generate_response(503, {"error": "Failed to enqueue tasks.", "results": results})
+    return generate_response(202, {
+        "message": f"{accepted} tasks accepted.",
+        "task_keys": [result.get("task_key") for result in results],
+        "results": results
+    })
+
+@log_invocation
+@instrument("POST /tasks")
+@compress_responses
+def handle(event, context):
+    """Handles POST /tasks request."""
+    logger.debug("🔍 POST /tasks started.")
+
+    # ✅ Attach a request summary for debugging (not the whole event and body)
+    sentry_sdk.set_context("Lambda Execution", {
+        "request_id": (event.get("requestContext") or {}).get("requestId"),
+        "body_bytes": len(event.get("body") or ""),
+    })
+
+    deadline = Deadline.from_context(context)  # ✅ Request-scoped time budget
+    conn = None
+    cur = None  # ✅ Ensure cur is always initialized
+
+    try:
+        # ✅ Ensure environment variables are set
+        required_vars = ["DB_HOST", "DB_NAME", "DB_SECRET_NAME"]
+        if not all(os.getenv(var) for var in required_vars):
+            raise ValueError(f"❌ Missing environment variables: {required_vars}")
+
+        # ✅ Provisioned-concurrency / scheduled pings only warm the container
+        if is_warmup_event(event):
+            return handle_warmup(deadline)
+
+        # ✅ Validate request body
+        if "body" not in event or not event["body"]:
+            return generate_response(400, {"error": "Missing request body."})
+
+        try:
+            body = json.loads(event["body"])
+        except json.JSONDecodeError:
+            return generate_response(400, {"error": "Invalid JSON in request body."})
+
+        # ✅ Write-behind mode: enqueue and return 202 without holding a DB connection
+        if is_async_enabled():
+            return handle_async(event, body)
+
+        check_schema_version(deadline)  # ✅ Cached per container; DDL lives in migrations/
+
+        # ✅ A JSON array is a batch of tasks inserted in one round trip
+        if isinstance(body, list):
+            return handle_batch(body, deadline)
+
+        # ✅ Same validation as batch items: a non-object body or non-string description is a 400
+        try:
+            description = validate_task(body)
+        except ValueError as e:
+            return generate_response(400, {"error": str(e)})
+
+        # ✅ Get a database connection
+        conn = get_db_connection(deadline=deadline)
+        cur = conn.cursor()
+
+        # ✅ Insert new task
+        with timer("query"):
+            cur.execute(with_statement_timeout("INSERT INTO tasks (description) VALUES (%s) RETURNING id", deadline),
+                        (description,))
+            task_id = cur.fetchone()[0]
+            conn.commit()
+
+        logger.info("✅ Task created with ID: %s", task_id)
+        request_snapshot()  # ✅ Debounced re-render of the CDN task snapshot
+        body = {"message": "Task created.", "task_id": task_id}
+        consistency_token = issue_consistency_token(conn)
+        if consistency_token:
+            body["consistency_token"] = consistency_token  # ✅ Pass to GET for read-your-writes
+        return generate_response(201, body)
+
+    except Overloaded as e:
+        return overloaded_response(e)  # ✅ Shed before touching the database
+
+    except (DeadlineExceeded, psycopg2.errors.QueryCanceled) as e:
+        # ✅ Fail fast with 503 instead of being killed by the Lambda runtime
+        record_db_error(conn)
+        logger.error("❌ Request deadline exceeded: %s", e)
+        return generate_response(503, {"error": "Request timed out."})
+
+    except ValueError as e:
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.error("❌ Value Error: %s", e)
+        return generate_response(400, {"error": str(e)})
+
+    except psycopg2.Error as e:
+        record_db_error(conn)  # ✅ Query failures feed the admission limiter's backoff
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.error("❌ Database Error: %s", e)
+        return generate_response(500, {"error": "Database error.", "details": str(e)})
+
+    except Exception as e:
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.exception("❌ Unexpected error:")
+        return generate_response(500, {"error": "Internal Server Error."})
+
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            return_db_connection(conn)  # ✅ Always return connection to the pool
@@ -0,0 +1,69 @@
+import logging
+import psycopg2
+import sentry_sdk
+from core.db import get_db_connection, record_db_error, return_db_connection
+from core.deadline import Deadline, with_statement_timeout
+from core.logs import log_invocation
+from core.metrics import instrument, timer
+from core.routes.get_tasks import build_tasks_query, encode_cursor, encode_task, get_tasks_version
+from core import snapshot
+
+logger = logging.getLogger(__name__)
+
+def render_page(rows, next_cursor):
+    """Renders rows in the same {"tasks", "next_cursor"} envelope as a paginated GET /tasks."""
+    return '{"tasks":[' + ",".join(encode_task(task) for task in rows) + '],"next_cursor":' + \
+        (f'"{next_cursor}"' if next_cursor else "null") + "}"
+
+def render_pages(conn, deadline=None):
+    """Reads the newest SNAPSHOT_PAGES pages with one keyset query and renders each page.
+
+    The last page's next_cursor (if any) continues on the API for deeper pages.
+    """
+    page_size = snapshot.SNAPSHOT_PAGE_SIZE
+    query, params = build_tasks_query(snapshot.SNAPSHOT_PAGES * page_size)
+    with timer("query"), conn.cursor() as cur:
+        cur.execute(with_statement_timeout(query, deadline), params)
+        rows = cur.fetchall()
+
+    with timer("serialization"):
+        pages = []
+        for start in range(0, min(len(rows), snapshot.SNAPSHOT_PAGES * page_size), page_size):
+            page = rows[start:start + page_size]
+            more = len(rows) > start + page_size
+            pages.append(render_page(page, encode_cursor(page[-1][2], page[-1][0]) if more else None))
+    return pages or [render_page([], None)]
+
+@log_invocation
+@instrument("publish-snapshot")
+def handle(event, context):
+    """Re-renders the task snapshot once for a whole batch of queued render requests.
+
+    A burst of writes arrives as one batch and is coalesced into a single render,
+    which is skipped if the published snapshot already covers the current data.
+    """
+    deadline = Deadline.from_context(context)
+    requests = len(event.get("Records", []))
+
+    conn = None
+    try:
+        conn = get_db_connection(deadline=deadline)
+        watermark = get_tasks_version(conn, deadline)
+        current = snapshot.read_pointer()
+        if snapshot.is_newer(current, watermark):
+            logger.info("✅ Snapshot %s is current; %d request(s) coalesced.", current["version"], requests)
+            return {"published": None}
+        pages = render_pages(conn, deadline)
+    except Exception as e:
+        if isinstance(e, psycopg2.Error):
+            record_db_error(conn)  # ✅ Query failures feed the admission limiter's backoff
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.error("❌ Failed to render task snapshot: %s", e)
+        raise  # ✅ The batch is redelivered; renders are idempotent
+    finally:
+        if conn:
+            return_db_connection(conn)  # ✅ Released before the S3 uploads
+
+    version = snapshot.publish(watermark, pages)
+    logger.info("✅ Snapshot render for %d request(s) done.", requests)
+    return {"published": version}
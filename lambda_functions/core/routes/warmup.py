@@ -0,0 +1,23 @@
+import logging
+from core.admission import Overloaded, overloaded_response
+from core.db import get_db_connection, return_db_connection
+from core.deadline import DeadlineExceeded
+from core.responses import generate_response
+
+logger = logging.getLogger(__name__)
+
+def handle_warmup(deadline=None):
+    """Primes DB_POOL and the credential cache without touching `tasks`.
+
+    A shed or timed-out warm-up answers like a route would instead of failing the invocation.
+    """
+    try:
+        conn = get_db_connection(deadline=deadline)
+    except Overloaded as e:
+        return overloaded_response(e)
+    except DeadlineExceeded as e:
+        logger.error("❌ Warm-up deadline exceeded: %s", e)
+        return generate_response(503, {"error": "Request timed out."})
+    return_db_connection(conn)
+    logger.info("✅ Warm-up complete.")
+    return generate_response(200, {"message": "Warm-up complete."})
@@ -0,0 +1,153 @@
+import gzip
+import json
+import os
+import time
+import logging
+from datetime import datetime, timezone
+from core.ingest import get_sqs_client
+
+logger = logging.getLogger(__name__)
+
+# Pre-rendered first pages of GET /tasks, written to the frontend bucket and served by CloudFront
+SNAPSHOT_BUCKET = os.getenv("TASKS_SNAPSHOT_BUCKET")
+SNAPSHOT_QUEUE_URL = os.getenv("TASKS_SNAPSHOT_QUEUE_URL")  # ✅ Unset disables snapshot publishing
+SNAPSHOT_PREFIX = os.getenv("TASKS_SNAPSHOT_PREFIX", "snapshots/tasks")
+SNAPSHOT_PAGES = int(os.getenv("TASKS_SNAPSHOT_PAGES", "5"))
+SNAPSHOT_PAGE_SIZE = int(os.getenv("TASKS_SNAPSHOT_PAGE_SIZE", "100"))
+REGION = os.getenv("AWS_REGION")
+
+# Writes within this window of a queued render ride along with it (one render per burst)
+SNAPSHOT_DEBOUNCE_SECONDS = min(int(os.getenv("TASKS_SNAPSHOT_DEBOUNCE_SECONDS", "5")), 900)  # ✅ SQS DelaySeconds cap
+# Clients and CloudFront re-check the pointer this often; versioned pages never change
+POINTER_MAX_AGE_SECONDS = int(os.getenv("TASKS_SNAPSHOT_POINTER_MAX_AGE", "5"))
+PAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+S3_CLIENT = None
+LAST_REQUESTED_AT = None  # monotonic time this container last queued a render
+
+
+def get_s3_client():
+    """Creates the S3 client once per container."""
+    global S3_CLIENT
+    if S3_CLIENT is None:
+        import boto3  # ✅ Deferred so containers that never publish do not pay for it
+        S3_CLIENT = boto3.client("s3", region_name=REGION)
+    return S3_CLIENT
+
+
+def request_snapshot():
+    """Queues a delayed snapshot render after a write; returns True if a request was sent.
+
+    Each container sends at most one request per debounce window. Writes made in
+    that window commit before the delayed message becomes visible, so the render
+    still includes them. Failures are logged and never fail the write.
+    """
+    global LAST_REQUESTED_AT
+    if not SNAPSHOT_QUEUE_URL:
+        return False
+    now = time.monotonic()
+    if LAST_REQUESTED_AT is not None and now - LAST_REQUESTED_AT < SNAPSHOT_DEBOUNCE_SECONDS:
+        return False
+    try:
+        get_sqs_client().send_message(
+            QueueUrl=SNAPSHOT_QUEUE_URL,
+            MessageBody=json.dumps({"requested_at": datetime.now(timezone.utc).isoformat()}),
+            DelaySeconds=SNAPSHOT_DEBOUNCE_SECONDS
+        )
+    except Exception as e:
+        logger.warning("⚠️ Could not queue a snapshot render: %s", e)
+        return False
+    LAST_REQUESTED_AT = now
+    return True
+
+
+def pointer_key():
+    """Returns the key of the mutable pointer to the current snapshot version."""
+    return f"{SNAPSHOT_PREFIX}/latest.json"
+
+
+def page_path(version, number):
+    """Returns a page's path relative to SNAPSHOT_PREFIX (as listed in the pointer)."""
+    return f"v/{version}/page-{number}.json"
+
+
+def read_pointer():
+    """Returns the published pointer document, or None if nothing has been published."""
+    client = get_s3_client()
+    try:
+        response = client.get_object(Bucket=SNAPSHOT_BUCKET, Key=pointer_key())
+    except client.exceptions.NoSuchKey:
+        return None
+    return json.loads(response["Body"].read())
+
+
+def is_newer(pointer, watermark):
+    """Returns True if `pointer` was rendered at `watermark` or later.
+
+    Only the change counter (the watermark's second part) is compared: it grows on
+    every write, while max id or a row count can stay put or drop after deletes.
+    A pointer without one (published before the counter existed) is never current.
+    """
+    return pointer is not None and pointer.get("changes") is not None and pointer["changes"] >= watermark[1]
+
+
+def delete_version(version):
+    """Deletes every page of a superseded snapshot version."""
+    client = get_s3_client()
+    listing = client.list_objects_v2(Bucket=SNAPSHOT_BUCKET, Prefix=f"{SNAPSHOT_PREFIX}/v/{version}/")
+    keys = [{"Key": item["Key"]} for item in listing.get("Contents", [])]
+    if keys:
+        client.delete_objects(Bucket=SNAPSHOT_BUCKET, Delete={"Objects": keys, "Quiet": True})
+
+
+def publish(watermark, pages):
+    """Uploads gzip-compressed `pages` under a new version, then swaps the pointer to it.
+
+    Pages are immutable and written first, so a reader never sees a pointer to
+    missing pages. The previous version is kept for readers mid-fetch and the
+    one before it is deleted. Returns the new version tag, or None if a newer
+    snapshot was published meanwhile.
+    """
+    client = get_s3_client()
+    version = "-".join(str(part) for part in watermark)
+
+    paths = []
+    for number, page in enumerate(pages, start=1):
+        path = page_path(version, number)
+        client.put_object(
+            Bucket=SNAPSHOT_BUCKET,
+            Key=f"{SNAPSHOT_PREFIX}/{path}",
+            Body=gzip.compress(page.encode("utf-8")),
+            ContentType="application/json",
+            ContentEncoding="gzip",
+            CacheControl=PAGE_CACHE_CONTROL
+        )
+        paths.append(path)
+
+    current = read_pointer()
+    if is_newer(current, watermark):
+        logger.info("✅ Snapshot %s already superseded by %s.", version, current.get("version"))
+        return None
+
+    pointer = {
+        "version": version,
+        "watermark": list(watermark),
+        "changes": watermark[1],
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "page_size": SNAPSHOT_PAGE_SIZE,
+        "pages": paths,
+        "previous": current.get("version") if current else None
+    }
+    client.put_object(
+        Bucket=SNAPSHOT_BUCKET,
+        Key=pointer_key(),
+        Body=json.dumps(pointer, separators=(",", ":")).encode("utf-8"),
+        ContentType="application/json",
+        CacheControl=f"public, max-age={POINTER_MAX_AGE_SECONDS}"
+    )
+
+    stale = current.get("previous") if current else None
+    if stale and stale != version:
+        delete_version(stale)  # ✅ Versioned bucket: the lifecycle rule expires the noncurrent copies
+    logger.info("✅ Published snapshot %s (%d page(s)).", version, len(paths))
+    return version
@@ -0,0 +1,66 @@
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Prewarm on import only inside Lambda (or when forced), never in local test runs
+PREWARM_ON_IMPORT = os.getenv(
+    "COLD_START_PREWARM",
+    "true" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "false"
+).lower() == "true"
+PREWARM_TIMEOUT_SECONDS = float(os.getenv("COLD_START_PREWARM_TIMEOUT_SECONDS", "15"))
+
+# Background cold-start steps, keyed by name
+STEPS = {}
+STEPS_LOCK = threading.Lock()
+EXECUTOR = None
+
+
+def start_step(name, fn, *args):
+    """Runs a cold-start step in the background thread pool (once per container)."""
+    global EXECUTOR
+    with STEPS_LOCK:
+        if name in STEPS:
+            return STEPS[name]
+        if EXECUTOR is None:
+            EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cold-start")
+        STEPS[name] = EXECUTOR.submit(fn, *args)
+        return STEPS[name]
+
+
+def wait_step(name, timeout=None):
+    """Waits for a background step and returns its result.
+
+    Returns None if the step was never started or failed; the caller then
+    falls back to doing the work synchronously.
+    """
+    with STEPS_LOCK:
+        future = STEPS.get(name)
+    if future is None:
+        return None
+    try:
+        return future.result(timeout=timeout or PREWARM_TIMEOUT_SECONDS)
+    except Exception as e:
+        logger.error("❌ Cold-start step %s failed: %s", name, e)
+        return None
+
+
+def resolve_host(host, port=5432):
+    """Resolves the database host so the first connect skips the DNS lookup."""
+    if host:
+        socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+
+
+def is_warmup_event(event):
+    """Returns True for provisioned-concurrency / scheduled warm-up pings.
+
+    Accepts an explicit {"warmup": true} payload or an EventBridge scheduled event.
+    """
+    if not isinstance(event, dict):
+        return False
+    if event.get("warmup") is True:
+        return True
+    return event.get("source") == "aws.events" and event.get("detail-type") == "Scheduled Event"
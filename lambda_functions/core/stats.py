@@ -0,0 +1,69 @@
+import os
+import logging
+from datetime import date, timedelta
+from core.deadline import with_statement_timeout
+from core.metrics import timer
+
+logger = logging.getLogger(__name__)
+
+# Per-day task counts kept current by the triggers from migration 0007
+STATS_DEFAULT_DAYS = int(os.getenv("TASKS_STATS_DEFAULT_DAYS", "30"))
+STATS_MAX_DAYS = int(os.getenv("TASKS_STATS_MAX_DAYS", "366"))
+
+
+def parse_day(name, value):
+    """Parses a YYYY-MM-DD query parameter."""
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"❌ {name} must be a date (YYYY-MM-DD)")
+
+
+def parse_range(params, today=None):
+    """Returns the inclusive (first, last) day range from ?from= and ?to= (default: the last STATS_DEFAULT_DAYS)."""
+    last = parse_day("to", params.get("to")) or (today or date.today())
+    first = parse_day("from", params.get("from")) or last - timedelta(days=STATS_DEFAULT_DAYS - 1)
+    if first > last:
+        raise ValueError("❌ from must not be after to")
+    if (last - first).days + 1 > STATS_MAX_DAYS:
+        raise ValueError(f"❌ The range may span at most {STATS_MAX_DAYS} days")
+    return first, last
+
+
+def fetch_stats(conn, first, last, deadline=None):
+    """Reads the total and the per-day counts in [first, last]; cost grows with days, not rows."""
+    with timer("query"), conn.cursor() as cur:
+        cur.execute(with_statement_timeout("SELECT COALESCE(SUM(task_count), 0)::bigint FROM task_daily_counts", deadline))
+        total = cur.fetchone()[0]
+        cur.execute(
+            "SELECT day, SUM(task_count)::bigint FROM task_daily_counts "
+            "WHERE day BETWEEN %s AND %s GROUP BY day ORDER BY day",
+            (first, last)
+        )
+        counts = dict(cur.fetchall())
+    return total, counts
+
+
+def build_days(first, last, counts):
+    """Lists every day in [first, last] with its count (0 for days without tasks)."""
+    days = []
+    day = first
+    while day <= last:
+        days.append({"date": day.isoformat(), "count": counts.get(day, 0)})
+        day += timedelta(days=1)
+    return days
+
+
+def rebuild_daily_counts(conn, from_day=None, to_day=None):
+    """Recounts task_daily_counts for [from_day, to_day) from tasks (None = unbounded).
+
+    For backfills and repairs; inserts wait while it runs. Returns the number of days written.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT rebuild_task_daily_counts(%s, %s)", (from_day, to_day))
+        days = cur.fetchone()[0]
+    conn.commit()
+    logger.info("Rebuilt task counts for %d day(s) in [%s, %s).", days, from_day or "-inf", to_day or "inf")
+    return days
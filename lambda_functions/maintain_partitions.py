@@ -0,0 +1,44 @@
+"""Partition maintenance entry point for the monthly-partitioned tasks table.
+
+Runs daily from an EventBridge schedule (or by hand): creates the upcoming month
+partitions and archives partitions older than TASKS_RETENTION_MONTHS to S3.
+The logic lives in core.partitions.
+"""
+import json
+import sys
+import logging
+import sentry_sdk
+from core.partitions import maintain
+from migrate import connect
+
+logger = logging.getLogger(__name__)
+
+
+def run(dry_run=False):
+    """Runs maintenance on a dedicated (non-pooled) connection and returns the summary."""
+    conn = connect()
+    try:
+        return maintain(conn, dry_run=dry_run)
+    finally:
+        conn.close()
+
+
+def lambda_handler(event, context):
+    """Runs partition maintenance (invoked on a schedule, not by API Gateway)."""
+    try:
+        result = run(dry_run=bool((event or {}).get("dry_run")))
+        logger.info("Partition maintenance complete: %s", result)
+        return {"statusCode": 200, "body": json.dumps(result)}
+    except Exception as e:
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.exception("❌ Partition maintenance failed:")
+        raise  # ✅ Surface as FunctionError so the failed run is retried and alarmed on
+
+
+def main():
+    """CLI entry point: `python maintain_partitions.py [--dry-run]`."""
+    print(json.dumps(run(dry_run="--dry-run" in sys.argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import json
+import os
+import sys
+import logging
+import psycopg2
+import sentry_sdk
+from core.credentials import CredentialProvider
+from core.migrations import get_schema_version, latest_version, run_migrations
+
+# Database credentials from environment variables
+DB_HOST = os.getenv("DB_HOST")
+DB_NAME = os.getenv("DB_NAME")
+DB_SECRET_NAME = os.getenv("DB_SECRET_NAME")
+REGION = os.getenv("AWS_REGION")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+DB_SSLMODE = os.getenv("DB_SSLMODE", "require")
+
+# Configure logging
+logging.basicConfig()
+logger = logging.getLogger()
+logger.setLevel(LOG_LEVEL.upper())
+
+CREDENTIALS = CredentialProvider(DB_SECRET_NAME, REGION)
+
+
+def connect():
+    """Opens a dedicated (non-pooled) connection for the migration run."""
+    db_user, db_password = CREDENTIALS.get_credentials()
+    return psycopg2.connect(
+        host=DB_HOST,
+        dbname=DB_NAME,
+        user=db_user,
+        password=db_password,
+        connect_timeout=10,
+        sslmode=DB_SSLMODE
+    )
+
+
+def migrate():
+    """Applies pending migrations and returns a summary."""
+    conn = connect()
+    try:
+        applied = run_migrations(conn)
+        return {"applied": applied, "schema_version": get_schema_version(conn)}
+    finally:
+        conn.close()
+
+
+def lambda_handler(event, context):
+    """Runs schema migrations (invoked by the deploy pipeline, not by API Gateway)."""
+    try:
+        result = migrate()
+        logger.info("Migrations complete: %s", result)
+        return {"statusCode": 200, "body": json.dumps(result)}
+    except Exception as e:
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.exception("❌ Migration run failed:")
+        raise  # ✅ Surface as FunctionError so the pipeline step fails
+
+
+def main():
+    """CLI entry point: `python migrate.py [--status]`."""
+    if "--status" in sys.argv:
+        conn = connect()
+        try:
+            print(json.dumps({"schema_version": get_schema_version(conn), "latest": latest_version()}))
+        finally:
+            conn.close()
+        return
+    print(json.dumps(migrate()))
+
+
+if __name__ == "__main__":
+    main()
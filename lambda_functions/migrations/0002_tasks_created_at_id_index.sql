@@ -0,0 +1,3 @@
+-- Composite index backing keyset pagination in GET /tasks (ORDER BY created_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at_id
+    ON tasks (created_at DESC, id DESC);
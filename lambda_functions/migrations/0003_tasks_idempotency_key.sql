@@ -0,0 +1,5 @@
+-- Idempotency key for write-behind ingestion; redelivered queue messages hit the unique index
+-- and are skipped (ON CONFLICT DO NOTHING). Rows inserted synchronously leave it NULL.
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_idempotency_key
+    ON tasks (idempotency_key);
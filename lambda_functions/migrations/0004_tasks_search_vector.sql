@@ -0,0 +1,6 @@
+-- Full-text search for GET /tasks?q=...; Postgres keeps the generated column current on every insert/update.
+-- Adding a STORED generated column rewrites the table once, so apply it outside peak hours on large tables.
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', description)) STORED;
+CREATE INDEX IF NOT EXISTS idx_tasks_search_vector
+    ON tasks USING GIN (search_vector);
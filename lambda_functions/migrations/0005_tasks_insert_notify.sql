@@ -0,0 +1,13 @@
+-- Wakes GET /tasks?wait= long-polls: one NOTIFY per INSERT statement, delivered when the writer commits.
+-- A statement-level trigger covers single and batch POSTs and the write-behind consumer alike.
+CREATE OR REPLACE FUNCTION notify_tasks_inserted() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('tasks_inserted', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_inserted_notify ON tasks;
+CREATE TRIGGER tasks_inserted_notify
+    AFTER INSERT ON tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_tasks_inserted();
@@ -0,0 +1,60 @@
+-- Range-partitions tasks by month on created_at (tasks_pYYYY_MM). Reads with a time range prune to the
+-- matching partitions, and inserts, indexes and vacuum only touch the current month. Old months are
+-- archived to S3 and dropped whole by maintain_partitions.py instead of being deleted row by row.
+-- The table is copied once under an exclusive lock, so apply it outside peak hours on large tables.
+-- Every unique index must include created_at: the primary key becomes (id, created_at) (ids still come
+-- from tasks_id_seq) and idempotency keys are unique per (key, created_at). Write-behind messages carry
+-- their accepted_at, so a redelivered message still conflicts with the stored row.
+LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE;
+ALTER TABLE tasks RENAME TO tasks_unpartitioned;
+ALTER SEQUENCE tasks_id_seq OWNED BY NONE;
+
+CREATE TABLE tasks (
+    id INTEGER NOT NULL DEFAULT nextval('tasks_id_seq'),
+    description TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    idempotency_key TEXT,
+    search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', description)) STORED
+) PARTITION BY RANGE (created_at);
+
+-- Creates the partition for the month containing `month_of` unless it exists; returns its name.
+-- There is deliberately no DEFAULT partition: it would disable ordered scans of the partitions
+-- for ORDER BY created_at DESC, so maintain_partitions.py creates upcoming months ahead of time.
+CREATE OR REPLACE FUNCTION create_tasks_partition(month_of DATE) RETURNS TEXT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', month_of)::date;
+    partition_name TEXT := 'tasks_p' || to_char(month_start, 'YYYY_MM');
+BEGIN
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF tasks FOR VALUES FROM (%L) TO (%L)',
+                   partition_name, month_start, (month_start + INTERVAL '1 month')::date);
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- One partition per month from the oldest row through three months ahead
+SELECT create_tasks_partition(month_of::date)
+FROM generate_series(
+    date_trunc('month', LEAST((SELECT MIN(created_at) FROM tasks_unpartitioned), LOCALTIMESTAMP)),
+    date_trunc('month', LOCALTIMESTAMP) + INTERVAL '3 months',
+    INTERVAL '1 month'
+) AS month_of;
+
+INSERT INTO tasks (id, description, created_at, idempotency_key)
+SELECT id, description, COALESCE(created_at, LOCALTIMESTAMP), idempotency_key
+FROM tasks_unpartitioned;
+
+DROP TABLE tasks_unpartitioned;
+ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id;
+
+-- Indexes are built after the copy; an index on the parent is created on every partition
+ALTER TABLE tasks ADD CONSTRAINT tasks_pkey PRIMARY KEY (id, created_at);
+CREATE INDEX idx_tasks_created_at_id ON tasks (created_at DESC, id DESC);
+CREATE UNIQUE INDEX idx_tasks_idempotency_key ON tasks (idempotency_key, created_at);
+CREATE INDEX idx_tasks_search_vector ON tasks USING GIN (search_vector);
+
+-- Dropped with the old table (migration 0005)
+CREATE TRIGGER tasks_inserted_notify
+    AFTER INSERT ON tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_tasks_inserted();
+
+ANALYZE tasks;
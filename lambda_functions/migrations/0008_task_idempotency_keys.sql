@@ -0,0 +1,20 @@
+-- Global idempotency keys for write-behind ingestion. On the partitioned tasks table a unique index
+-- must include created_at, and a retried POST is enqueued with a fresh accepted_at, so
+-- (idempotency_key, created_at) never conflicts on a retry. The consumer claims each key here in the
+-- same statement as the insert and only inserts the tasks whose key it claimed.
+-- created_at is the claimed task's, so archiving a month also drops that month's keys.
+CREATE TABLE IF NOT EXISTS task_idempotency_keys (
+    idempotency_key TEXT PRIMARY KEY,
+    created_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_task_idempotency_keys_created_at ON task_idempotency_keys (created_at);
+
+INSERT INTO task_idempotency_keys (idempotency_key, created_at)
+SELECT DISTINCT ON (idempotency_key) idempotency_key, created_at
+FROM tasks
+WHERE idempotency_key IS NOT NULL
+ORDER BY idempotency_key, created_at
+ON CONFLICT (idempotency_key) DO NOTHING;
+
+-- Uniqueness now lives in task_idempotency_keys; the per-(key, created_at) index only cost writes
+DROP INDEX IF EXISTS idx_tasks_idempotency_key;
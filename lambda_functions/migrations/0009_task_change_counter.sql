@@ -0,0 +1,21 @@
+-- Monotonic change counter for the GET /tasks version probe (ETag and warm-container cache) and the
+-- CDN snapshot watermark. Every INSERT, UPDATE, DELETE or TRUNCATE statement on tasks adds 1, so the
+-- probe reads at most 8 rows however large the table, and unlike a row count the value never goes back
+-- after deletes. Slots picked by backend pid (as in task_daily_counts) keep writers off one hot row.
+CREATE TABLE IF NOT EXISTS task_change_counter (
+    slot SMALLINT PRIMARY KEY,
+    changes BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION count_task_changes() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO task_change_counter (slot, changes) VALUES (pg_backend_pid() % 8, 1)
+    ON CONFLICT (slot) DO UPDATE SET changes = task_change_counter.changes + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_count_changes ON tasks;
+CREATE TRIGGER tasks_count_changes
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION count_task_changes();
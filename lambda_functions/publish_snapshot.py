@@ -0,0 +1,9 @@
+"""SQS consumer entry point for the pre-rendered task snapshot.
+
+The handler lives in core.routes.publish_snapshot; it renders the first pages of
+GET /tasks to S3 after writes queue a (debounced) render request.
+"""
+from core.monitoring import bootstrap
+from core.routes.publish_snapshot import handle as lambda_handler  # noqa: F401
+
+bootstrap()
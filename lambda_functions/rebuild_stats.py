@@ -0,0 +1,49 @@
+"""Rebuild entry point for the per-day task counts behind GET /tasks/stats.
+
+The triggers from migration 0007 keep task_daily_counts current; run this after
+bulk loads that bypassed them or to repair a range. Days are UTC and `until` is exclusive.
+"""
+import argparse
+import json
+import logging
+import sentry_sdk
+from core.stats import parse_day, rebuild_daily_counts
+from migrate import connect
+
+logger = logging.getLogger(__name__)
+
+
+def run(from_day=None, to_day=None):
+    """Rebuilds [from_day, to_day) on a dedicated (non-pooled) connection and returns a summary."""
+    conn = connect()
+    try:
+        days = rebuild_daily_counts(conn, from_day, to_day)
+    finally:
+        conn.close()
+    return {"days": days, "since": from_day and from_day.isoformat(), "until": to_day and to_day.isoformat()}
+
+
+def lambda_handler(event, context):
+    """Rebuilds task counts for {"since": "YYYY-MM-DD", "until": "YYYY-MM-DD"} (both optional)."""
+    event = event or {}
+    try:
+        result = run(parse_day("since", event.get("since")), parse_day("until", event.get("until")))
+        logger.info("Task stats rebuild complete: %s", result)
+        return {"statusCode": 200, "body": json.dumps(result)}
+    except Exception as e:
+        sentry_sdk.capture_exception(e)  # ✅ Send error to Sentry
+        logger.exception("❌ Task stats rebuild failed:")
+        raise  # ✅ Surface as FunctionError
+
+
+def main():
+    """CLI entry point: `python rebuild_stats.py [--since YYYY-MM-DD] [--until YYYY-MM-DD]`."""
+    parser = argparse.ArgumentParser(description="Rebuild the per-day task counts")
+    parser.add_argument("--since", help="First day to recount (default: the oldest task)")
+    parser.add_argument("--until", help="Day after the last one to recount (default: no end)")
+    args = parser.parse_args()
+    print(json.dumps(run(parse_day("since", args.since), parse_day("until", args.until))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import logging
+from core.deadline import Deadline
+from core.logs import log_invocation
+from core.monitoring import bootstrap
+from core.responses import build_response, generate_response
+from core.routes import get_route_key, get_stats, get_tasks, post_task
+from core.routes.warmup import handle_warmup
+from core.startup import is_warmup_event
+
+logger = logging.getLogger(__name__)
+
+# API Gateway v2 route key -> per-route handler, all sharing one DB_POOL
+ROUTES = {
+    "GET /tasks": get_tasks.handle,
+    "POST /tasks": post_task.handle,
+    "GET /tasks/stats": get_stats.handle,
+}
+
+@log_invocation
+def lambda_handler(event, context):
+    """Single entry point for GET /tasks, POST /tasks, GET /tasks/stats and OPTIONS /tasks."""
+    if is_warmup_event(event):
+        return handle_warmup(Deadline.from_context(context))
+
+    route_key = get_route_key(event)
+    handler = ROUTES.get(route_key)
+    if handler:
+        return handler(event, context)
+
+    if route_key.startswith("OPTIONS "):
+        return build_response(204, "")  # ✅ CORS preflight answered without touching the database
+
+    logger.warning("⚠️ No route for %s", route_key)
+    return generate_response(404, {"error": "Not Found."})
+
+bootstrap()
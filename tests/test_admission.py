@@ -0,0 +1,173 @@
+import sys
+import json
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+
+# ✅ Set environment variables BEFORE importing the handlers
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+import core.db
+from core.admission import AdaptiveLimiter, Overloaded
+from core.metrics import instrument
+from lambda_functions.get_tasks import lambda_handler as get_handler
+from lambda_functions.post_task import lambda_handler as post_handler
+
+
+def run_call(limiter, clock, latency_ms, ok=True):
+    """Admits and releases one call that took `latency_ms` on the patched clock."""
+    started = limiter.acquire()
+    clock.return_value += latency_ms / 1000
+    limiter.release(started, ok=ok)
+
+
+# ✅ Test AIMD Limit Adaptation
+@patch("core.admission.time.monotonic", return_value=100.0)
+def test_limit_backs_off_on_errors_and_recovers(mock_clock):
+    """Test errors halve the limit down to the floor and healthy calls raise it again."""
+
+    limiter = AdaptiveLimiter(max_limit=4, min_limit=0.1, increase=0.5, backoff=0.5, min_target_ms=100)
+
+    for _ in range(3):
+        run_call(limiter, mock_clock, 20, ok=False)
+    assert limiter.limit == 0.5
+    assert limiter.snapshot()["error_rate"] == 1.0
+
+    with patch("core.admission.random.random", return_value=0.0):  # ✅ Admit while the limit is below 1
+        for _ in range(10):
+            run_call(limiter, mock_clock, 20)
+    assert limiter.limit == 4  # ✅ Capped at max_limit
+    assert limiter.inflight == 0
+
+
+@patch("core.admission.time.monotonic", return_value=100.0)
+def test_slow_calls_count_as_congestion(mock_clock):
+    """Test calls slower than tolerance x the healthy average shrink the limit unless excluded."""
+
+    limiter = AdaptiveLimiter(max_limit=4, increase=0.5, backoff=0.5, tolerance=2, min_target_ms=50)
+    run_call(limiter, mock_clock, 40)  # ✅ Sets the 40 ms baseline
+    assert limiter.target_ms() == pytest.approx(80)
+
+    run_call(limiter, mock_clock, 500)
+    assert limiter.limit == 2
+    assert limiter.stats["slow"] == 1
+
+    started = limiter.acquire()
+    mock_clock.return_value += 20  # ✅ A 20 s long-poll
+    limiter.release(started, sample_latency=False)
+    assert limiter.limit == 2
+
+
+# ✅ Test Fast Rejection
+def test_rejects_with_status_and_retry_after():
+    """Test full slots answer 429 and a limit below 1 sheds a share of requests with 503."""
+
+    limiter = AdaptiveLimiter(max_limit=1)
+    limiter.acquire()
+    with pytest.raises(Overloaded) as excinfo:
+        limiter.acquire()
+    assert (excinfo.value.status_code, excinfo.value.retry_after) == (429, 1)
+
+    limiter = AdaptiveLimiter(max_limit=0.25)
+    with patch("core.admission.random.random", return_value=0.5), pytest.raises(Overloaded) as excinfo:
+        limiter.acquire()
+    assert (excinfo.value.status_code, excinfo.value.retry_after) == (503, 4)
+    with patch("core.admission.random.random", return_value=0.1):
+        limiter.acquire()  # ✅ The admitted share keeps probing the database
+    assert limiter.stats == {"admitted": 1, "rejected": 1, "errors": 0, "slow": 0}
+
+
+# ✅ Test Pool Integration
+@patch("core.db.acquire_db_connection")
+def test_checkout_holds_a_permit_until_returned(mock_acquire):
+    """Test a checkout is admitted, released on return, and a failed checkout counts as an error."""
+
+    limiter = AdaptiveLimiter(max_limit=2)
+    conn = MagicMock()
+    mock_acquire.return_value = conn
+    with patch.object(core.db, "LIMITER", limiter), patch.object(core.db, "DB_POOL", None):
+        assert core.db.get_db_connection() is conn
+        assert limiter.inflight == 1
+        core.db.return_db_connection(conn)
+        assert limiter.inflight == 0
+
+        mock_acquire.side_effect = Exception("❌ Unable to establish a database connection after retries.")
+        with pytest.raises(Exception):
+            core.db.get_db_connection()
+    assert limiter.inflight == 0
+    assert limiter.stats["errors"] == 1
+    assert limiter.limit < 2
+
+
+@patch("core.routes.get_tasks.get_tasks_version")
+@patch("core.db.acquire_db_connection")
+def test_failed_query_backs_the_limit_off(mock_acquire, mock_version):
+    """Test a query that fails after checkout is released as an error, not as a healthy call."""
+
+    limiter = AdaptiveLimiter(max_limit=2)
+    conn = MagicMock()
+    mock_acquire.return_value = conn
+    with patch.object(core.db, "LIMITER", limiter), patch.object(core.db, "DB_POOL", None):
+        mock_version.side_effect = core.db.psycopg2.OperationalError("terminating connection")
+        assert get_handler({"queryStringParameters": {"limit": "10"}}, {})["statusCode"] == 500
+
+        mock_version.side_effect = core.db.psycopg2.errors.QueryCanceled("canceling statement due to statement timeout")
+        assert get_handler({"queryStringParameters": {"limit": "10"}}, {})["statusCode"] == 503
+
+    assert limiter.inflight == 0
+    assert limiter.stats["errors"] == 2
+    assert limiter.limit == pytest.approx(0.5)
+    assert not core.db.ADMITTED
+
+
+@patch("core.routes.get_tasks.get_db_connection", side_effect=Overloaded(503, 4))
+def test_get_sheds_with_retry_after(mock_get_db):
+    """Test GET /tasks answers a rejected checkout with 503 and Retry-After."""
+
+    response = get_handler({"queryStringParameters": {"limit": "10"}}, {})
+
+    assert response["statusCode"] == 503
+    assert response["headers"]["Retry-After"] == "4"
+    assert "Retry-After" in response["headers"]["Access-Control-Expose-Headers"]
+    assert json.loads(response["body"]) == {"error": "Service overloaded."}
+
+
+@patch("core.routes.post_task.get_db_connection", side_effect=Overloaded(429, 1))
+def test_post_sheds_with_retry_after(mock_get_db):
+    """Test POST /tasks answers a rejected checkout with 429 and Retry-After."""
+
+    response = post_handler({"body": json.dumps({"description": "Later"})}, {})
+
+    assert response["statusCode"] == 429
+    assert response["headers"]["Retry-After"] == "1"
+
+
+# ✅ Test Admission Metrics
+def test_limit_and_rejections_are_emitted(capsys):
+    """Test the EMF line carries the current limit and the rejection count."""
+
+    limiter = AdaptiveLimiter(max_limit=1)
+
+    @instrument("GET /tasks")
+    def handler(event, context):
+        limiter.acquire()
+        with pytest.raises(Overloaded):
+            limiter.acquire()
+
+    with patch("core.metrics.METRICS_ENABLED", True):
+        handler({}, {})
+
+    emf = [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith('{"_aws"')][-1]
+    metrics = {metric["Name"]: metric["Unit"] for metric in emf["_aws"]["CloudWatchMetrics"][0]["Metrics"]}
+    assert metrics["admission_limit"] == "None"
+    assert metrics["admission_rejected"] == "Count"
+    assert emf["admission_limit"] == 1
+    assert emf["admission_rejected"] == 1
@@ -0,0 +1,67 @@
+import sys
+import json
+from unittest.mock import patch
+
+# ✅ Ensure Python can find the `benchmarks` scripts
+sys.path.append("./benchmarks")
+
+import compare
+import compression
+import handlers
+
+
+def make_report(p95_ms, alloc_peak_kb=100.0):
+    """Builds a one-entry benchmark report."""
+    return {"results": [{"scenario": "get_all", "size": 1000, "mode": "warm",
+                         "p95_ms": p95_ms, "alloc_peak_kb": alloc_peak_kb}]}
+
+
+# ✅ Test Baseline Comparison
+def test_find_regressions_respects_threshold_and_floor():
+    """Test only growth past both the relative threshold and the absolute floor is flagged."""
+
+    baseline = make_report(10.0)
+    assert compare.find_regressions(baseline, make_report(11.5), 0.2) == []
+    assert compare.find_regressions(make_report(1.0), make_report(1.9), 0.2) == []  # ✅ Under the 1 ms floor
+
+    [regression] = compare.find_regressions(baseline, make_report(13.0), 0.2)
+    assert "get_all size=1000 warm: p95_ms 10.0 -> 13.0" in regression
+    assert len(compare.find_regressions(baseline, make_report(10.0, alloc_peak_kb=400.0), 0.2)) == 1
+
+
+def test_compare_passes_without_baseline_or_database(tmp_path):
+    """Test a missing baseline or a skipped run does not fail CI."""
+
+    current = tmp_path / "current.json"
+    current.write_text(json.dumps({"skipped": "PostgreSQL not reachable"}))
+    baseline = tmp_path / "baseline.json"
+
+    with patch.object(sys, "argv", ["compare.py", str(baseline), str(current)]):
+        assert compare.main() == 0
+    baseline.write_text(json.dumps(make_report(10.0)))
+    with patch.object(sys, "argv", ["compare.py", str(baseline), str(current)]):
+        assert compare.main() == 0
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles."""
+
+    samples = list(range(1, 101))
+    assert handlers.percentile(samples, 50) == 50
+    assert handlers.percentile(samples, 95) == 95
+    assert handlers.percentile(samples, 99) == 99
+    assert handlers.percentile([7.0], 99) == 7.0
+
+
+# ✅ Test Compression Benchmark
+def test_compression_benchmark_reports_each_level():
+    """Test every format and gzip level is measured with consistent byte counts."""
+
+    sys.path.insert(0, compression.LAMBDA_DIR)
+    results = compression.run([50], iterations=2)
+    gzip_results = [r for r in results if r["coding"] == "gzip"]
+
+    assert len(gzip_results) == len(compression.FORMATS) * len(compression.GZIP_LEVELS)
+    for result in gzip_results:
+        assert result["compressed_bytes"] < result["raw_bytes"]
+        assert result["sent_bytes"] >= result["compressed_bytes"]
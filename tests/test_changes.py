@@ -0,0 +1,124 @@
+import sys
+import json
+import os
+import pytest
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+# ✅ Set environment variables BEFORE importing the handlers
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+from core.changes import advance_watermark, decode_watermark, encode_watermark
+from lambda_functions.get_tasks import lambda_handler
+
+
+def row(task_id):
+    """Builds an (id, description, created_at) task row."""
+    return (task_id, f"Task {task_id}", datetime(2025, 2, 4, 12, 0, task_id % 60))
+
+
+def make_conn(*results):
+    """Builds a mock connection whose successive fetchall calls return `results`."""
+    conn = MagicMock()
+    conn.notifies = []
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.side_effect = list(results)
+    return conn, cur
+
+
+# ✅ Test Watermark Gap Tracking
+def test_advance_watermark_tracks_and_expires_gaps():
+    """Test skipped ids are re-checked until delivered or past the gap TTL."""
+
+    last_id, gaps = advance_watermark(10, {}, [row(11), row(13), row(14)], now=1000)
+    assert last_id == 14
+    assert gaps == {12: 1000}
+
+    # ✅ The late commit of id 12 is delivered once and leaves the gap list
+    assert advance_watermark(last_id, gaps, [row(12)], now=1010) == (14, {})
+    # ✅ A rolled-back id stops being re-checked after the TTL
+    assert advance_watermark(last_id, gaps, [], now=1000 + 3600) == (14, {})
+
+    assert decode_watermark(encode_watermark(14, {12: 1000})) == (14, {12: 1000})
+    with pytest.raises(ValueError):
+        decode_watermark("not-a-watermark")
+
+
+# ✅ Test Delta Sync
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_delta_sync_returns_newer_rows_and_watermark(mock_return_db, mock_get_db):
+    """Test since_id returns rows in id order with a watermark that re-checks gaps."""
+
+    conn, cur = make_conn([row(6), row(8), row(9)], [row(7)])
+    mock_get_db.return_value = conn
+
+    first = lambda_handler({"queryStringParameters": {"since_id": "5", "limit": "2"}}, {})
+    body = json.loads(first["body"])
+    assert [task["id"] for task in body["tasks"]] == [6, 8]
+    assert body["has_more"] is True
+    query, params = cur.execute.call_args[0]
+    assert "WHERE id > %s OR id = ANY(%s::int[]) ORDER BY id LIMIT %s" in query
+    assert params == [5, [], 3]
+    assert mock_get_db.call_args[1]["replica"] is True
+
+    second = lambda_handler({"queryStringParameters": {"watermark": body["watermark"]}}, {})
+    assert [task["id"] for task in json.loads(second["body"])["tasks"]] == [7]
+    assert cur.execute.call_args[0][1][:2] == [8, [7]]  # ✅ Skipped id 7 is re-checked
+
+
+def test_delta_sync_rejects_invalid_parameters():
+    """Test malformed positions and incompatible parameters return 400."""
+
+    for params in ({"since_id": "abc"}, {"since_id": "-1"}, {"watermark": "bogus"},
+                   {"since_id": "1", "cursor": "x"}, {"since_id": "1", "wait": "soon"}):
+        assert lambda_handler({"queryStringParameters": params}, {})["statusCode"] == 400
+
+
+# ✅ Test Long-Poll Wake-Up
+@patch("core.changes.select.select")
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_long_poll_wakes_on_notify(mock_return_db, mock_get_db, mock_select):
+    """Test an empty poll waits on LISTEN, re-queries on NOTIFY and UNLISTENs before release."""
+
+    conn, cur = make_conn([], [row(3)])
+    conn.poll.side_effect = lambda: conn.notifies.append(MagicMock(channel="tasks_inserted"))
+    mock_get_db.return_value = conn
+    mock_select.return_value = ([conn], [], [])
+
+    response = lambda_handler({"queryStringParameters": {"since_id": "2", "wait": "10"}}, {})
+
+    assert [task["id"] for task in json.loads(response["body"])["tasks"]] == [3]
+    statements = [call[0][0] for call in cur.execute.call_args_list]
+    assert statements[0] == "LISTEN tasks_inserted"
+    assert statements[-1] == "UNLISTEN *"
+    assert mock_get_db.call_args[1]["replica"] is False  # ✅ LISTEN needs the primary
+    assert 0 < mock_select.call_args[0][3] <= 10
+    assert conn.notifies == []
+    mock_return_db.assert_called_once_with(conn)
+
+
+@patch("core.changes.select.select", return_value=([], [], []))
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_long_poll_times_out_empty(mock_return_db, mock_get_db, mock_select):
+    """Test a poll with no inserts returns an empty page and the unchanged position."""
+
+    conn, cur = make_conn([])
+    mock_get_db.return_value = conn
+
+    response = lambda_handler({"queryStringParameters": {"since_id": "4", "wait": "0.01"}}, {})
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert body["tasks"] == []
+    assert decode_watermark(body["watermark"]) == (4, {})
@@ -0,0 +1,101 @@
+import sys
+import base64
+import gzip
+import json
+import os
+import pytest
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+# ✅ Set environment variables BEFORE importing the handlers
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+import core.compression
+from core.compression import compress_response, negotiate_encoding
+from core.responses import build_response
+from lambda_functions.get_tasks import lambda_handler
+
+LARGE_BODY = json.dumps([{"id": i, "description": f"Task {i}"} for i in range(200)])
+
+
+# ✅ Test Accept-Encoding Negotiation
+def test_negotiate_encoding():
+    """Test q-values, wildcards and the br-over-gzip preference."""
+
+    with patch.object(core.compression, "brotli", None):
+        assert negotiate_encoding("gzip, deflate, br") == "gzip"
+        assert negotiate_encoding("br") is None
+    with patch.object(core.compression, "brotli", MagicMock()):
+        assert negotiate_encoding("gzip, deflate, br") == "br"
+        assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+        assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0") is None
+
+
+# ✅ Test Response Compression
+def test_compress_response_threshold_and_headers():
+    """Test large bodies are gzip'd to base64 with weak ETags and small ones only gain Vary."""
+
+    small = compress_response(build_response(200, '{"ok": true}', {"ETag": '"abc"'}), "gzip")
+    assert small["body"] == '{"ok": true}'
+    assert "isBase64Encoded" not in small
+    assert small["headers"]["Vary"] == "Accept-Encoding"
+
+    large = compress_response(build_response(200, LARGE_BODY, {"ETag": '"abc"', "Vary": "Accept"}), "gzip")
+    assert large["isBase64Encoded"] is True
+    assert large["headers"]["Content-Encoding"] == "gzip"
+    assert large["headers"]["Vary"] == "Accept, Accept-Encoding"
+    assert large["headers"]["ETag"] == 'W/"abc"'
+    raw = gzip.decompress(base64.b64decode(large["body"]))
+    assert raw.decode("utf-8") == LARGE_BODY
+    assert len(large["body"]) < len(LARGE_BODY)
+
+
+def test_compress_binary_body():
+    """Test an already base64-encoded (binary) body is compressed from its decoded bytes."""
+
+    payload = bytes(range(256)) * 8
+    response = compress_response(build_response(200, payload, content_type="application/msgpack"), "gzip")
+    assert gzip.decompress(base64.b64decode(response["body"])) == payload
+
+
+def test_brotli_compression():
+    """Test br output round-trips when brotli is installed."""
+
+    brotli = pytest.importorskip("brotli")
+    response = compress_response(build_response(200, LARGE_BODY), "br, gzip")
+    assert response["headers"]["Content-Encoding"] == "br"
+    assert brotli.decompress(base64.b64decode(response["body"])).decode("utf-8") == LARGE_BODY
+
+
+# ✅ Test GET /tasks Compression and Revalidation
+@patch("core.routes.get_tasks.get_tasks_version", return_value=(21, 300))
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_get_tasks_gzip_and_304(mock_return_db, mock_get_db, mock_version):
+    """Test a large GET is gzip'd and its weak ETag still revalidates to 304."""
+
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [(i, f"Task {i}", datetime(2025, 2, 4, 12, 0, 0)) for i in range(300, 0, -1)]
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_get_db.return_value = mock_conn
+    event = {"queryStringParameters": {"limit": "300"}, "headers": {"Accept-Encoding": "gzip, deflate"}}
+
+    response = lambda_handler(event, {})
+    body = json.loads(gzip.decompress(base64.b64decode(response["body"])))
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert len(body["tasks"]) == 300
+
+    revalidated = lambda_handler({**event, "headers": {**event["headers"], "If-None-Match": response["headers"]["ETag"]}}, {})
+    assert revalidated["statusCode"] == 304
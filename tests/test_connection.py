@@ -0,0 +1,103 @@
+import sys
+import psycopg2
+import psycopg2.extensions
+from unittest.mock import patch, MagicMock
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+from core.connection import ConnectionHealth
+
+
+def make_conn(closed=0, status=psycopg2.extensions.TRANSACTION_STATUS_IDLE):
+    """Builds a mock psycopg2 connection."""
+    conn = MagicMock()
+    conn.closed = closed
+    conn.get_transaction_status.return_value = status
+    return conn
+
+
+def make_pool(*conns):
+    """Builds a mock pool handing out `conns` in order."""
+    pool = MagicMock()
+    pool.maxconn = 10
+    pool.getconn.side_effect = list(conns)
+    return pool
+
+
+# ✅ Test No Probe for Recently Used Connections
+def test_checkout_skips_probe_when_recently_used():
+    """Test a connection used within the idle threshold is returned without SELECT 1."""
+
+    conn = make_conn()
+    health = ConnectionHealth(idle_probe_seconds=30)
+    pool = make_pool(conn, conn)
+
+    health.checkin(pool, health.checkout(pool))
+    assert health.checkout(pool) is conn
+
+    conn.cursor.assert_not_called()
+    assert health.snapshot()["probes"] == 0
+    assert health.snapshot()["checkouts"] == 2
+
+
+# ✅ Test Probe After Idle Threshold
+@patch("core.connection.time.monotonic")
+def test_checkout_probes_idle_connection(mock_monotonic):
+    """Test a connection idle past the threshold is probed once before use."""
+
+    conn = make_conn()
+    health = ConnectionHealth(idle_probe_seconds=30, max_age_seconds=900)
+    pool = make_pool(conn, conn)
+
+    mock_monotonic.return_value = 100.0
+    health.checkin(pool, health.checkout(pool))
+    mock_monotonic.return_value = 200.0
+
+    assert health.checkout(pool) is conn
+    conn.cursor.return_value.__enter__.return_value.execute.assert_called_once_with("SELECT 1")
+    assert health.snapshot()["probes"] == 1
+
+
+@patch("core.connection.time.monotonic")
+def test_checkout_recycles_old_and_discards_broken(mock_monotonic):
+    """Test aged connections are recycled and broken ones are closed without probing."""
+
+    old = make_conn()
+    broken = make_conn(status=psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN)
+    fresh = make_conn()
+    health = ConnectionHealth(idle_probe_seconds=30, max_age_seconds=900)
+
+    mock_monotonic.return_value = 0.0
+    pool = make_pool(old)
+    health.checkin(pool, health.checkout(pool))
+
+    mock_monotonic.return_value = 1000.0
+    pool = make_pool(old, broken, fresh)
+    assert health.checkout(pool) is fresh
+
+    pool.putconn.assert_any_call(old, close=True)
+    pool.putconn.assert_any_call(broken, close=True)
+    stats = health.snapshot()
+    assert stats["recycles"] == 1
+    assert stats["discards"] == 1
+    assert stats["probes"] == 0
+
+
+@patch("core.connection.time.monotonic")
+def test_checkout_discards_connection_failing_probe(mock_monotonic):
+    """Test an idle connection that fails its probe is replaced."""
+
+    dead = make_conn()
+    dead.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError("server closed")
+    fresh = make_conn()
+    health = ConnectionHealth(idle_probe_seconds=30)
+
+    mock_monotonic.return_value = 0.0
+    pool = make_pool(dead)
+    health.checkin(pool, health.checkout(pool))
+
+    mock_monotonic.return_value = 60.0
+    pool = make_pool(dead, fresh)
+    assert health.checkout(pool) is fresh
+    pool.putconn.assert_called_once_with(dead, close=True)
@@ -0,0 +1,80 @@
+import sys
+import json
+import boto3
+import psycopg2
+from moto import mock_aws
+from unittest.mock import patch, MagicMock
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+from core.credentials import CredentialProvider, is_auth_error
+
+
+def create_secret(client, username, password):
+    """Creates or rotates the mock secret."""
+    secret_value = json.dumps({"username": username, "password": password})
+    try:
+        client.put_secret_value(SecretId="mock-db-secret", SecretString=secret_value)
+    except client.exceptions.ResourceNotFoundException:
+        client.create_secret(Name="mock-db-secret", SecretString=secret_value)
+
+
+# ✅ Test TTL Cache and Client Reuse
+@mock_aws
+def test_credentials_cached_until_ttl():
+    """Test credentials are fetched once and reused until the TTL expires."""
+
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    create_secret(client, "test_user", "test_pass")
+    provider = CredentialProvider("mock-db-secret", "us-east-1", ttl_seconds=60)
+
+    with patch.object(provider, "_fetch", wraps=provider._fetch) as mock_fetch:
+        assert provider.get_credentials() == ("test_user", "test_pass")
+        assert provider.get_credentials() == ("test_user", "test_pass")
+        assert mock_fetch.call_count == 1
+
+        # ✅ Expired entry triggers one new fetch through the same client
+        first_client = provider._client
+        provider._expires_at = 0
+        provider.get_credentials()
+        assert mock_fetch.call_count == 2
+        assert provider._client is first_client
+
+
+# ✅ Test Rotation Refresh
+@mock_aws
+def test_refresh_after_rotation_fetches_once():
+    """Test a rejected password is refreshed once and concurrent callers reuse the result."""
+
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    create_secret(client, "test_user", "old_pass")
+    provider = CredentialProvider("mock-db-secret", "us-east-1", min_refresh_interval=0)
+    old = provider.get_credentials()
+
+    create_secret(client, "test_user", "new_pass")
+
+    with patch.object(provider, "_fetch", wraps=provider._fetch) as mock_fetch:
+        assert provider.refresh(old) == ("test_user", "new_pass")
+        # ✅ A second caller still holding the old password does not refetch
+        assert provider.refresh(old) == ("test_user", "new_pass")
+        assert mock_fetch.call_count == 1
+
+
+def test_refresh_rate_limited():
+    """Test credentials fetched moments ago are not fetched again on rejection."""
+
+    provider = CredentialProvider("mock-db-secret", "us-east-1", min_refresh_interval=30)
+    provider._fetch = MagicMock(return_value=("test_user", "test_pass"))
+
+    credentials = provider.get_credentials()
+    provider.refresh(credentials)
+
+    provider._fetch.assert_called_once()
+
+
+def test_is_auth_error():
+    """Test password rejections are told apart from other connection errors."""
+
+    assert is_auth_error(psycopg2.OperationalError('FATAL:  password authentication failed for user "app"'))
+    assert not is_auth_error(psycopg2.OperationalError("could not connect to server: Connection refused"))
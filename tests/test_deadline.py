@@ -0,0 +1,68 @@
+import sys
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+
+# ✅ Set environment variables BEFORE importing the handlers
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+from core.deadline import Deadline, DeadlineExceeded, with_statement_timeout
+
+
+def make_context(remaining_ms):
+    """Builds a fake Lambda context."""
+    context = MagicMock()
+    context.get_remaining_time_in_millis.return_value = remaining_ms
+    return context
+
+
+def test_deadline_from_context_keeps_reserve():
+    """Test the budget comes from the Lambda context minus the response reserve."""
+
+    deadline = Deadline.from_context(make_context(10000))
+
+    assert 9000 < deadline.remaining_ms() <= 9500
+    assert with_statement_timeout("SELECT 1", deadline).startswith("SET LOCAL statement_timeout = ")
+    assert with_statement_timeout("SELECT 1", None) == "SELECT 1"
+
+
+def test_deadline_exhausted_fails_fast():
+    """Test a spent budget refuses to start queries."""
+
+    deadline = Deadline.from_context(make_context(400))
+
+    with pytest.raises(DeadlineExceeded):
+        deadline.check()
+    with pytest.raises(DeadlineExceeded):
+        deadline.statement_timeout_ms()
+
+
+@patch("core.deadline.time.sleep")
+def test_backoff_capped_by_remaining_budget(mock_sleep):
+    """Test jittered backoff never sleeps past the deadline."""
+
+    deadline = Deadline(1500)
+
+    deadline.backoff(attempt=10, base_delay=2)
+
+    assert mock_sleep.call_args[0][0] <= 1.0
+
+
+def test_handler_returns_503_when_budget_spent():
+    """Test the GET handler answers 503 instead of waiting for the runtime timeout."""
+
+    from lambda_functions.get_tasks import lambda_handler
+
+    with patch("core.db.initialize_db_pool") as mock_init:
+        response = lambda_handler({}, make_context(100))
+
+    assert response["statusCode"] == 503
+    mock_init.assert_not_called()
@@ -0,0 +1,58 @@
+import sys
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+import core.encoders
+from core.encoders import (
+    COLUMNAR_JSON, JSON, NDJSON, NotAcceptable, encode_rows, negotiate, parse_accept
+)
+
+ROWS = [
+    (2, "Second", datetime(2025, 2, 4, 12, 30, 0)),
+    (1, "First", None)
+]
+
+
+# ✅ Test Accept Negotiation
+def test_negotiate_defaults_and_quality():
+    """Test missing or wildcard Accept picks JSON and quality values rank explicit types."""
+
+    assert negotiate(None) == JSON
+    assert negotiate("text/html,application/xhtml+xml,*/*;q=0.8") == JSON
+    assert negotiate("*/*, application/x-ndjson") == NDJSON  # ✅ Explicit beats wildcard at equal q
+    assert negotiate(f"{NDJSON};q=0.4, {COLUMNAR_JSON};q=0.9") == COLUMNAR_JSON
+    assert parse_accept("application/json;q=bad") == [(JSON, 0.0)]
+
+    with pytest.raises(NotAcceptable):
+        negotiate("text/csv, application/json;q=0")
+
+
+# ✅ Test Encoders Match Across orjson and the Standard Library
+@pytest.mark.parametrize("fast", [True, False])
+def test_encoders_with_and_without_orjson(fast):
+    """Test the columnar and NDJSON bodies are identical with and without orjson."""
+
+    if fast:
+        pytest.importorskip("orjson")
+    with patch.object(core.encoders, "orjson", core.encoders.orjson if fast else None):
+        columnar, _ = encode_rows(COLUMNAR_JSON, ROWS, paginated=True, next_cursor="abc")
+        ndjson, headers = encode_rows(NDJSON, ROWS, paginated=True, next_cursor="abc")
+        empty, _ = encode_rows(COLUMNAR_JSON, [])
+
+    assert json.loads(columnar) == {
+        "id": [2, 1],
+        "description": ["Second", "First"],
+        "created_at": ["2025-02-04T12:30:00", None],
+        "next_cursor": "abc"
+    }
+    assert ndjson == (
+        '{"id":2,"description":"Second","created_at":"2025-02-04T12:30:00"}\n'
+        '{"id":1,"description":"First","created_at":null}\n'
+    )
+    assert headers == {"X-Next-Cursor": "abc"}
+    assert json.loads(empty) == {"id": [], "description": [], "created_at": []}
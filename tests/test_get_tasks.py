@@ -1,4 +1,5 @@
 import sys
+import base64
 import json
 import os
 import pytest
@@ -18,8 +19,13 @@ os.environ["SENTRY_DSN"] = ""
 # ✅ Ensure Python can find the `lambda_functions` module
 sys.path.append("./lambda_functions")
 
-# ✅ Now import get_tasks.py
-from lambda_functions.get_tasks import get_db_credentials, initialize_db_pool, lambda_handler, generate_response
+# ✅ Now import get_tasks.py (a shim over core.routes.get_tasks) and the shared core modules
+from lambda_functions.get_tasks import lambda_handler
+from core.db import get_db_credentials, initialize_db_pool
+from core.responses import generate_response
+from core.routes.get_tasks import encode_cursor, decode_cursor, build_tasks_query, get_tasks_version, stream_tasks
+from core.routes.get_tasks import build_search_query, encode_search_cursor, decode_search_cursor
+import io
 
 # ✅ Set Environment Variables for Testing
 @pytest.fixture(autouse=True)
@@ -58,8 +64,8 @@ def test_get_db_credentials():
     assert password == "test_pass"
 
 # ✅ Mock Database Connection
-@patch("lambda_functions.get_tasks.psycopg2.pool.SimpleConnectionPool")
-@patch("lambda_functions.get_tasks.get_db_credentials", return_value=("test_user", "test_pass"))
+@patch("core.db.psycopg2.pool.SimpleConnectionPool")
+@patch("core.db.get_db_credentials", return_value=("test_user", "test_pass"))
 def test_initialize_db_pool(mock_get_db_credentials, mock_conn_pool):
     """Test database connection pool initialization."""
 
@@ -86,8 +92,8 @@ def test_initialize_db_pool(mock_get_db_credentials, mock_conn_pool):
 
 
 # ✅ Test Lambda Handler with a Mocked Database Response
-@patch("lambda_functions.get_tasks.get_db_connection")
-@patch("lambda_functions.get_tasks.return_db_connection")
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
 @patch("sentry_sdk.init")  # ✅ Mock Sentry to avoid log issues
 def test_lambda_handler(mock_sentry, mock_return_db, mock_get_db):
     """Test Lambda handler logic with Sentry mocked."""
@@ -115,6 +121,303 @@ def test_lambda_handler(mock_sentry, mock_return_db, mock_get_db):
     assert response["statusCode"] == 200
     assert response["body"] == expected_body
     
+# ✅ Test Keyset Pagination
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_lambda_handler_paginated(mock_return_db, mock_get_db):
+    """Test that a limit returns one page plus an opaque next_cursor."""
+
+    # ✅ limit=2 fetches 3 rows; the third only signals that another page exists
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [
+        (3, "Test Task 3", datetime(2025, 2, 4, 13, 0, 0)),
+        (2, "Test Task 2", datetime(2025, 2, 4, 12, 30, 0)),
+        (1, "Test Task 1", datetime(2025, 2, 4, 12, 0, 0))
+    ]
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_get_db.return_value = mock_conn
+
+    response = lambda_handler({"queryStringParameters": {"limit": "2"}}, {})
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert [task["id"] for task in body["tasks"]] == [3, 2]
+    assert decode_cursor(body["next_cursor"]) == (datetime(2025, 2, 4, 12, 30, 0), 2)
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "ORDER BY created_at DESC, id DESC LIMIT %s" in query
+    assert params == [3]
+
+def test_build_tasks_query_with_cursor_and_range():
+    """Test that the cursor and range filters become keyset predicates."""
+
+    cursor = encode_cursor(datetime(2025, 2, 4, 12, 30, 0), 2)
+    query, params = build_tasks_query(
+        10,
+        cursor=cursor,
+        created_after=datetime(2025, 2, 1),
+        created_before=datetime(2025, 3, 1)
+    )
+
+    assert "(created_at, id) < (%s, %s)" in query
+    assert "created_at > %s" in query
+    assert "created_at < %s" in query
+    assert params == [datetime(2025, 2, 4, 12, 30, 0), 2, datetime(2025, 2, 1), datetime(2025, 3, 1), 11]
+
+def test_lambda_handler_invalid_pagination():
+    """Test that malformed limit and cursor values are rejected with 400."""
+
+    assert lambda_handler({"queryStringParameters": {"limit": "0"}}, {})["statusCode"] == 400
+    assert lambda_handler({"queryStringParameters": {"cursor": "not-a-cursor"}}, {})["statusCode"] == 400
+
+# ✅ Test Full-Text Search
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_lambda_handler_search(mock_return_db, mock_get_db):
+    """Test that q runs the ranked GIN-backed query and pages on (rank, id)."""
+
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [
+        (7, "Deploy API", datetime(2025, 2, 4, 13, 0, 0), 0.0991),
+        (4, "Deploy frontend", datetime(2025, 2, 4, 12, 0, 0), 0.0607),
+        (2, "Deploy docs", datetime(2025, 2, 4, 11, 0, 0), 0.0607)
+    ]
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_get_db.return_value = mock_conn
+
+    response = lambda_handler({"queryStringParameters": {"q": " deploy ", "limit": "2"}}, {})
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert body["tasks"] == [
+        {"id": 7, "description": "Deploy API", "created_at": "2025-02-04T13:00:00"},
+        {"id": 4, "description": "Deploy frontend", "created_at": "2025-02-04T12:00:00"}
+    ]
+    assert decode_search_cursor(body["next_cursor"]) == (0.0607, 4)
+
+    query, params = mock_cursor.execute.call_args[0]
+    assert "websearch_to_tsquery('english', %s)" in query
+    assert "search_vector @@ query" in query
+    assert "ORDER BY rank DESC, id DESC LIMIT %s" in query
+    assert params == ["deploy", 3]
+
+def test_build_search_query_with_cursor_and_range():
+    """Test that a search cursor and range filters become predicates on the ranked matches."""
+
+    query, params = build_search_query(
+        "deploy", 10,
+        cursor=encode_search_cursor(0.0607, 4),
+        created_after=datetime(2025, 2, 1)
+    )
+
+    assert "WHERE search_vector @@ query AND created_at > %s" in query
+    assert "(rank, id) < (%s::real, %s)" in query
+    assert params == ["deploy", datetime(2025, 2, 1), 0.0607, 4, 11]
+
+def test_lambda_handler_invalid_search():
+    """Test that oversized q, a pagination cursor reused for search, and q with export are rejected."""
+
+    assert lambda_handler({"queryStringParameters": {"q": "x" * 201}}, {})["statusCode"] == 400
+    cursor = encode_cursor(datetime(2025, 2, 4, 12, 30, 0), 2)
+    assert lambda_handler({"queryStringParameters": {"q": "deploy", "cursor": cursor}}, {})["statusCode"] == 400
+    assert lambda_handler({"queryStringParameters": {"q": "deploy", "export": "ndjson"}}, {})["statusCode"] == 400
+
+# ✅ Test Streaming Export
+def test_stream_tasks_json_and_ndjson():
+    """Test that streamed batches encode to valid JSON and NDJSON."""
+
+    rows = [
+        (3, "Test Task 3", datetime(2025, 2, 4, 13, 0, 0)),
+        (2, "Test Task 2", datetime(2025, 2, 4, 12, 30, 0)),
+        (1, "Test Task 1", None)
+    ]
+
+    for export_format in ["json", "ndjson"]:
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.side_effect = [rows[:2], rows[2:], []]
+        output = io.StringIO()
+
+        assert stream_tasks(mock_cursor, output, export_format, batch_size=2) == (3, None)
+        mock_cursor.fetchmany.assert_called_with(2)
+
+        if export_format == "json":
+            decoded = json.loads(output.getvalue())
+        else:
+            decoded = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [task["id"] for task in decoded] == [3, 2, 1]
+        assert decoded[2]["created_at"] is None
+
+def test_stream_tasks_stops_at_max_bytes():
+    """Test that an export stops before the byte cap and returns a cursor to resume after its last row."""
+
+    rows = [(n, f"Task {n}", datetime(2025, 2, 4, 12, n, 0)) for n in range(5, 0, -1)]
+    row_bytes = len(json.dumps({"id": 5, "description": "Task 5", "created_at": "2025-02-04T12:05:00"},
+                               separators=(",", ":"))) + 1
+
+    mock_cursor = MagicMock()
+    mock_cursor.fetchmany.side_effect = [rows[:2], rows[2:], []]
+    output = io.StringIO()
+
+    row_count, next_cursor = stream_tasks(mock_cursor, output, "json", batch_size=2, max_bytes=2 + 3 * row_bytes)
+
+    assert row_count == 3
+    assert [task["id"] for task in json.loads(output.getvalue())] == [5, 4, 3]
+    assert decode_cursor(next_cursor) == (datetime(2025, 2, 4, 12, 3, 0), 3)
+    assert mock_cursor.fetchmany.call_count == 2  # ✅ Nothing is fetched past the cap
+
+    query, params = build_tasks_query(None, cursor=next_cursor)
+    assert "(created_at, id) < (%s, %s)" in query
+
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_lambda_handler_export_uses_named_cursor(mock_return_db, mock_get_db):
+    """Test that export mode reads through a server-side cursor and never calls fetchall."""
+
+    mock_cursor = MagicMock()
+    mock_cursor.fetchmany.side_effect = [[(1, "Test Task 1", datetime(2025, 2, 4, 12, 0, 0))], []]
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_get_db.return_value = mock_conn
+
+    response = lambda_handler({"queryStringParameters": {"export": "ndjson"}}, {})
+
+    assert response["statusCode"] == 200
+    assert response["headers"]["Content-Type"] == "application/x-ndjson"
+    assert response["body"] == '{"id":1,"description":"Test Task 1","created_at":"2025-02-04T12:00:00"}\n'
+    assert "X-Next-Cursor" not in response["headers"]
+    mock_conn.cursor.assert_any_call(name="tasks_export")
+    mock_cursor.fetchall.assert_not_called()
+
+# ✅ Test Warm-Container Cache and ETag
+def test_get_tasks_version_reads_change_counter():
+    """Test that the version probe reads MAX(id) and the change counter, never COUNT(*)."""
+
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (42, 7)
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+
+    assert get_tasks_version(mock_conn) == (42, 7)
+    query = mock_cursor.execute.call_args[0][0]
+    assert "FROM task_change_counter" in query
+    assert "COUNT(" not in query
+
+@patch("core.routes.get_tasks.get_tasks_version")
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_lambda_handler_cache_and_etag(mock_return_db, mock_get_db, mock_version):
+    """Test that unchanged polls skip the query and a matching If-None-Match returns 304."""
+
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [(1, "Test Task 1", datetime(2025, 2, 4, 12, 0, 0))]
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_get_db.return_value = mock_conn
+    mock_version.return_value = (1, 1)
+
+    event = {"queryStringParameters": {"limit": "7"}}
+    first = lambda_handler(event, {})
+    second = lambda_handler(event, {})
+
+    # ✅ Second poll is served from the cache without re-running the query
+    assert first["body"] == second["body"]
+    assert first["headers"]["ETag"] == second["headers"]["ETag"]
+    assert mock_cursor.fetchall.call_count == 1
+
+    not_modified = lambda_handler({**event, "headers": {"if-none-match": first["headers"]["ETag"]}}, {})
+    assert not_modified["statusCode"] == 304
+    assert not_modified["body"] == ""
+
+    # ✅ A new row changes the version, invalidating both the cache and the ETag
+    mock_version.return_value = (2, 2)
+    changed = lambda_handler({**event, "headers": {"if-none-match": first["headers"]["ETag"]}}, {})
+    assert changed["statusCode"] == 200
+    assert changed["headers"]["ETag"] != first["headers"]["ETag"]
+    assert mock_cursor.fetchall.call_count == 2
+
+# ✅ Test Content Negotiation
+def mock_rows_connection(mock_get_db, rows):
+    """Points get_db_connection at a connection whose cursor returns `rows`."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = rows
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_get_db.return_value = mock_conn
+
+@patch("core.routes.get_tasks.get_tasks_version", return_value=(11, 2))
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_lambda_handler_columnar_and_ndjson(mock_return_db, mock_get_db, mock_version):
+    """Test Accept selects the columnar JSON and NDJSON encoders, each with its own ETag."""
+
+    mock_rows_connection(mock_get_db, [
+        (2, "Test Task 2", datetime(2025, 2, 4, 12, 30, 0)),
+        (1, "Test Task 1", datetime(2025, 2, 4, 12, 0, 0)),
+        (0, "Test Task 0", datetime(2025, 2, 4, 11, 0, 0))
+    ])
+    params = {"queryStringParameters": {"limit": "2", "created_after": "2025-01-01T00:00:00Z"}}
+
+    columnar = lambda_handler({**params, "headers": {"Accept": "application/vnd.tasks.columnar+json"}}, {})
+    body = json.loads(columnar["body"])
+    assert columnar["headers"]["Content-Type"] == "application/vnd.tasks.columnar+json"
+    assert columnar["headers"]["Vary"] == "Accept, Accept-Encoding"
+    assert body["id"] == [2, 1]
+    assert body["created_at"] == ["2025-02-04T12:30:00", "2025-02-04T12:00:00"]
+    assert decode_cursor(body["next_cursor"]) == (datetime(2025, 2, 4, 12, 0, 0), 1)
+
+    ndjson = lambda_handler({**params, "headers": {"accept": "application/x-ndjson, */*;q=0.5"}}, {})
+    lines = ndjson["body"].splitlines()
+    assert ndjson["headers"]["Content-Type"] == "application/x-ndjson"
+    assert [json.loads(line)["description"] for line in lines] == ["Test Task 2", "Test Task 1"]
+    assert decode_cursor(ndjson["headers"]["X-Next-Cursor"]) == (datetime(2025, 2, 4, 12, 0, 0), 1)
+    assert ndjson["headers"]["ETag"] != columnar["headers"]["ETag"]
+
+@patch("core.routes.get_tasks.get_tasks_version", return_value=(12, 1))
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_lambda_handler_msgpack(mock_return_db, mock_get_db, mock_version):
+    """Test MessagePack responses are base64-encoded binary bodies with the JSON shape."""
+
+    msgpack = pytest.importorskip("msgpack")
+    mock_rows_connection(mock_get_db, [(1, "Test Task 1", datetime(2025, 2, 4, 12, 0, 0))])
+
+    response = lambda_handler({"headers": {"Accept": "application/msgpack"}}, {})
+
+    assert response["isBase64Encoded"] is True
+    assert response["headers"]["Content-Type"] == "application/msgpack"
+    assert msgpack.unpackb(base64.b64decode(response["body"])) == [
+        {"id": 1, "description": "Test Task 1", "created_at": "2025-02-04T12:00:00"}
+    ]
+
+@patch("core.routes.get_tasks.get_db_connection")
+def test_lambda_handler_not_acceptable(mock_get_db):
+    """Test an Accept header with no supported type returns 406 before touching the database."""
+
+    response = lambda_handler({"headers": {"Accept": "text/csv"}}, {})
+
+    assert response["statusCode"] == 406
+    mock_get_db.assert_not_called()
+
+# ✅ Test Warm-Up Event
+@patch("core.routes.warmup.get_db_connection")
+@patch("core.routes.warmup.return_db_connection")
+def test_lambda_handler_warmup(mock_return_db, mock_get_db):
+    """Test a warm-up ping primes the pool and never queries tasks."""
+
+    mock_conn = MagicMock()
+    mock_get_db.return_value = mock_conn
+
+    response = lambda_handler({"warmup": True}, {})
+
+    assert response["statusCode"] == 200
+    mock_return_db.assert_called_once_with(mock_conn)
+    mock_conn.cursor.assert_not_called()
+
 def test_lambda_handler_missing_env():
     """Test Lambda handler when environment variables are missing."""
 
@@ -0,0 +1,195 @@
+import sys
+import json
+import os
+import boto3
+import pytest
+from moto import mock_aws
+from unittest.mock import patch, MagicMock
+
+# ✅ Set environment variables BEFORE importing the handlers
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+import core.ingest
+from core.ingest import assign_keys, get_idempotency_key, parse_message
+from lambda_functions.post_task import lambda_handler
+from lambda_functions.consume_tasks import lambda_handler as consume_handler
+
+
+@pytest.fixture
+def queue():
+    """Creates a moto SQS queue and switches POST /tasks to async ingestion."""
+    with mock_aws():
+        client = boto3.client("sqs", region_name="us-east-1")
+        queue_url = client.create_queue(QueueName="task-ingest")["QueueUrl"]
+        with patch.object(core.ingest, "INGESTION_MODE", "async"), \
+                patch.object(core.ingest, "QUEUE_URL", queue_url), \
+                patch.object(core.ingest, "SQS_CLIENT", client):
+            yield client, queue_url
+
+
+def receive_all(client, queue_url):
+    """Drains the queue into Lambda-style SQS records."""
+    records = []
+    while True:
+        messages = client.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10).get("Messages", [])
+        if not messages:
+            return records
+        records.extend({"messageId": m["MessageId"], "body": m["Body"]} for m in messages)
+
+
+# ✅ Test Async POST Enqueues Without a DB Connection
+@patch("core.routes.post_task.get_db_connection")
+def test_async_post_enqueues_task(mock_get_db, queue):
+    """Test async mode returns 202 with the task key and never opens a connection."""
+
+    client, queue_url = queue
+    event = {"body": json.dumps({"description": "Queued"}), "headers": {"Idempotency-Key": "req-1"}}
+    response = lambda_handler(event, {})
+
+    assert response["statusCode"] == 202
+    assert json.loads(response["body"]) == {"message": "Task accepted.", "task_key": "req-1"}
+    mock_get_db.assert_not_called()
+
+    records = receive_all(client, queue_url)
+    assert [parse_message(record)[:2] for record in records] == [("req-1", "Queued")]
+
+
+# ✅ Test Async Batch POST
+@patch("core.routes.post_task.get_db_connection")
+def test_async_post_batch(mock_get_db, queue):
+    """Test a batch larger than one SQS call is enqueued with per-item keys and errors."""
+
+    client, queue_url = queue
+    body = [{"description": f"Task {i}"} for i in range(12)] + [{"description": ""}]
+    response = lambda_handler({"body": json.dumps(body)}, {})
+    result = json.loads(response["body"])
+
+    assert response["statusCode"] == 202
+    assert result["message"] == "12 tasks accepted."
+    assert result["task_keys"][12] is None
+    assert result["results"][12] == {"index": 12, "error": "Description is required."}
+    assert len(receive_all(client, queue_url)) == 12
+    mock_get_db.assert_not_called()
+
+
+# ✅ Test Invalid Async POST Is a Quiet 400
+@patch("core.routes.post_task.sentry_sdk.capture_exception")
+def test_async_post_invalid_task(mock_capture, queue):
+    """Test an invalid single task in async mode returns 400 without a Sentry event or a message."""
+
+    client, queue_url = queue
+    for body in [{"description": "  "}, {"description": 5}, "not-a-task"]:
+        response = lambda_handler({"body": json.dumps(body)}, {})
+        assert response["statusCode"] == 400, body
+
+    mock_capture.assert_not_called()
+    assert receive_all(client, queue_url) == []
+
+
+def test_idempotency_key_helpers():
+    """Test header parsing and key assignment."""
+
+    assert get_idempotency_key({"headers": {"idempotency-key": "abc:1"}}) == "abc:1"
+    assert get_idempotency_key({}) is None
+    with pytest.raises(ValueError):
+        get_idempotency_key({"headers": {"Idempotency-Key": "has spaces"}})
+
+    assert assign_keys(2, "req") == ["req:0", "req:1"]
+    assert len(set(assign_keys(3))) == 3
+
+
+# ✅ Test Consumer Batches and Deduplicates
+@patch("core.ingest.execute_values")
+@patch("core.routes.consume_tasks.get_db_connection")
+@patch("core.routes.consume_tasks.return_db_connection")
+def test_consumer_inserts_batch_once(mock_return_db, mock_get_db, mock_execute_values, queue):
+    """Test redelivered keys collapse and the batch goes in one key-claiming insert."""
+
+    client, queue_url = queue
+    lambda_handler({"body": json.dumps({"description": "Once"}), "headers": {"Idempotency-Key": "k1"}}, {})
+    lambda_handler({"body": json.dumps({"description": "Once"}), "headers": {"Idempotency-Key": "k1"}}, {})
+    lambda_handler({"body": json.dumps({"description": "Other"}), "headers": {"Idempotency-Key": "k2"}}, {})
+    records = receive_all(client, queue_url) + [{"messageId": "bad", "body": "not json"}]
+
+    mock_conn = MagicMock()
+    mock_get_db.return_value = mock_conn
+    mock_execute_values.return_value = [(1,), (2,)]
+
+    result = consume_handler({"Records": records}, None)
+
+    assert result == {"batchItemFailures": [{"itemIdentifier": "bad"}]}
+    mock_execute_values.assert_called_once()
+    query = mock_execute_values.call_args[0][1]
+    rows = mock_execute_values.call_args[0][2]
+    assert "ON CONFLICT (idempotency_key) DO NOTHING" in query
+    assert sorted(row[:2] for row in rows) == [("k1", "Once"), ("k2", "Other")]
+    mock_conn.commit.assert_called_once()
+
+
+# ✅ Test a Retried POST Is Stored Once
+@patch("core.ingest.execute_values")
+@patch("core.routes.consume_tasks.get_db_connection")
+@patch("core.routes.consume_tasks.return_db_connection")
+def test_retried_post_stored_once(mock_return_db, mock_get_db, mock_execute_values, queue):
+    """Test the same Idempotency-Key enqueued twice (fresh accepted_at each time) inserts one row."""
+
+    client, queue_url = queue
+    event = {"body": json.dumps({"description": "Once"}), "headers": {"Idempotency-Key": "retry-1"}}
+    with patch("core.ingest.datetime") as mock_datetime:
+        mock_datetime.utcnow.return_value.isoformat.side_effect = ["2025-06-01T10:00:00", "2025-06-01T10:00:05"]
+        lambda_handler(event, {})
+        lambda_handler(event, {})
+    records = receive_all(client, queue_url)
+    assert {parse_message(record)[2] for record in records} == {"2025-06-01T10:00:00", "2025-06-01T10:00:05"}
+
+    claimed = {}  # task_idempotency_keys
+    stored = []  # tasks
+
+    def insert(cur, query, rows, **kwargs):
+        """Applies the statement's claim-then-insert to the in-memory tables."""
+        assert "INSERT INTO task_idempotency_keys" in query
+        assert "ON CONFLICT (idempotency_key) DO NOTHING" in query
+        assert "JOIN claimed USING (idempotency_key)" in query
+        inserted = []
+        for key, description, accepted_at in rows:
+            if key not in claimed:
+                claimed[key] = accepted_at
+                stored.append((key, description, accepted_at))
+                inserted.append((len(stored),))
+        return inserted
+
+    mock_get_db.return_value = MagicMock()
+    mock_execute_values.side_effect = insert
+
+    # ✅ One message per invocation, as when the retry lands in a later consumer batch
+    results = [consume_handler({"Records": [record]}, None) for record in records]
+
+    assert results == [{"batchItemFailures": []}, {"batchItemFailures": []}]
+    assert mock_execute_values.call_count == 2
+    assert [row[:2] for row in stored] == [("retry-1", "Once")]
+
+
+# ✅ Test Consumer Reports Failures for Retry
+@patch("core.ingest.execute_values")
+@patch("core.routes.consume_tasks.get_db_connection")
+@patch("core.routes.consume_tasks.return_db_connection")
+def test_consumer_reports_failed_batch(mock_return_db, mock_get_db, mock_execute_values):
+    """Test a database failure rolls back and returns every message for retry."""
+
+    mock_conn = MagicMock()
+    mock_get_db.return_value = mock_conn
+    mock_execute_values.side_effect = Exception("connection reset")
+
+    records = [{"messageId": f"m{i}", "body": json.dumps({"key": f"k{i}", "description": "x"})} for i in range(2)]
+    result = consume_handler({"Records": records}, None)
+
+    assert result == {"batchItemFailures": [{"itemIdentifier": "m0"}, {"itemIdentifier": "m1"}]}
+    mock_conn.rollback.assert_called_once()
@@ -0,0 +1,103 @@
+import sys
+import io
+import json
+import logging
+from unittest.mock import patch, MagicMock
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+import core.logs
+from core.logs import BufferedJsonHandler, log_invocation
+
+
+def make_logger(handler):
+    """Builds an isolated logger writing only to `handler`."""
+    logger = logging.getLogger(f"test_logs.{id(handler)}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def read_lines(stream):
+    """Returns the JSON documents written to `stream`."""
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+# ✅ Test Unsampled Success Path Is Dropped Without Formatting
+@patch.dict(core.logs.LOG_SAMPLE_RATES, {logging.DEBUG: 0.0, logging.INFO: 0.0})
+def test_unsampled_info_is_dropped_lazily():
+    """Test sub-WARNING records of an unsampled invocation are never formatted or written."""
+
+    stream = io.StringIO()
+    handler = BufferedJsonHandler(stream)
+    logger = make_logger(handler)
+
+    with patch.object(handler, "format", wraps=handler.format) as mock_format:
+        handler.begin("req-1")
+        logger.info("✅ Retrieved %d tasks", 3)
+        handler.end()
+
+    assert stream.getvalue() == ""
+    mock_format.assert_not_called()
+
+
+# ✅ Test Errors Keep Full Context
+@patch.dict(core.logs.LOG_SAMPLE_RATES, {logging.DEBUG: 0.0, logging.INFO: 0.0})
+def test_error_flushes_buffered_context_once():
+    """Test a WARNING+ record keeps the invocation's earlier records, tagged with the request id."""
+
+    stream = io.StringIO()
+    handler = BufferedJsonHandler(stream)
+    logger = make_logger(handler)
+
+    handler.begin("req-2")
+    logger.info("✅ Step %d", 1, extra={"task_count": 3})
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.exception("❌ Failed")
+    assert stream.getvalue() == ""  # ✅ Nothing written until the invocation ends
+    handler.end()
+
+    info, error = read_lines(stream)
+    assert info["msg"] == "✅ Step 1"
+    assert info["task_count"] == 3
+    assert info["request_id"] == "req-2"
+    assert error["level"] == "ERROR"
+    assert "RuntimeError: boom" in error["exc"]
+
+
+# ✅ Test Sampled Invocations and Nesting
+@patch.dict(core.logs.LOG_SAMPLE_RATES, {logging.DEBUG: 0.0, logging.INFO: 1.0})
+def test_log_invocation_nested_flushes_once():
+    """Test router -> route nesting shares one buffer and the request id comes from the context."""
+
+    stream = io.StringIO()
+    handler = BufferedJsonHandler(stream)
+    logger = make_logger(handler)
+
+    @log_invocation
+    def route(event, context):
+        logger.debug("🔍 dropped")
+        logger.info("✅ kept")
+        return {"statusCode": 200}
+
+    @log_invocation
+    def router(event, context):
+        response = route(event, context)
+        assert stream.getvalue() == ""  # ✅ Inner handler did not flush
+        return response
+
+    with patch.object(core.logs, "HANDLER", handler):
+        router({}, MagicMock(aws_request_id="req-3"))
+
+    [line] = read_lines(stream)
+    assert line["msg"] == "✅ kept"
+    assert line["request_id"] == "req-3"
+
+    # ✅ Outside an invocation records are written immediately
+    logger.warning("⚠️ cold start")
+    assert read_lines(stream)[-1]["msg"] == "⚠️ cold start"
+    assert "request_id" not in read_lines(stream)[-1]
@@ -0,0 +1,83 @@
+import sys
+import json
+import os
+from unittest.mock import patch
+
+# ✅ Set environment variables BEFORE importing the handlers
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+import core.metrics
+from core.metrics import TIMER, instrument, timer
+from core.monitoring import traces_sampler
+
+
+def read_emf(capsys):
+    """Returns the EMF documents written to stdout."""
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith('{"_aws"')]
+
+
+# ✅ Test Phase Timers and EMF Output
+@patch("core.metrics.time.perf_counter")
+def test_instrument_emits_phase_timings(mock_perf_counter, capsys):
+    """Test phases accumulate and one EMF line per invocation is written with the Route dimension."""
+
+    TIMER.flush()
+    mock_perf_counter.side_effect = [0.0, 1.0, 1.010, 1.020, 1.025, 1.100]
+
+    @instrument("GET /tasks")
+    def handler(event, context):
+        with timer("query"):
+            pass
+        with timer("query"):
+            pass
+        return {"statusCode": 200}
+
+    assert handler({}, None) == {"statusCode": 200}
+
+    [document] = read_emf(capsys)
+    metric_set = document["_aws"]["CloudWatchMetrics"][0]
+    assert metric_set["Namespace"] == "TasksAPI"
+    assert metric_set["Dimensions"] == [["Route"]]
+    assert {metric["Name"] for metric in metric_set["Metrics"]} == {"query", "total"}
+    assert document["Route"] == "GET /tasks"
+    assert document["query"] == 15.0
+    assert document["total"] == 1100.0
+    assert document["status"] == 200
+    assert TIMER.flush() == {}
+
+
+def test_metrics_disabled_writes_nothing(capsys):
+    """Test METRICS_ENABLED=false skips timing and output."""
+
+    with patch.object(core.metrics, "METRICS_ENABLED", False):
+        @instrument("POST /tasks")
+        def handler(event, context):
+            with timer("query"):
+                pass
+            return {"statusCode": 201}
+
+        handler({}, None)
+
+    assert read_emf(capsys) == []
+    assert TIMER.flush() == {}
+
+
+# ✅ Test Per-Route Sentry Sampling
+@patch("core.monitoring.SENTRY_ROUTE_SAMPLE_RATES", {"POST /tasks": 0.5})
+@patch("core.monitoring.SENTRY_TRACES_SAMPLE_RATE", 0.01)
+def test_traces_sampler_per_route():
+    """Test route overrides, the default rate, warm-up exclusion and parent decisions."""
+
+    assert traces_sampler({"aws_event": {"routeKey": "POST /tasks"}}) == 0.5
+    assert traces_sampler({"aws_event": {"routeKey": "GET /tasks"}}) == 0.01
+    assert traces_sampler({"aws_event": {"warmup": True}}) == 0.0
+    assert traces_sampler({"parent_sampled": True, "aws_event": {"routeKey": "GET /tasks"}}) == 1.0
+    assert traces_sampler({}) == 0.01
@@ -0,0 +1,52 @@
+import sys
+import psycopg2.errors
+from unittest.mock import MagicMock
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+from core.migrations import ADVISORY_LOCK_KEY, get_schema_version, latest_version, list_migrations, run_migrations
+
+
+def make_conn(applied_versions):
+    """Builds a mock connection whose schema_migrations holds `applied_versions`."""
+    cur = MagicMock()
+    cur.fetchall.return_value = [(version,) for version in applied_versions]
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cur
+    return conn, cur
+
+
+def test_bundled_migrations_are_ordered():
+    """Test bundled migrations load in version order and start with the tasks table."""
+
+    migrations = list_migrations()
+
+    assert [version for version, _, _ in migrations] == sorted(version for version, _, _ in migrations)
+    assert migrations[0][1] == "create_tasks"
+    assert latest_version() == migrations[-1][0]
+
+
+def test_run_migrations_applies_pending_under_lock():
+    """Test only pending migrations run, each recorded, inside the advisory lock."""
+
+    conn, cur = make_conn(applied_versions=[1])
+
+    applied = run_migrations(conn)
+
+    statements = [call.args[0] for call in cur.execute.call_args_list]
+    assert applied == [version for version, _, _ in list_migrations()][1:]
+    assert statements[0] == "SELECT pg_advisory_lock(%s)"
+    assert statements[-1] == "SELECT pg_advisory_unlock(%s)"
+    assert cur.execute.call_args_list[0].args[1] == (ADVISORY_LOCK_KEY,)
+    assert not any("CREATE TABLE IF NOT EXISTS tasks" in statement for statement in statements)
+
+
+def test_get_schema_version_without_table():
+    """Test a database that never ran migrations reports version 0."""
+
+    conn, cur = make_conn(applied_versions=[])
+    cur.execute.side_effect = psycopg2.errors.UndefinedTable("relation does not exist")
+
+    assert get_schema_version(conn) == 0
+    conn.rollback.assert_called_once()
@@ -0,0 +1,143 @@
+import sys
+import gzip
+import json
+import os
+import boto3
+import pytest
+from datetime import date, datetime
+from moto import mock_aws
+from unittest.mock import patch, MagicMock
+
+# ✅ Set environment variables BEFORE importing the handlers
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+import core.partitions
+import core.snapshot
+from core.partitions import add_months, archive_partition, expired_partitions, maintain
+
+BUCKET = "tasks-archive"
+
+
+@pytest.fixture
+def bucket():
+    """Creates a moto bucket and points the partition archiver at it."""
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        with patch.object(core.partitions, "ARCHIVE_BUCKET", BUCKET), \
+                patch.object(core.snapshot, "S3_CLIENT", client):
+            yield client
+
+
+def make_conn(partition_names, rows=()):
+    """Builds a mock connection listing `partition_names` and streaming `rows` from a partition."""
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [(name,) for name in partition_names]
+    cur.fetchmany.side_effect = [list(rows), []]
+    return conn, cur
+
+
+def statements(cur):
+    """Returns the SQL text of every statement executed on the mock cursor."""
+    return [call[0][0] for call in cur.execute.call_args_list]
+
+
+# ✅ Test Month Arithmetic and Retention
+def test_expired_partitions_respect_retention():
+    """Test only months entirely before the retention window expire, and 0 keeps everything."""
+
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+    partitions = {date(2025, month, 1): f"tasks_p2025_{month:02d}" for month in range(1, 7)}
+    with patch.object(core.partitions, "RETENTION_MONTHS", 3):
+        assert expired_partitions(partitions, date(2025, 6, 1)) == [
+            (date(2025, 1, 1), "tasks_p2025_01"), (date(2025, 2, 1), "tasks_p2025_02")
+        ]
+    with patch.object(core.partitions, "RETENTION_MONTHS", 0):
+        assert expired_partitions(partitions, date(2025, 6, 1)) == []
+
+
+# ✅ Test Partition Pre-Creation
+def test_maintain_creates_missing_future_partitions():
+    """Test the current month through PREMAKE_MONTHS ahead exist afterwards, skipping existing ones."""
+
+    conn, cur = make_conn(["tasks_p2025_06", "tasks_p2025_07", "tasks_unrelated"])
+
+    with patch.object(core.partitions, "PREMAKE_MONTHS", 3):
+        result = maintain(conn, today=date(2025, 6, 18))
+
+    assert result["created"] == ["tasks_p2025_08", "tasks_p2025_09"]
+    assert result["archived"] == []
+    creates = [call[0][1] for call in cur.execute.call_args_list
+               if call[0][0] == "SELECT create_tasks_partition(%s)"]
+    assert creates == [(date(2025, 8, 1),), (date(2025, 9, 1),)]
+    assert "SELECT set_config('lock_timeout', %s, true)" in statements(cur)
+
+
+def test_maintain_dry_run_changes_nothing():
+    """Test a dry run reports the plan without DDL, and an unpartitioned table is refused."""
+
+    conn, cur = make_conn(["tasks_p2025_01", "tasks_p2025_06"])
+
+    with patch.object(core.partitions, "RETENTION_MONTHS", 2), \
+            patch.object(core.partitions, "ARCHIVE_BUCKET", BUCKET):
+        result = maintain(conn, today=date(2025, 6, 1), dry_run=True)
+
+    assert result["archived"] == ["archive/tasks/tasks_p2025_01.ndjson.gz"]
+    assert len(result["created"]) == core.partitions.PREMAKE_MONTHS
+    assert not any(sql.startswith(("ALTER", "DROP", "LOCK", "SELECT create")) for sql in statements(cur))
+
+    with pytest.raises(RuntimeError):
+        maintain(make_conn([])[0])
+
+
+# ✅ Test Partition Archival
+def test_archive_partition_exports_then_drops(bucket):
+    """Test rows land in S3 as gzip NDJSON before the partition is detached and dropped."""
+
+    rows = [(1, "Old task", datetime(2024, 1, 5, 9, 30)), (2, "Older task", datetime(2024, 1, 6))]
+    conn, cur = make_conn([], rows)
+
+    key = archive_partition(conn, "tasks_p2024_01")
+
+    assert key == "archive/tasks/tasks_p2024_01.ndjson.gz"
+    body = gzip.decompress(bucket.get_object(Bucket=BUCKET, Key=key)["Body"].read()).decode("utf-8")
+    assert [json.loads(line) for line in body.splitlines()] == [
+        {"id": 1, "description": "Old task", "created_at": "2024-01-05T09:30:00"},
+        {"id": 2, "description": "Older task", "created_at": "2024-01-06T00:00:00"},
+    ]
+    executed = statements(cur)
+    assert executed.index('LOCK TABLE "tasks_p2024_01" IN SHARE MODE') < \
+        executed.index('ALTER TABLE tasks DETACH PARTITION "tasks_p2024_01"') < \
+        executed.index('DROP TABLE "tasks_p2024_01"')
+    stats_call = cur.execute.call_args_list[executed.index(
+        "DELETE FROM task_daily_counts WHERE day >= %s AND day < %s")]
+    assert stats_call[0][1] == (date(2024, 1, 1), date(2024, 2, 1))
+    keys_call = cur.execute.call_args_list[executed.index(
+        "DELETE FROM task_idempotency_keys WHERE created_at >= %s AND created_at < %s")]
+    assert keys_call[0][1] == (date(2024, 1, 1), date(2024, 2, 1))
+    assert any(statement.startswith("INSERT INTO task_change_counter") for statement in executed)
+    conn.commit.assert_called_once()
+
+
+def test_archive_failure_keeps_partition(bucket):
+    """Test a failed upload rolls back without detaching or dropping the partition."""
+
+    conn, cur = make_conn([], [(1, "Old task", datetime(2024, 1, 5))])
+
+    with patch.object(core.partitions, "ARCHIVE_BUCKET", "missing-bucket"), pytest.raises(Exception):
+        archive_partition(conn, "tasks_p2024_01")
+
+    assert not any(sql.startswith(("ALTER", "DROP")) for sql in statements(cur))
+    conn.rollback.assert_called_once()
+    conn.commit.assert_not_called()
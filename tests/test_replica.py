@@ -0,0 +1,147 @@
+import sys
+import json
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+
+# ✅ Set environment variables BEFORE importing the handlers
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+import core.db
+from core.replica import parse_consistency_token, wait_for_replay
+from lambda_functions.get_tasks import lambda_handler as get_handler
+from lambda_functions.post_task import lambda_handler as post_handler
+
+
+def make_conn(*replayed):
+    """Builds a mock connection whose replay check returns `replayed` in order."""
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value.fetchone.side_effect = [(value,) for value in replayed]
+    return conn
+
+
+@pytest.fixture
+def reader():
+    """Configures a reader host with a mock reader pool."""
+    pool = MagicMock()
+    with patch.object(core.db, "DB_READER_HOST", "replica.local"), \
+            patch.object(core.db, "READER_POOL", pool), \
+            patch.object(core.db, "READER_HEALTH") as health:
+        yield pool, health
+
+
+# ✅ Test Waiting for the Replica
+@patch("core.replica.time.sleep")
+def test_wait_for_replay_polls_until_caught_up(mock_sleep):
+    """Test the replay check is repeated until the replica reaches the LSN."""
+
+    conn = make_conn(False, True)
+    assert wait_for_replay(conn, "0/16B3748", max_wait_ms=1000) is True
+    assert mock_sleep.call_count == 1
+    query, params = conn.cursor.return_value.__enter__.return_value.execute.call_args[0]
+    assert "pg_last_wal_replay_lsn() >= %s::pg_lsn" in query
+    assert params == ("0/16B3748",)
+
+    assert wait_for_replay(make_conn(False), "0/16B3748", max_wait_ms=0) is False
+
+
+def test_parse_consistency_token():
+    """Test tokens are validated as LSNs."""
+
+    assert parse_consistency_token("0/16b3748") == "0/16B3748"
+    assert parse_consistency_token(None) is None
+    with pytest.raises(ValueError):
+        parse_consistency_token("0/16B3748; DROP TABLE tasks")
+
+
+# ✅ Test Reader Routing and Fallback
+def test_replica_connection_returns_to_reader_pool(reader):
+    """Test a caught-up replica serves the read and its connection goes back to the reader pool."""
+
+    pool, health = reader
+    replica_conn = make_conn(True)
+    health.checkout.return_value = replica_conn
+
+    conn = core.db.get_db_connection(replica=True, min_lsn="0/16B3748")
+    assert conn is replica_conn
+
+    core.db.return_db_connection(conn)
+    health.checkin.assert_called_once_with(pool, replica_conn)
+
+
+@patch("core.db.acquire_db_connection")
+@patch("core.replica.time.sleep")
+def test_lagging_replica_falls_back_to_primary(mock_sleep, mock_primary, reader):
+    """Test a replica that never reaches the token is released and the primary is used."""
+
+    pool, health = reader
+    replica_conn = make_conn(*([False] * 100))
+    health.checkout.return_value = replica_conn
+    mock_primary.return_value = "primary-conn"
+
+    with patch("core.replica.REPLICA_WAIT_MS", 0):
+        assert core.db.get_db_connection(replica=True, min_lsn="0/16B3748") == "primary-conn"
+    health.checkin.assert_called_once_with(pool, replica_conn)
+
+
+@patch("core.db.acquire_db_connection")
+def test_failed_replay_check_discards_reader_connection(mock_primary, reader):
+    """Test a replica that errors during the replay check is closed, forgotten and the primary is used."""
+
+    pool, health = reader
+    replica_conn = MagicMock()
+    replica_conn.cursor.return_value.__enter__.return_value.execute.side_effect = \
+        core.db.psycopg2.OperationalError("server closed the connection unexpectedly")
+    health.checkout.return_value = replica_conn
+    mock_primary.return_value = "primary-conn"
+
+    assert core.db.get_db_connection(replica=True, min_lsn="0/16B3748") == "primary-conn"
+    health.discard.assert_called_once_with(pool, replica_conn)
+    health.checkin.assert_not_called()
+    assert id(replica_conn) not in core.db.READER_CONNECTIONS
+
+
+# ✅ Test Handlers Issue and Honour Tokens
+@patch("core.routes.get_tasks.get_db_connection")
+@patch("core.routes.get_tasks.return_db_connection")
+def test_get_passes_consistency_token(mock_return_db, mock_get_db):
+    """Test GET routes to the replica with the caller's token and rejects malformed tokens."""
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.__enter__.return_value.fetchall.return_value = []
+    mock_get_db.return_value = mock_conn
+
+    event = {"queryStringParameters": None, "headers": {"X-Consistency-Token": "0/16B3748"}}
+    assert get_handler(event, {})["statusCode"] == 200
+    assert mock_get_db.call_args[1]["replica"] is True
+    assert mock_get_db.call_args[1]["min_lsn"] == "0/16B3748"
+
+    bad = get_handler({"queryStringParameters": {"consistency_token": "latest"}}, {})
+    assert bad["statusCode"] == 400
+
+
+@patch("core.routes.post_task.check_schema_version")
+@patch("core.routes.post_task.get_current_lsn", return_value="0/16B3748")
+@patch("core.routes.post_task.get_db_connection")
+@patch("core.routes.post_task.return_db_connection")
+def test_post_returns_consistency_token(mock_return_db, mock_get_db, mock_lsn, mock_schema):
+    """Test POST returns the commit LSN only when reads are replica-routed."""
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.fetchone.return_value = (42,)
+    mock_get_db.return_value = mock_conn
+    event = {"body": json.dumps({"description": "Read me back"})}
+
+    with patch("core.routes.post_task.DB_READER_HOST", "replica.local"):
+        body = json.loads(post_handler(event, {})["body"])
+    assert body == {"message": "Task created.", "task_id": 42, "consistency_token": "0/16B3748"}
+
+    assert "consistency_token" not in json.loads(post_handler(event, {})["body"])
@@ -0,0 +1,82 @@
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# ✅ Set environment variables BEFORE importing `router.py`
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+from core.admission import Overloaded
+from core.deadline import DeadlineExceeded
+from lambda_functions.router import ROUTES, get_route_key, lambda_handler
+
+
+def make_event(method, path, route_key=None, stage="prod"):
+    """Builds a minimal API Gateway v2 (HTTP API) event."""
+    return {
+        "routeKey": route_key or f"{method} {path}",
+        "rawPath": f"/{stage}{path}",
+        "requestContext": {"stage": stage, "http": {"method": method, "path": f"/{stage}{path}"}}
+    }
+
+
+def test_router_dispatches_get_and_post():
+    """Test GET and POST /tasks reach their per-route handlers."""
+
+    get_handler = MagicMock(return_value={"statusCode": 200})
+    post_handler = MagicMock(return_value={"statusCode": 201})
+
+    with patch.dict(ROUTES, {"GET /tasks": get_handler, "POST /tasks": post_handler}):
+        assert lambda_handler(make_event("GET", "/tasks"), None)["statusCode"] == 200
+        assert lambda_handler(make_event("POST", "/tasks"), None)["statusCode"] == 201
+
+    get_handler.assert_called_once()
+    post_handler.assert_called_once()
+
+
+def test_router_options_and_unknown_routes():
+    """Test CORS preflight is answered locally and unknown routes return 404."""
+
+    preflight = lambda_handler(make_event("OPTIONS", "/tasks"), None)
+    missing = lambda_handler(make_event("DELETE", "/tasks"), None)
+
+    assert preflight["statusCode"] == 204
+    assert "POST" in preflight["headers"]["Access-Control-Allow-Methods"]
+    assert missing["statusCode"] == 404
+
+
+def test_get_route_key_for_default_route():
+    """Test the $default route rebuilds the key from the request, without the stage prefix."""
+
+    assert get_route_key(make_event("GET", "/tasks", route_key="$default")) == "GET /tasks"
+
+
+@patch("core.routes.warmup.return_db_connection")
+@patch("core.routes.warmup.get_db_connection")
+def test_router_warmup(mock_get_db, mock_return_db):
+    """Test a warm-up ping primes the shared pool without dispatching a route."""
+
+    response = lambda_handler({"warmup": True}, None)
+
+    assert response["statusCode"] == 200
+    mock_get_db.assert_called_once()
+
+
+@patch("core.routes.warmup.get_db_connection")
+def test_router_warmup_shed_or_timed_out(mock_get_db):
+    """Test a warm-up rejected by admission control or out of time answers 503 instead of raising."""
+
+    mock_get_db.side_effect = Overloaded(503, 2)
+    response = lambda_handler({"warmup": True}, None)
+    assert response["statusCode"] == 503
+    assert response["headers"]["Retry-After"] == "2"
+
+    mock_get_db.side_effect = DeadlineExceeded("❌ Request deadline exceeded")
+    assert lambda_handler({"warmup": True}, None)["statusCode"] == 503
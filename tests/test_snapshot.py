@@ -0,0 +1,172 @@
+import sys
+import gzip
+import json
+import os
+import boto3
+import pytest
+from datetime import datetime
+from moto import mock_aws
+from unittest.mock import patch, MagicMock
+
+# ✅ Set environment variables BEFORE importing the handlers
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+import core.snapshot
+from core.snapshot import request_snapshot
+from lambda_functions.post_task import lambda_handler as post_handler
+from lambda_functions.publish_snapshot import lambda_handler as publish_handler
+
+BUCKET = "tasks-frontend"
+
+
+@pytest.fixture
+def bucket():
+    """Creates a moto bucket and points the snapshot publisher at it (3 pages of 2 tasks)."""
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        with patch.object(core.snapshot, "SNAPSHOT_BUCKET", BUCKET), \
+                patch.object(core.snapshot, "S3_CLIENT", client), \
+                patch.object(core.snapshot, "SNAPSHOT_PAGES", 3), \
+                patch.object(core.snapshot, "SNAPSHOT_PAGE_SIZE", 2):
+            yield client
+
+
+def make_conn(version, rows):
+    """Builds a mock connection answering the version probe and the snapshot query."""
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.return_value = version
+    cur.fetchall.return_value = rows
+    return conn
+
+
+def make_rows(count):
+    """Returns `count` task rows, newest first."""
+    return [(i, f"Task {i}", datetime(2024, 1, 1, 0, 0, i)) for i in range(count, 0, -1)]
+
+
+def read_json(client, key):
+    """Reads an object, decompressing it if it was stored gzip-encoded."""
+    response = client.get_object(Bucket=BUCKET, Key=key)
+    body = response["Body"].read()
+    if response.get("ContentEncoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+# ✅ Test Snapshot Requests Are Debounced
+def test_request_snapshot_debounces_per_container():
+    """Test a burst of writes queues one delayed render request."""
+
+    sqs = MagicMock()
+    with patch.object(core.snapshot, "SNAPSHOT_QUEUE_URL", "https://queue"), \
+            patch.object(core.snapshot, "LAST_REQUESTED_AT", None), \
+            patch.object(core.snapshot, "get_sqs_client", return_value=sqs):
+        assert request_snapshot() is True
+        assert request_snapshot() is False
+        assert request_snapshot() is False
+
+    sqs.send_message.assert_called_once()
+    assert sqs.send_message.call_args[1]["DelaySeconds"] == core.snapshot.SNAPSHOT_DEBOUNCE_SECONDS
+
+    with patch.object(core.snapshot, "SNAPSHOT_QUEUE_URL", None):
+        assert request_snapshot() is False  # ✅ Publishing disabled
+
+
+# ✅ Test Publishing Pages and Pointer
+@patch("core.routes.publish_snapshot.return_db_connection")
+@patch("core.routes.publish_snapshot.get_db_connection")
+def test_publish_renders_compressed_pages(mock_get_db, mock_return_db, bucket):
+    """Test the first pages are stored gzip-compressed and chained by cursor, behind a version pointer."""
+
+    mock_get_db.return_value = make_conn((7, 7), make_rows(7))
+    records = {"Records": [{"messageId": str(i), "body": "{}"} for i in range(4)]}
+
+    assert publish_handler(records, {}) == {"published": "7-7"}
+
+    pointer = read_json(bucket, "snapshots/tasks/latest.json")
+    assert pointer["version"] == "7-7"
+    assert pointer["pages"] == ["v/7-7/page-1.json", "v/7-7/page-2.json", "v/7-7/page-3.json"]
+
+    head = bucket.head_object(Bucket=BUCKET, Key="snapshots/tasks/v/7-7/page-1.json")
+    assert head["ContentEncoding"] == "gzip"
+    assert "immutable" in head["CacheControl"]
+
+    pages = [read_json(bucket, f"snapshots/tasks/{path}") for path in pointer["pages"]]
+    assert [[task["id"] for task in page["tasks"]] for page in pages] == [[7, 6], [5, 4], [3, 2]]
+    assert all(page["next_cursor"] for page in pages)  # ✅ The last one continues on the API
+    mock_return_db.assert_called_once()
+
+
+@patch("core.routes.publish_snapshot.return_db_connection")
+@patch("core.routes.publish_snapshot.get_db_connection")
+def test_publish_skips_current_snapshot(mock_get_db, mock_return_db, bucket):
+    """Test a render request is coalesced away when the snapshot already covers the data."""
+
+    mock_get_db.return_value = make_conn((3, 3), make_rows(3))
+    assert publish_handler({"Records": []}, {}) == {"published": "3-3"}
+
+    conn = make_conn((3, 3), make_rows(3))
+    mock_get_db.return_value = conn
+    assert publish_handler({"Records": []}, {}) == {"published": None}
+    conn.cursor.return_value.__enter__.return_value.fetchall.assert_not_called()
+
+
+@patch("core.routes.publish_snapshot.return_db_connection")
+@patch("core.routes.publish_snapshot.get_db_connection")
+def test_publish_prunes_old_versions(mock_get_db, mock_return_db, bucket):
+    """Test the previous version is kept for in-flight readers and older ones are deleted."""
+
+    for count in (1, 2, 3):
+        mock_get_db.return_value = make_conn((count, count), make_rows(count))
+        publish_handler({"Records": []}, {})
+
+    keys = [item["Key"] for item in bucket.list_objects_v2(Bucket=BUCKET, Prefix="snapshots/tasks/v/")["Contents"]]
+    assert not any(key.startswith("snapshots/tasks/v/1-1/") for key in keys)
+    assert any(key.startswith("snapshots/tasks/v/2-2/") for key in keys)
+    assert read_json(bucket, "snapshots/tasks/latest.json")["previous"] == "2-2"
+
+
+@patch("core.routes.publish_snapshot.return_db_connection")
+@patch("core.routes.publish_snapshot.get_db_connection")
+def test_publish_after_deletes_with_same_max_id(mock_get_db, mock_return_db, bucket):
+    """Test a snapshot is republished when rows are deleted below an unchanged max id."""
+
+    mock_get_db.return_value = make_conn((5, 10), make_rows(5))
+    assert publish_handler({"Records": []}, {}) == {"published": "5-10"}
+
+    # ✅ Archival deleted old rows: max id is the same, the change counter moved on
+    mock_get_db.return_value = make_conn((5, 11), make_rows(3))
+    assert publish_handler({"Records": []}, {}) == {"published": "5-11"}
+    assert read_json(bucket, "snapshots/tasks/latest.json")["changes"] == 11
+
+    # ✅ A pointer from before the counter existed is always replaced
+    bucket.put_object(Bucket=BUCKET, Key="snapshots/tasks/latest.json",
+                      Body=json.dumps({"version": "9-500", "watermark": [9, 500]}).encode("utf-8"))
+    assert publish_handler({"Records": []}, {}) == {"published": "5-11"}
+
+
+# ✅ Test Writes Request a Snapshot
+@patch("core.routes.post_task.request_snapshot")
+@patch("core.routes.post_task.check_schema_version")
+@patch("core.routes.post_task.get_db_connection")
+@patch("core.routes.post_task.return_db_connection")
+def test_post_requests_snapshot(mock_return_db, mock_get_db, mock_schema, mock_request):
+    """Test a successful POST queues a snapshot render."""
+
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.fetchone.return_value = (1,)
+    mock_get_db.return_value = mock_conn
+    response = post_handler({"body": json.dumps({"description": "Snapshot me"})}, {})
+
+    assert response["statusCode"] == 201
+    mock_request.assert_called_once()
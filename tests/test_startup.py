@@ -0,0 +1,42 @@
+import sys
+import time
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+from core import startup
+from core.startup import start_step, wait_step, is_warmup_event
+
+
+def test_steps_run_concurrently():
+    """Test independent cold-start steps overlap instead of running back to back."""
+
+    started = time.monotonic()
+    start_step("test:slow_a", time.sleep, 0.2)
+    start_step("test:slow_b", time.sleep, 0.2)
+    wait_step("test:slow_a")
+    wait_step("test:slow_b")
+
+    assert time.monotonic() - started < 0.35
+
+
+def test_wait_step_falls_back_on_failure():
+    """Test a failed or unknown step returns None so callers initialize synchronously."""
+
+    def fail():
+        raise RuntimeError("secret fetch failed")
+
+    start_step("test:failing", fail)
+
+    assert wait_step("test:failing") is None
+    assert wait_step("test:never_started") is None
+    assert "test:failing" in startup.STEPS
+
+
+def test_is_warmup_event():
+    """Test explicit and scheduled warm-up pings are recognised, API requests are not."""
+
+    assert is_warmup_event({"warmup": True})
+    assert is_warmup_event({"source": "aws.events", "detail-type": "Scheduled Event"})
+    assert not is_warmup_event({"requestContext": {"http": {"method": "GET"}}})
+    assert not is_warmup_event(None)
@@ -0,0 +1,94 @@
+import sys
+import json
+import os
+import pytest
+from datetime import date, timedelta
+from unittest.mock import patch, MagicMock
+
+# ✅ Set environment variables BEFORE importing the handlers
+os.environ["DB_SECRET_NAME"] = "mock-db-secret"
+os.environ["AWS_REGION"] = "us-east-1"
+os.environ["DB_HOST"] = "localhost"
+os.environ["DB_NAME"] = "test_db"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["SENTRY_DSN"] = ""
+
+# ✅ Ensure Python can find the `lambda_functions` module
+sys.path.append("./lambda_functions")
+
+from core.stats import STATS_DEFAULT_DAYS, STATS_MAX_DAYS, parse_range, rebuild_daily_counts
+from lambda_functions.router import lambda_handler
+
+
+def stats_event(**params):
+    """Builds an API Gateway v2 event for GET /tasks/stats."""
+    return {"routeKey": "GET /tasks/stats", "queryStringParameters": params or None}
+
+
+# ✅ Test Date Range Parsing
+def test_parse_range_defaults_and_limits():
+    """Test the default window ends today, and reversed, malformed or oversized ranges are rejected."""
+
+    assert parse_range({}, today=date(2025, 6, 30)) == (date(2025, 6, 30 - STATS_DEFAULT_DAYS + 1), date(2025, 6, 30))
+    assert parse_range({"from": "2025-01-01", "to": "2025-01-07"}) == (date(2025, 1, 1), date(2025, 1, 7))
+
+    for params in ({"from": "2025-02-01", "to": "2025-01-01"}, {"to": "yesterday"},
+                   {"from": "2020-01-01", "to": str(date(2020, 1, 1) + timedelta(days=STATS_MAX_DAYS))}):
+        with pytest.raises(ValueError):
+            parse_range(params)
+
+
+# ✅ Test GET /tasks/stats
+@patch("core.routes.get_stats.get_db_connection")
+@patch("core.routes.get_stats.return_db_connection")
+def test_stats_reads_summary_table_only(mock_return_db, mock_get_db):
+    """Test the total and zero-filled per-day counts come from task_daily_counts, never from tasks."""
+
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.return_value = (1234,)
+    cur.fetchall.return_value = [(date(2025, 3, 1), 5), (date(2025, 3, 3), 2)]
+    mock_get_db.return_value = conn
+
+    response = lambda_handler(stats_event(**{"from": "2025-03-01", "to": "2025-03-03"}), {})
+    body = json.loads(response["body"])
+
+    assert response["statusCode"] == 200
+    assert body == {
+        "total": 1234,
+        "from": "2025-03-01",
+        "to": "2025-03-03",
+        "days": [
+            {"date": "2025-03-01", "count": 5},
+            {"date": "2025-03-02", "count": 0},
+            {"date": "2025-03-03", "count": 2},
+        ]
+    }
+    queries = [call[0][0] for call in cur.execute.call_args_list]
+    assert all("FROM task_daily_counts" in query and "FROM tasks" not in query for query in queries)
+    assert cur.execute.call_args_list[1][0][1] == (date(2025, 3, 1), date(2025, 3, 3))
+    assert mock_get_db.call_args[1]["replica"] is True
+    mock_return_db.assert_called_once_with(conn)
+
+
+def test_stats_rejects_bad_range():
+    """Test an invalid range answers 400 without a database connection."""
+
+    with patch("core.routes.get_stats.get_db_connection") as mock_get_db:
+        response = lambda_handler(stats_event(**{"from": "2025-03-05", "to": "2025-03-01"}), {})
+
+    assert response["statusCode"] == 400
+    mock_get_db.assert_not_called()
+
+
+# ✅ Test Rebuild Command
+def test_rebuild_recounts_range_and_commits():
+    """Test the rebuild calls the SQL function for the half-open range and commits."""
+
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.return_value = (31,)
+
+    assert rebuild_daily_counts(conn, date(2025, 1, 1), date(2025, 2, 1)) == 31
+    cur.execute.assert_called_once_with("SELECT rebuild_task_daily_counts(%s, %s)", (date(2025, 1, 1), date(2025, 2, 1)))
+    conn.commit.assert_called_once()